@@ -1,11 +1,19 @@
 """URL patterns for the platform_plugin_teams plugin for the CMS."""
 from django.urls import path
 
+from platform_plugin_teams.api import views as shared_views
 from platform_plugin_teams.api.cms import views
 
 app_name = "platform_plugin_teams"
 
 urlpatterns = [
     path("topics/", views.TopicsAPIView.as_view(), name="topics"),
+    path("topics/batch/", views.TopicsBatchAPIView.as_view(), name="topics-batch"),
     path("topics/<str:topic_id>/", views.TopicsAPIView.as_view(), name="delete-topics"),
+    path("topics/<str:topic_id>/teams/", views.TopicTeamsAPIView.as_view(), name="topic-teams"),
+    path("topics/<str:topic_id>/formation/", views.TeamFormationAPIView.as_view(), name="team-formation"),
+    path("topics/<str:topic_id>/rebalance/", views.TeamRebalanceAPIView.as_view(), name="team-rebalance"),
+    path("jobs/<str:job_id>/", views.JobAPIView.as_view(), name="jobs"),
+    path("profiles/<str:profile_id>/", shared_views.ProfileAPIView.as_view(), name="profiles"),
+    path("metrics/", shared_views.MetricsAPIView.as_view(), name="metrics"),
 ]
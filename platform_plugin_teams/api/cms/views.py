@@ -1,7 +1,10 @@
 """ This file contains the API views for the Teams plugin. """ ""
 from copy import deepcopy
+from functools import wraps
 from uuid import uuid4
 
+from django.conf import settings
+from django.utils.http import parse_etags, quote_etag
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
 from opaque_keys import InvalidKeyError
@@ -10,34 +13,195 @@ from rest_framework import permissions, status
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
+from platform_plugin_teams import metrics
+from platform_plugin_teams.cache import course_lock, invalidate_course
+from platform_plugin_teams.edxapp_wrapper import teams_config
 from platform_plugin_teams.edxapp_wrapper.authentication import BearerAuthenticationAllowInactiveUser
 from platform_plugin_teams.edxapp_wrapper.contentstore import update_course_advanced_settings
-from platform_plugin_teams.edxapp_wrapper.modulestore import modulestore
+from platform_plugin_teams.edxapp_wrapper.modulestore import get_course
 from platform_plugin_teams.edxapp_wrapper.student import has_studio_write_access
-from platform_plugin_teams.edxapp_wrapper.teams_common import CourseTeam
-from platform_plugin_teams.edxapp_wrapper.teams_config import TeamsetType
-from platform_plugin_teams.utils import api_field_errors
+from platform_plugin_teams.formation import (
+    BALANCE_ATTRIBUTES,
+    TeamFormationError,
+    form_teams_job,
+    get_plan_summary,
+    plan_team_formation,
+)
+from platform_plugin_teams.instrumentation import InstrumentedAPIViewMixin
+from platform_plugin_teams.jobs import Job, start_job
+from platform_plugin_teams.rebalance import RebalanceError, plan_rebalance, rebalance_teams
+from platform_plugin_teams.renderers import FastJSONRendererMixin
+from platform_plugin_teams.teams import (
+    create_teams,
+    get_generated_team_names,
+    get_missing_team_count,
+    get_teams_data_errors,
+)
+from platform_plugin_teams.topics import (
+    apply_topic_operations,
+    delete_topic_teams,
+    delete_topic_teams_job,
+    get_topic_teams,
+)
+from platform_plugin_teams.utils import api_error, api_field_errors, get_teams_configuration_version
 
+TOPIC_DELETE_JOB = "topic_delete"
+TEAM_FORMATION_JOB = "team_formation"
+TEAMS_CONFIGURATION_LOCK = "teams_configuration"
+MAX_TEAM_NAME_LENGTH = 255
 
-class TopicsAPIView(GenericAPIView):
+
+def lock_teams_configuration(handler):
+    """
+    Run a view handler that changes the teams configuration of a course while
+    holding the teams configuration lock of the course.
+
+    The handler loads the course, checks its `If-Match` version and writes the
+    configuration under the lock, so another request can not write between the
+    check and the write. The courses memoized before the lock are forgotten, so
+    the check is made against the last stored configuration.
+    """
+
+    @wraps(handler)
+    def wrapper(self, request, course_id: str, *args, **kwargs):
+        with course_lock(course_id, TEAMS_CONFIGURATION_LOCK) as locked:
+            if not locked:
+                metrics.increment("topics.write_conflicts", tags={"reason": "locked"})
+                return api_error(
+                    "The teams configuration is being changed by another request.",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+
+            get_course.cache_clear()
+            return handler(self, request, course_id, *args, **kwargs)
+
+    return wrapper
+
+
+def delete_removed_topic_teams(user, course_key, topic_id: str):
+    """
+    Delete the teams of a topic removed from a course.
+
+    The teams of topics with more teams than
+    `PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD` are deleted in a
+    background job.
+
+    Args:
+        user (User): The user that removed the topic.
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+
+    Returns:
+        Job: The job that deletes the teams, or None if they were already deleted.
+    """
+    team_count = get_topic_teams(course_key, topic_id).count()
+    if team_count > getattr(settings, "PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD", 500):
+        return start_job(
+            TOPIC_DELETE_JOB,
+            user,
+            course_key,
+            team_count,
+            delete_topic_teams_job,
+            course_key,
+            topic_id,
+        )
+
+    delete_topic_teams(course_key, topic_id)
+    return None
+
+
+class TeamsConfigurationVersionMixin:
+    """
+    Optimistic concurrency for the views that change the teams configuration of a course.
+
+    The responses include the version of the teams configuration in the `ETag`
+    header. Requests that send it back in the `If-Match` header are rejected
+    with a 412 if the configuration changed since, instead of overwriting the
+    changes of another user. The handlers are wrapped with
+    `lock_teams_configuration`, so the check and the write of a request happen
+    together, without the write of another request in between.
+    """
+
+    def check_teams_configuration_version(self, request, teams_configuration):
+        """
+        Check the `If-Match` header of a request against a teams configuration.
+
+        Args:
+            request (Request): The request.
+            teams_configuration (TeamsConfig): The current teams configuration.
+
+        Returns:
+            Response: A 412 response if the request is based on another version
+                of the configuration, otherwise None.
+        """
+        if_match = request.META.get("HTTP_IF_MATCH")
+        if if_match is None:
+            return None
+
+        version = get_teams_configuration_version(teams_configuration)
+        etags = parse_etags(if_match)
+        if "*" in etags or quote_etag(version) in etags:
+            return None
+
+        metrics.increment("topics.write_conflicts", tags={"reason": "stale_version"})
+        response = api_error(
+            "The teams configuration was changed since the supplied version.",
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+        )
+        return self.add_teams_configuration_version(response, teams_configuration)
+
+    @staticmethod
+    def add_teams_configuration_version(response, teams_configuration):
+        """
+        Add the version of a teams configuration to a response.
+
+        Args:
+            response (Response): The response.
+            teams_configuration (TeamsConfig): The teams configuration.
+
+        Returns:
+            Response: The response.
+        """
+        response["ETag"] = quote_etag(get_teams_configuration_version(teams_configuration))
+        return response
+
+
+class TopicsAPIView(
+    InstrumentedAPIViewMixin, FastJSONRendererMixin, TeamsConfigurationVersionMixin, GenericAPIView
+):
     """
     API view for the topics endpoints.
 
-    This class provides POST and DELETE methods for interacting with topics related to a course.
+    This class provides GET, POST and DELETE methods for interacting with topics related to a course.
+
+    The responses include the version of the teams configuration of the course
+    in the `ETag` header. The POST and DELETE requests that send it back in the
+    `If-Match` header are rejected if the configuration changed since.
 
     `Use Cases`:
 
+        * GET: Get the topics of a course and the version of its teams configuration.
         * POST: Add a new topic to a course.
         * DELETE: Delete a topic from a course. This will also delete all teams
             associated with the topic, and remove all members from those teams.
+            The teams of large topics are deleted in a background job.
 
     `Example Requests`:
 
+        * GET: /platform-plugin-teams/{course-id}/api/topics/
+
+            * Path Parameters:
+                * course_id (str): The course id for the course of the topics (required).
+
         * POST: /platform-plugin-teams/{course-id}/api/topics/
 
             * Path Parameters:
                 * course_id (str): The course id for the course to add a topic to (required).
 
+            * Headers:
+                * If-Match (str): The version of the teams configuration the
+                    change is based on (optional).
+
             * Body Parameters:
                 * name (str): The name of the topic to add (required).
                 * description (str): The description of the topic to add (required).
@@ -50,13 +214,32 @@ class TopicsAPIView(GenericAPIView):
                 * course_id (str): The course id for the course to delete a topic from (required).
                 * topic_id (str): The topic id for the topic to delete (required).
 
+            * Headers:
+                * If-Match (str): The version of the teams configuration the
+                    change is based on (optional).
+
     `Example Responses`:
 
+        * GET: /platform-plugin-teams/{course-id}/api/topics/
+
+            * 404:
+                * The supplied course_id does not exists.
+                * The supplied course is not found.
+
+            * 200: Returns the list of topics for the course, and the version of
+                its teams configuration in the `ETag` header.
+
         * POST: /platform-plugin-teams/{course-id}/api/topics/
 
             * 400:
                 * The topic name already exists for the course.
 
+            * 409:
+                * The teams configuration is being changed by another request.
+
+            * 412:
+                * The teams configuration was changed since the supplied version.
+
             * 404:
                 * The supplied course_id does not exists.
                 * The supplied course is not found.
@@ -80,6 +263,12 @@ class TopicsAPIView(GenericAPIView):
                 * The supplied course is not found.
                 * The supplied topic_id does not exists.
 
+            * 409:
+                * The teams configuration is being changed by another request.
+
+            * 412:
+                * The teams configuration was changed since the supplied version.
+
             * 204: Returns a list of updated topics for the course.
 
                 The response body will contain the following fields:
@@ -91,6 +280,15 @@ class TopicsAPIView(GenericAPIView):
                     * description (str): A description of the topic.
                     * type (str): The type of the topic.
                     * max_team_size (int): The max team size of the topic.
+
+            * 202: The topic has more teams than the configured threshold, and
+                they are being deleted in the background.
+
+                The response body will contain the following fields:
+
+                * topics (list): A list of updated topics for the course.
+                * job (dict): The job that deletes the teams. Its progress is
+                    available in the jobs endpoint.
     """
 
     authentication_classes = (
@@ -100,11 +298,38 @@ class TopicsAPIView(GenericAPIView):
     )
     permission_classes = (permissions.IsAuthenticated,)
 
+    def get(self, request, course_id: str):
+        """GET request handler for the topics view."""
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_studio_write_access(request.user, course_key):
+            self.permission_denied(request)
+
+        response = Response(
+            {"topics": course_block.teams_configuration.cleaned_data["team_sets"]},
+            status=status.HTTP_200_OK,
+        )
+        return self.add_teams_configuration_version(response, course_block.teams_configuration)
+
+    @lock_teams_configuration
     def post(self, request, course_id: str):
         """POST request handler for the topics view."""
         new_topic = deepcopy(request.data)
 
-        valid_team_types = [team_type.value for team_type in TeamsetType]
+        valid_team_types = [team_type.value for team_type in teams_config.TeamsetType]
         if new_topic.get("type") not in valid_team_types:
             return api_field_errors(
                 {"type": f"The [type] field must be one of {valid_team_types}."},
@@ -118,7 +343,7 @@ class TopicsAPIView(GenericAPIView):
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        course_block = modulestore().get_course(course_key)
+        course_block = get_course(course_key)
         if course_block is None:
             return api_field_errors(
                 {"course_id": f"The supplied {course_id=} is not found."},
@@ -128,6 +353,9 @@ class TopicsAPIView(GenericAPIView):
         if not has_studio_write_access(request.user, course_key):
             self.permission_denied(request)
 
+        if response := self.check_teams_configuration_version(request, course_block.teams_configuration):
+            return response
+
         teams_configuration = deepcopy(course_block.teams_configuration.cleaned_data)
 
         for topic in teams_configuration["team_sets"]:
@@ -140,12 +368,18 @@ class TopicsAPIView(GenericAPIView):
         teams_configuration["team_sets"].append(new_topic)
         data = {"teams_configuration": {"value": teams_configuration}}
         updated_data = update_course_advanced_settings(course_block, data, request.user)
+        invalidate_course(course_key)
+        metrics.increment("topics.writes", tags={"operation": "create"})
 
-        return Response(
+        response = Response(
             {"topics": updated_data["teams_configuration"]["value"]["team_sets"]},
             status=status.HTTP_201_CREATED,
         )
+        return self.add_teams_configuration_version(
+            response, teams_config.TeamsConfig(updated_data["teams_configuration"]["value"])
+        )
 
+    @lock_teams_configuration
     def delete(self, request, course_id: str, topic_id: str):
         """DELETE request handler for the topics view."""
         try:
@@ -156,7 +390,7 @@ class TopicsAPIView(GenericAPIView):
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        course_block = modulestore().get_course(course_key)
+        course_block = get_course(course_key)
         if course_block is None:
             return api_field_errors(
                 {"course_id": f"The supplied {course_id=} is not found."},
@@ -166,6 +400,9 @@ class TopicsAPIView(GenericAPIView):
         if not has_studio_write_access(request.user, course_key):
             self.permission_denied(request)
 
+        if response := self.check_teams_configuration_version(request, course_block.teams_configuration):
+            return response
+
         teams_configuration = deepcopy(course_block.teams_configuration.cleaned_data)
 
         topic_exists = False
@@ -183,13 +420,633 @@ class TopicsAPIView(GenericAPIView):
 
         data = {"teams_configuration": {"value": teams_configuration}}
         updated_data = update_course_advanced_settings(course_block, data, request.user)
+        invalidate_course(course_key)
+        metrics.increment("topics.writes", tags={"operation": "delete"})
+        response_data = {"topics": updated_data["teams_configuration"]["value"]["team_sets"]}
+
+        job = delete_removed_topic_teams(request.user, course_key, topic_id)
+        if job is not None:
+            response_data["job"] = job.to_public_dict()
+            response = Response(response_data, status=status.HTTP_202_ACCEPTED)
+        else:
+            response = Response(response_data, status=status.HTTP_204_NO_CONTENT)
+
+        return self.add_teams_configuration_version(
+            response, teams_config.TeamsConfig(updated_data["teams_configuration"]["value"])
+        )
+
+
+class TopicsBatchAPIView(
+    InstrumentedAPIViewMixin, FastJSONRendererMixin, TeamsConfigurationVersionMixin, GenericAPIView
+):
+    """
+    API view for the topics batch endpoint.
+
+    `Use Cases`:
+
+        * POST: Create, update and delete several topics of a course at once. The
+            operations are validated together against the current topics, and
+            applied with a single write of the course advanced settings. Nothing
+            is applied if any operation is invalid.
+
+    `Example Requests`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/batch/
+
+            * Path Parameters:
+                * course_id (str): The course id for the course of the topics (required).
+
+            * Body Parameters:
+                * operations (list[dict]): The operations to apply, in order (required).
+
+                    * op (str): One of `create`, `update` or `delete` (required).
+                    * id (str): The id of the topic to update or delete.
+                    * name (str): The name of the topic, required to create it.
+                    * description (str): The description of the topic.
+                    * type (str): The type of the topic, required to create it.
+                    * max_team_size (int): The max team size of the topic.
+
+            * Headers:
+                * If-Match (str): The version of the teams configuration the
+                    changes are based on (optional).
+
+    `Example Responses`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/batch/
+
+            * 400:
+                * The operations are missing.
+                * Some operations are invalid. The field errors of each invalid
+                    operation are returned under its index.
+
+            * 404:
+                * The supplied course_id does not exists.
+                * The supplied course is not found.
+
+            * 409:
+                * The teams configuration is being changed by another request.
+
+            * 412:
+                * The teams configuration was changed since the supplied version.
+
+            * 200: Returns a list of updated topics for the course, and the new
+                version of its teams configuration in the `ETag` header.
+
+                The response body will contain the following fields:
+
+                * topics (list): A list of updated topics for the course.
+                * jobs (list): The jobs that delete the teams of the deleted
+                    topics with more teams than the configured threshold.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    @lock_teams_configuration
+    def post(self, request, course_id: str):
+        """POST request handler for the topics batch view."""
+        operations = request.data.get("operations")
+        if not operations or not isinstance(operations, list):
+            return api_field_errors(
+                {"operations": "The [operations] parameter is required."}
+            )
+
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_studio_write_access(request.user, course_key):
+            self.permission_denied(request)
+
+        if response := self.check_teams_configuration_version(request, course_block.teams_configuration):
+            return response
+
+        teams_configuration = deepcopy(course_block.teams_configuration.cleaned_data)
+        team_sets, deleted_topic_ids, errors = apply_topic_operations(
+            teams_configuration["team_sets"], operations
+        )
+        if errors:
+            return api_field_errors({"operations": errors})
+
+        teams_configuration["team_sets"] = team_sets
+        data = {"teams_configuration": {"value": teams_configuration}}
+        updated_data = update_course_advanced_settings(course_block, data, request.user)
+        invalidate_course(course_key)
+        metrics.increment("topics.writes", tags={"operation": "batch"})
+
+        jobs = []
+        for topic_id in deleted_topic_ids:
+            job = delete_removed_topic_teams(request.user, course_key, topic_id)
+            if job is not None:
+                jobs.append(job.to_public_dict())
+
+        response = Response(
+            {
+                "topics": updated_data["teams_configuration"]["value"]["team_sets"],
+                "jobs": jobs,
+            },
+            status=status.HTTP_200_OK,
+        )
+        return self.add_teams_configuration_version(
+            response, teams_config.TeamsConfig(updated_data["teams_configuration"]["value"])
+        )
+
+
+class TopicTeamsAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the teams of a topic endpoint.
+
+    `Use Cases`:
+
+        * POST: Create many teams of a topic at once. The teams can be given one by
+            one, or generated: a number of teams named after a prefix (e.g. `Team 1`
+            to `Team N`), or enough teams to fit every enrolled learner of the
+            course at the maximum team size of the topic.
+
+    `Example Requests`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/{topic-id}/teams/
+
+            * Path Parameters:
+                * course_id (str): The course id for the course of the topic (required).
+                * topic_id (str): The topic id for the topic of the teams (required).
+
+            * Body Parameters (one of `teams`, `count` or `fill` is required):
+                * teams (list[dict]): The teams to create. Each one has a `name`
+                    (required), and optionally a `description`, `country`,
+                    `language` and `organization_protected`.
+                * count (int): The number of teams to generate.
+                * fill (bool): Generate the teams needed to fit every enrolled
+                    learner at the maximum team size of the topic.
+                * name_prefix (str): The prefix of the names of the generated
+                    teams. Defaults to `Team`.
+                * organization_protected (bool): Whether the generated teams are
+                    organization protected. Defaults to false.
+
+    `Example Responses`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/{topic-id}/teams/
+
+            * 400:
+                * None or more than one of `teams`, `count` or `fill` were given.
+                * The teams are malformed or too many.
+                * A team has a too long description, or an unknown country or language.
+                * The topic has no maximum team size to fill it.
+
+            * 404:
+                * The supplied course_id does not exists.
+                * The supplied course is not found.
+                * The supplied topic_id is not found.
+
+            * 201: Returns the created teams.
+
+                The response body will contain the following fields:
+
+                * teams (list): The created teams.
+
+                    * team_id (str): The team's unique identifier.
+                    * name (str): The name of the team.
+                    * description (str): The description of the team.
+                    * country (str): The country of the team.
+                    * language (str): The language of the team.
+                    * organization_protected (bool): Whether the team is organization protected.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, course_id: str, topic_id: str):
+        """POST request handler for the teams of a topic view."""
+        modes = [mode for mode in ("teams", "count", "fill") if request.data.get(mode) is not None]
+        if len(modes) != 1:
+            return api_error("Exactly one of the [teams], [count] or [fill] parameters is required.")
+
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
 
-        teams = CourseTeam.objects.filter(topic_id=topic_id)
-        for team in teams:
-            team.membership.all().delete()
-            team.delete()
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_studio_write_access(request.user, course_key):
+            self.permission_denied(request)
+
+        team_sets = course_block.teams_configuration.cleaned_data["team_sets"]
+        if not any(topic["id"] == topic_id for topic in team_sets):
+            return api_field_errors(
+                {"topic_id": f"The supplied {topic_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        limit = getattr(settings, "PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT", 10000)
+        if modes == ["teams"]:
+            teams_data = request.data["teams"]
+            if not isinstance(teams_data, list) or not teams_data or not all(
+                isinstance(team_data, dict)
+                and isinstance(team_data.get("name"), str)
+                and 0 < len(team_data["name"].strip()) <= MAX_TEAM_NAME_LENGTH
+                for team_data in teams_data
+            ):
+                return api_field_errors(
+                    {"teams": f"Every team of the [teams] needs a [name] of up to {MAX_TEAM_NAME_LENGTH} characters."}
+                )
+            # Checked before validating each team with the platform serializer
+            if len(teams_data) > limit:
+                return api_error(f"At most {limit} teams can be created in a request.")
+            if teams_errors := get_teams_data_errors(course_key, topic_id, teams_data):
+                return api_field_errors({"teams": teams_errors})
+        else:
+            name_prefix = str(request.data.get("name_prefix") or "Team").strip()
+            if len(name_prefix) > MAX_TEAM_NAME_LENGTH // 2:
+                return api_field_errors(
+                    {"name_prefix": f"The [name_prefix] can have up to {MAX_TEAM_NAME_LENGTH // 2} characters."}
+                )
+
+            if modes == ["count"]:
+                try:
+                    count = int(request.data["count"])
+                except (TypeError, ValueError):
+                    count = 0
+                if count < 1:
+                    return api_field_errors({"count": "The [count] field must be a positive integer."})
+            else:
+                if request.data["fill"] is not True:
+                    return api_field_errors({"fill": "The [fill] field must be true."})
+                max_team_size = course_block.teams_configuration.calc_max_team_size(topic_id)
+                if not max_team_size:
+                    return api_field_errors({"fill": "The topic has no maximum team size."})
+                count = get_missing_team_count(course_key, topic_id, max_team_size)
+            if count > limit:
+                return api_error(f"At most {limit} teams can be created in a request.")
+
+            organization_protected = bool(request.data.get("organization_protected", False))
+            teams_data = [
+                {"name": name, "organization_protected": organization_protected}
+                for name in get_generated_team_names(course_key, topic_id, count, name_prefix)
+            ]
+
+        teams = create_teams(course_key, topic_id, teams_data)
 
         return Response(
-            {"topics": updated_data["teams_configuration"]["value"]["team_sets"]},
-            status=status.HTTP_204_NO_CONTENT,
+            {
+                "teams": [
+                    {
+                        "team_id": team.team_id,
+                        "name": team.name,
+                        "description": team.description,
+                        "country": str(team.country),
+                        "language": str(team.language),
+                        "organization_protected": team.organization_protected,
+                    }
+                    for team in teams
+                ]
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class TeamFormationAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the automatic team formation endpoint.
+
+    `Use Cases`:
+
+        * POST: Place every enrolled learner that is not on a team of a topic on
+            one, keeping the teams within the maximum team size of the topic and
+            as even as possible. The missing teams are created, and the learners
+            can be balanced across the teams by a profile attribute. The proposed
+            placement can be reviewed first with a dry run.
+
+    `Example Requests`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/{topic-id}/formation/
+
+            * Path Parameters:
+                * course_id (str): The course id for the course of the topic (required).
+                * topic_id (str): The topic id for the topic of the teams (required).
+
+            * Body Parameters:
+                * balance_by (str): The profile attribute to balance across the
+                    teams: `country`, `gender`, `level_of_education` or
+                    `year_of_birth` (optional).
+                * name_prefix (str): The prefix of the names of the new teams.
+                    Defaults to `Team`.
+                * dry_run (bool): Return the proposed placement without applying
+                    it. Defaults to false.
+
+    `Example Responses`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/{topic-id}/formation/
+
+            * 400:
+                * The supplied balance_by is not supported.
+                * The topic has no teams and no maximum team size.
+
+            * 404:
+                * The supplied course_id does not exists.
+                * The supplied course is not found.
+                * The supplied topic_id is not found.
+
+            * 200: The proposed placement, for a dry run.
+
+                The response body will contain the following fields:
+
+                * learners (int): The number of learners to place.
+                * teams (list): The existing and new teams.
+
+                    * team_id (str): The team's unique identifier, null for new teams.
+                    * name (str): The name of the team.
+                    * team_size (int): The current size of the team.
+                    * added (list[str]): The usernames of the learners to add.
+
+            * 202: The teams are being formed in the background.
+
+                The response body will contain the fields of the job, whose
+                progress is available in the jobs endpoint.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, course_id: str, topic_id: str):
+        """POST request handler for the team formation view."""
+        balance_by = request.data.get("balance_by") or None
+        if balance_by is not None and balance_by not in BALANCE_ATTRIBUTES:
+            return api_field_errors(
+                {"balance_by": f"The [balance_by] field must be one of {list(BALANCE_ATTRIBUTES)}."}
+            )
+
+        name_prefix = str(request.data.get("name_prefix") or "Team").strip()
+        if len(name_prefix) > MAX_TEAM_NAME_LENGTH // 2:
+            return api_field_errors(
+                {"name_prefix": f"The [name_prefix] can have up to {MAX_TEAM_NAME_LENGTH // 2} characters."}
+            )
+
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_studio_write_access(request.user, course_key):
+            self.permission_denied(request)
+
+        team_sets = course_block.teams_configuration.cleaned_data["team_sets"]
+        if not any(topic["id"] == topic_id for topic in team_sets):
+            return api_field_errors(
+                {"topic_id": f"The supplied {topic_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        max_team_size = course_block.teams_configuration.calc_max_team_size(topic_id) or None
+
+        if request.data.get("dry_run"):
+            try:
+                plan = plan_team_formation(course_key, topic_id, max_team_size, balance_by, name_prefix)
+            except TeamFormationError as error:
+                return api_error(str(error))
+
+            return Response(
+                {"learners": len(plan.user_ids), "teams": get_plan_summary(plan)},
+                status=status.HTTP_200_OK,
+            )
+
+        if max_team_size is None and not get_topic_teams(course_key, topic_id).exists():
+            return api_error("The topic has no teams and no maximum team size.")
+
+        job = start_job(
+            TEAM_FORMATION_JOB,
+            request.user,
+            course_key,
+            0,
+            form_teams_job,
+            course_key,
+            topic_id,
+            max_team_size,
+            balance_by,
+            name_prefix,
         )
+
+        return Response(job.to_public_dict(), status=status.HTTP_202_ACCEPTED)
+
+
+class TeamRebalanceAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the team rebalancing endpoint.
+
+    `Use Cases`:
+
+        * POST: Move members between the teams of a topic until every team is
+            within a size range, with the minimum number of moves. The moves can
+            be reviewed first with a preview.
+
+    `Example Requests`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/{topic-id}/rebalance/
+
+            * Path Parameters:
+                * course_id (str): The course id for the course of the topic (required).
+                * topic_id (str): The topic id for the topic of the teams (required).
+
+            * Body Parameters:
+                * min_size (int): The minimum team size. Defaults to the average
+                    team size, rounded down.
+                * max_size (int): The maximum team size. Defaults to the maximum
+                    team size of the topic, which it can not exceed, or to the
+                    average team size rounded up if the topic has none.
+                * preview (bool): Return the moves without applying them.
+                    Defaults to false.
+
+    `Example Responses`:
+
+        * POST: /platform-plugin-teams/{course-id}/api/topics/{topic-id}/rebalance/
+
+            * 400:
+                * The sizes are not integers or exceed the maximum team size of the topic.
+                * The topic has no teams, or its members do not fit in the size range.
+
+            * 404:
+                * The supplied course_id does not exists.
+                * The supplied course is not found.
+                * The supplied topic_id is not found.
+
+            * 200: The moves, applied unless it is a preview.
+
+                The response body will contain the following fields:
+
+                * moves (list): The members to move.
+
+                    * username (str): The username of the member.
+                    * from_team_id (str): The team the member leaves.
+                    * to_team_id (str): The team the member joins.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, course_id: str, topic_id: str):
+        """POST request handler for the team rebalancing view."""
+        sizes = {}
+        for field in ("min_size", "max_size"):
+            value = request.data.get(field)
+            if value is None:
+                continue
+            try:
+                sizes[field] = int(value)
+            except (TypeError, ValueError):
+                sizes[field] = -1
+            if sizes[field] < 0:
+                return api_field_errors({field: f"The [{field}] field must be a non-negative integer."})
+
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_studio_write_access(request.user, course_key):
+            self.permission_denied(request)
+
+        team_sets = course_block.teams_configuration.cleaned_data["team_sets"]
+        if not any(topic["id"] == topic_id for topic in team_sets):
+            return api_field_errors(
+                {"topic_id": f"The supplied {topic_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        max_team_size = course_block.teams_configuration.calc_max_team_size(topic_id)
+        if max_team_size:
+            if sizes.setdefault("max_size", max_team_size) > max_team_size:
+                return api_field_errors(
+                    {"max_size": f"The [max_size] can not exceed the maximum team size of the topic ({max_team_size})."}
+                )
+
+        rebalance = plan_rebalance if request.data.get("preview") else rebalance_teams
+        try:
+            moves = rebalance(course_key, topic_id, **sizes)
+        except RebalanceError as error:
+            return api_error(str(error))
+
+        return Response(
+            {
+                "moves": [
+                    {
+                        "username": move.username,
+                        "from_team_id": move.from_team_id,
+                        "to_team_id": move.to_team_id,
+                    }
+                    for move in moves
+                ]
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class JobAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the background jobs endpoint.
+
+    `Use Cases`:
+
+        * GET: Get the progress of a background job started in the course, e.g.
+            the deletion of the teams of a large topic.
+
+    `Example Requests`:
+
+        * GET: /platform-plugin-teams/{course-id}/api/jobs/{job-id}/
+
+            * Path Parameters:
+                * course_id (str): The course id of the job (required).
+                * job_id (str): The id of the job (required).
+
+    `Example Responses`:
+
+        * GET: /platform-plugin-teams/{course-id}/api/jobs/{job-id}/
+
+            * 404:
+                * The supplied job_id does not exists, has expired or was started
+                    by another user.
+
+            * 200: The progress of the job.
+
+                The response body will contain the following fields:
+
+                * job_id (str): The id of the job.
+                * status (str): One of `pending`, `running`, `completed` or `failed`.
+                * total (int): The number of items to process.
+                * processed (int): The number of items processed so far.
+                * failed (int): The number of items that could not be processed.
+                * errors (list[dict]): Details of the first items that could not
+                    be processed.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, course_id: str, job_id: str):
+        """GET request handler for the jobs view."""
+        job = Job.get(job_id)
+        if job is None or job.user_id != request.user.id or job.course_id != course_id:
+            return api_field_errors(
+                {"job_id": f"The supplied {job_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(job.to_public_dict(), status=status.HTTP_200_OK)
@@ -0,0 +1,64 @@
+"""Pagination classes for the Teams API."""
+from base64 import b64encode
+from urllib import parse
+
+from rest_framework.pagination import CursorPagination
+
+
+class TeamsCursorPagination(CursorPagination):
+    """
+    Keyset pagination of the teams of a topic, ordered by primary key.
+
+    Each page is fetched with a query that starts after the last team of the
+    previous page, so the cost of a page does not grow with its position and
+    the pages are stable while teams are created.
+    """
+
+    ordering = "pk"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    @staticmethod
+    def get_cursor_after(pk) -> str:
+        """
+        Get the cursor of the page of teams that starts after a team.
+
+        The cursor has the same format as the ones of the `next` links.
+
+        Args:
+            pk (int): The primary key of the last team already returned.
+
+        Returns:
+            str: The cursor, to send in the `cursor` query parameter.
+        """
+        querystring = parse.urlencode({"p": str(pk)})
+        return b64encode(querystring.encode("ascii")).decode("ascii")
+
+
+def parse_teams_page_size(value: str):
+    """
+    Parse the number of teams to embed in each topic of a topics response.
+
+    Args:
+        value (str): The `teams_page_size` query parameter, if sent.
+
+    Returns:
+        int: The number of teams, or None to embed every team.
+
+    Raises:
+        ValueError: If the value is not a positive integer up to the maximum
+            page size of the teams.
+    """
+    if value is None:
+        return None
+
+    max_page_size = TeamsCursorPagination.max_page_size
+    try:
+        teams_page_size = int(value)
+    except ValueError:
+        teams_page_size = 0
+    if not 0 < teams_page_size <= max_page_size:
+        raise ValueError(f"The [teams_page_size] must be an integer between 1 and {max_page_size}.")
+
+    return teams_page_size
@@ -1,39 +1,217 @@
-"""Serializers for the Teams API."""
+"""
+Serializers for the Teams API.
+
+The serializers extend the platform teams serializers, so they are built when
+they are first accessed, instead of importing the LMS teams backend with this
+module.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
 from rest_framework import serializers
 
-from platform_plugin_teams.edxapp_wrapper.teams_common import CourseTeam
-from platform_plugin_teams.edxapp_wrapper.teams_lms import BulkTeamCountTopicSerializer, CourseTeamSerializer
+from platform_plugin_teams.edxapp_wrapper import teams_lms
+
+TEAMS_FIELD = "teams"
+MEMBERSHIP_FIELD = "membership"
+# The nested relations of the teams that are only returned when expanded
+TEAM_EXPANSIONS = (MEMBERSHIP_FIELD,)
+
+TopicsProjection = namedtuple("TopicsProjection", ["topic_fields", "team_fields"])
 
 
-class CustomTeamSerializer(BulkTeamCountTopicSerializer):
+@lru_cache(maxsize=None)
+def _build_custom_team_serializer(base_class: type) -> type:
     """
-    Serializer for add teams information to the topic.
+    Build the serializer that adds the teams to the topics.
 
-    This is a subclass of the BulkTeamCountTopicSerializer. The purpose of this
-    subclass is add the `teams` field, which is a list of teams.
+    Args:
+        base_class (type): The platform `BulkTeamCountTopicSerializer`.
+
+    Returns:
+        type: The `CustomTeamSerializer` class.
     """
 
-    teams = serializers.SerializerMethodField()
+    class CustomTeamSerializer(base_class):  # pylint: disable=redefined-outer-name
+        """
+        Serializer for add teams information to the topic.
 
-    def get_teams(self, topic: dict) -> list:
+        This is a subclass of the BulkTeamCountTopicSerializer. The purpose of this
+        subclass is add the `teams` field, which is a list of teams, and the
+        `teams_cursor` field, the cursor of the teams that were not embedded.
         """
-        Get the teams for a given topic.
 
-        Args:
-            topic (dict): The topic for which to get the teams.
+        teams = serializers.SerializerMethodField()
+        teams_cursor = serializers.SerializerMethodField()
+
+        def get_teams(self, topic: dict) -> list:
+            """
+            Get the teams for a given topic.
+
+            The teams of every topic in the page are serialized beforehand and
+            provided by the view in the `teams_by_topic` context entry.
+
+            Args:
+                topic (dict): The topic for which to get the teams.
+
+            Returns:
+                list: A list of teams for the given topic.
+            """
+            return self.context["teams_by_topic"].get(topic.get("id"), [])
+
+        def get_teams_cursor(self, topic: dict):
+            """
+            Get the cursor of the teams of a topic that were not embedded.
+
+            The cursors are provided by the view in the `teams_cursor_by_topic`
+            context entry, when the number of embedded teams is limited.
+
+            Args:
+                topic (dict): The topic for which to get the cursor.
+
+            Returns:
+                str: The cursor of the next page of teams of the topic, or None if
+                    every team was embedded.
+            """
+            return self.context.get("teams_cursor_by_topic", {}).get(topic.get("id"))
+
+    return CustomTeamSerializer
 
-        Returns:
-            list: A list of teams for the given topic.
+
+@lru_cache(maxsize=None)
+def _build_team_summary_serializer(base_class: type) -> type:
+    """
+    Build the serializer of a team without its memberships.
+
+    Args:
+        base_class (type): The platform `CourseTeamSerializer`.
+
+    Returns:
+        type: The `TeamSummarySerializer` class.
+    """
+
+    class TeamSummarySerializer(base_class):  # pylint: disable=redefined-outer-name
+        """
+        Serializer for a team without its memberships.
+
+        This is a subclass of the CourseTeamSerializer. The `membership` field is
+        replaced by the `member_count` field, which must be annotated to the teams,
+        so the memberships do not have to be fetched.
         """
-        result_filter = self.context["result_filter"]
-        excluded_private_team_ids = self.context["excluded_private_team_ids"]
-
-        result_filter.update({"topic_id": topic.get("id")})
-        queryset = CourseTeam.objects.filter(**result_filter).exclude(
-            team_id__in=excluded_private_team_ids
-        )
-        team_serializer = CourseTeamSerializer(
-            queryset, context={"request": self.context["request"]}, many=True
-        )
-
-        return team_serializer.data
+
+        member_count = serializers.IntegerField(read_only=True)
+
+        class Meta(base_class.Meta):
+            fields = tuple(
+                field for field in base_class.Meta.fields if field != MEMBERSHIP_FIELD
+            ) + ("member_count",)
+
+    return TeamSummarySerializer
+
+
+def get_custom_team_serializer() -> type:
+    """
+    Get `CustomTeamSerializer`, built on the platform `BulkTeamCountTopicSerializer`.
+    """
+    return _build_custom_team_serializer(teams_lms.BulkTeamCountTopicSerializer)
+
+
+def get_team_summary_serializer() -> type:
+    """
+    Get `TeamSummarySerializer`, built on the platform `CourseTeamSerializer`.
+    """
+    return _build_team_summary_serializer(teams_lms.CourseTeamSerializer)
+
+
+LAZY_ATTRIBUTES = {
+    "CustomTeamSerializer": get_custom_team_serializer,
+    "TeamSummarySerializer": get_team_summary_serializer,
+}
+
+CustomTeamSerializer: type
+TeamSummarySerializer: type
+
+
+def __getattr__(name):
+    """
+    Build the serializers of `LAZY_ATTRIBUTES` on first access.
+    """
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_topics_projection(fields: str, expand: str):
+    """
+    Parse the fields of the topics and teams requested in a topics response.
+
+    Args:
+        fields (str): The `fields` query parameter, the comma separated topic
+            fields and team fields, prefixed with `teams.`, to return. Every
+            field is returned if it is not sent. The `teams` field is added if
+            any team field is requested.
+        expand (str): The `expand` query parameter, the comma separated nested
+            relations of the teams to return, e.g. `membership`.
+
+    Returns:
+        TopicsProjection: The topic fields and the team fields to return, or
+            None if neither parameter was sent, to return the full topics.
+
+    Raises:
+        ValueError: If a field or a relation is not supported, with the name of
+            the query parameter and the error message as arguments.
+    """
+    if fields is None and expand is None:
+        return None
+
+    topic_field_names = tuple(get_custom_team_serializer()().fields)
+    team_field_names = tuple(get_team_summary_serializer()().fields)
+
+    topic_fields = []
+    team_fields = []
+    for field in filter(None, (field.strip() for field in (fields or "").split(","))):
+        if field.startswith(f"{TEAMS_FIELD}."):
+            team_field = field[len(TEAMS_FIELD) + 1:]
+            if team_field not in team_field_names:
+                raise ValueError("fields", f"The team field {team_field!r} must be one of {list(team_field_names)}.")
+            team_fields.append(team_field)
+        elif field in topic_field_names:
+            topic_fields.append(field)
+        else:
+            raise ValueError("fields", f"The topic field {field!r} must be one of {list(topic_field_names)}.")
+
+    expansions = []
+    for expansion in filter(None, (expansion.strip() for expansion in (expand or "").split(","))):
+        if expansion not in TEAM_EXPANSIONS:
+            raise ValueError("expand", f"The relation {expansion!r} must be one of {list(TEAM_EXPANSIONS)}.")
+        expansions.append(expansion)
+
+    if not topic_fields:
+        topic_fields = list(topic_field_names)
+    elif team_fields and TEAMS_FIELD not in topic_fields:
+        topic_fields.append(TEAMS_FIELD)
+
+    return TopicsProjection(
+        tuple(dict.fromkeys(topic_fields)),
+        tuple(dict.fromkeys((team_fields or list(team_field_names)) + expansions)),
+    )
+
+
+def project_team(team_data: dict, team_fields: tuple) -> dict:
+    """
+    Keep the requested fields of a serialized team.
+
+    Args:
+        team_data (dict): The team, serialized with its memberships or with
+            `TeamSummarySerializer`.
+        team_fields (tuple): The fields to keep.
+
+    Returns:
+        dict: The requested fields of the team. The member count of a team
+            serialized with its memberships is the number of memberships.
+    """
+    return {
+        field: len(team_data[MEMBERSHIP_FIELD]) if field not in team_data else team_data[field]
+        for field in team_fields
+    }
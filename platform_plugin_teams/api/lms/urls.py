@@ -1,15 +1,39 @@
 """URL patterns for the platform_plugin_teams API in the LMS."""
 from django.urls import path
 
+from platform_plugin_teams.api import views as shared_views
 from platform_plugin_teams.api.lms import views
 
 app_name = "platform_plugin_teams"
 
 urlpatterns = [
     path("topics/", views.TopicsReadOnlyAPIView.as_view(), name="topics-read-only-api"),
+    path("topics/bulk/", views.TopicsBulkReadOnlyAPIView.as_view(), name="topics-bulk-read-only-api"),
+    path(
+        "topics/<str:topic_id>/teams/",
+        views.TopicTeamsAPIView.as_view(),
+        name="topic-teams-api",
+    ),
     path(
         "team-membership/",
         views.TeamMembershipAPIView.as_view(),
         name="team-membership-api",
     ),
+    path(
+        "team-membership/import/",
+        views.TeamMembershipImportAPIView.as_view(),
+        name="team-membership-import-api",
+    ),
+    path(
+        "team-membership/import/<str:job_id>/",
+        views.TeamMembershipImportAPIView.as_view(),
+        name="team-membership-import-status-api",
+    ),
+    path("export/", views.TeamsExportAPIView.as_view(), name="teams-export-api"),
+    path(
+        "profiles/<str:profile_id>/",
+        shared_views.ProfileAPIView.as_view(),
+        name="profiles-api",
+    ),
+    path("metrics/", shared_views.MetricsAPIView.as_view(), name="metrics-api"),
 ]
@@ -1,5 +1,15 @@
 """API views for the teams plugin in the LMS"""
-from django.contrib.auth import get_user_model
+import csv
+import hashlib
+import io
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from django.utils.text import slugify
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
 from opaque_keys import InvalidKeyError
@@ -8,32 +18,70 @@ from rest_framework import permissions, status
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
-from platform_plugin_teams.api.lms.serializers import CustomTeamSerializer
+from platform_plugin_teams.api.lms.pagination import TeamsCursorPagination, parse_teams_page_size
+from platform_plugin_teams.api.lms.serializers import (
+    MEMBERSHIP_FIELD,
+    get_custom_team_serializer,
+    get_team_summary_serializer,
+    get_topics_projection,
+    project_team,
+)
+from platform_plugin_teams.cache import get_course_version, topics_snapshot_cache
+from platform_plugin_teams.edxapp_wrapper import teams_common, teams_lms
 from platform_plugin_teams.edxapp_wrapper.authentication import BearerAuthenticationAllowInactiveUser
 from platform_plugin_teams.edxapp_wrapper.courseware import has_access
-from platform_plugin_teams.edxapp_wrapper.modulestore import modulestore
-from platform_plugin_teams.edxapp_wrapper.student import get_user_by_username_or_email
-from platform_plugin_teams.edxapp_wrapper.teams_common import CourseTeam
+from platform_plugin_teams.edxapp_wrapper.modulestore import get_course
 from platform_plugin_teams.edxapp_wrapper.teams_lms import (
-    AlreadyOnTeamInTeamset,
-    CourseTeamMembership,
-    MembershipSerializer,
-    NotEnrolledInCourseForTeam,
-    TopicsPagination,
     _filter_hidden_private_teamsets,
-    can_user_modify_team,
     get_alphabetical_topics,
-    get_team_by_team_id,
-    has_specific_team_access,
     has_team_api_access,
     user_organization_protection_status,
 )
-from platform_plugin_teams.utils import api_error, api_field_errors
+from platform_plugin_teams.export import EXPORT_CONTENT_TYPES, NDJSON_FORMAT, iter_course_export
+from platform_plugin_teams.instrumentation import SERIALIZE_PHASE, InstrumentedAPIViewMixin, timed_phase
+from platform_plugin_teams.jobs import Job, start_job
+from platform_plugin_teams.memberships import (
+    MembershipError,
+    add_users_to_team,
+    check_users_to_add,
+    get_max_team_size,
+    get_team_to_join,
+    import_roster,
+    record_rejected_memberships,
+)
+from platform_plugin_teams.metrics import get_course_size
+from platform_plugin_teams.renderers import FastJSONRendererMixin
+from platform_plugin_teams.utils import api_error, api_field_errors, get_teams_configuration_version
+
+ROSTER_IMPORT_JOB = "roster_import"
+EXPORT_FORMAT_PARAMETER = "file_format"
+
+TopicsSnapshot = namedtuple("TopicsSnapshot", ["configuration_version", "topics", "team_count", "team_payloads"])
+# A serialized team of a topics snapshot, with the fields its visibility depends on
+TeamPayload = namedtuple("TeamPayload", ["pk", "organization_protected", "data"])
+
+
+def get_topics_bulk_max_courses() -> int:
+    """Maximum number of courses of a request to the topics bulk endpoint."""
+    return getattr(settings, "PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES", 50)
+
+
+def get_roster_import_max_rows() -> int:
+    """Maximum number of rows of a roster import."""
+    return getattr(settings, "PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS", 50000)
+
+
+def membership_error_response(error: MembershipError) -> Response:
+    """
+    Build the response of a team membership error.
+    """
+    if error.field:
+        return api_field_errors({error.field: error.message}, status_code=error.status_code)
 
-User = get_user_model()
+    return api_error(error.message, status_code=error.status_code)
 
 
-class TopicsReadOnlyAPIView(GenericAPIView):
+class TopicsReadOnlyAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
     """
     API view for the topics endpoints.
 
@@ -53,11 +101,28 @@ class TopicsReadOnlyAPIView(GenericAPIView):
             * Query Parameters:
                 * page (int): The page number to return (optional).
                 * page_size (int): The number of results to return per page (optional).
+                * teams_page_size (int): The maximum number of teams to return per
+                    topic (optional). By default every team is returned.
+                * fields (str): The comma separated fields of the topics to return,
+                    and of their teams prefixed with `teams.`, e.g.
+                    `id,name,teams.id,teams.member_count` (optional). By default
+                    every field is returned.
+                * expand (str): The comma separated relations of the teams to
+                    return along with `fields`: `membership` (optional). When
+                    `fields` or `expand` is sent, the memberships of the teams
+                    are only returned, and fetched, if they are expanded.
+
+            * Headers:
+                * If-None-Match (str): The ETag of a previous response (optional).
 
     `Example Responses`:
 
         * GET: /platform-plugin-teams/{course_id}/api/topics/?page={page}&page_size={page_size}
 
+            * 400:
+                * The supplied teams_page_size is not valid.
+                * The supplied fields or expand are not supported.
+
             * 404:
                 * The supplied course_id does not exists.
                 * The supplied course is not found.
@@ -65,7 +130,12 @@ class TopicsReadOnlyAPIView(GenericAPIView):
             * 403:
                 * The user do not have access to the Team API for the given course.
 
-            * 200: Returns a list of topics for the given course.
+            * 304: The topics did not change since the request that returned the
+                ETag sent in the `If-None-Match` header.
+
+            * 200: Returns a list of topics for the given course. The response
+                includes an `ETag` header that can be sent back in the
+                `If-None-Match` header of the following requests.
 
                 The response body will contain the following fields:
 
@@ -87,6 +157,11 @@ class TopicsReadOnlyAPIView(GenericAPIView):
                     * max_team_size (int): The max team size of the topic.
                     * team_count (int): Number of teams created under the topic.
                     * teams (list[dict]): A list of teams under the topic.
+                    * teams_cursor (str): When `teams_page_size` is sent and the
+                        topic has more teams, the cursor of its next teams in the
+                        topic teams endpoint; otherwise null.
+                    * member_count (int): Number of members of each team, only
+                        returned when requested with `fields`.
     """
 
     authentication_classes = (
@@ -95,11 +170,19 @@ class TopicsReadOnlyAPIView(GenericAPIView):
         SessionAuthenticationAllowInactiveUser,
     )
     permission_classes = (permissions.IsAuthenticated,)
-    pagination_class = TopicsPagination
     queryset = []
 
+    @property
+    def pagination_class(self):
+        """The pagination of the platform topics API, resolved on first use."""
+        return teams_lms.TopicsPagination
+
     def get(self, request, course_id: str):
         """GET request handler for the topics view."""
+        teams_page_size, projection, field_errors = self._get_options()
+        if field_errors:
+            return api_field_errors(field_errors)
+
         try:
             course_key = CourseKey.from_string(course_id)
         except InvalidKeyError:
@@ -108,7 +191,7 @@ class TopicsReadOnlyAPIView(GenericAPIView):
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        course_block = modulestore().get_course(course_key)
+        course_block = get_course(course_key)
         if course_block is None:
             return api_field_errors(
                 {"course_id": f"The supplied {course_id=} is not found."},
@@ -121,68 +204,609 @@ class TopicsReadOnlyAPIView(GenericAPIView):
                 status_code=status.HTTP_403_FORBIDDEN,
             )
 
-        organization_protection_status = user_organization_protection_status(
-            request.user, course_key
+        configuration_version = get_teams_configuration_version(course_block.teams_configuration)
+        snapshot = topics_snapshot_cache.get_or_build(
+            course_key,
+            lambda: self._build_topics_snapshots({course_key: course_block})[course_key],
+            source_version=configuration_version,
         )
-        topics = get_alphabetical_topics(course_block)
-        topics = _filter_hidden_private_teamsets(request.user, topics, course_block)
+        self.metric_tags["course_size"] = get_course_size(snapshot.team_count)
 
-        result_filter = {}
         organization_protection_status = user_organization_protection_status(
             request.user, course_key
         )
-        if not organization_protection_status.is_exempt:
-            result_filter.update(
-                {"organization_protected": organization_protection_status.is_protected}
-            )
 
-        # Hide private_managed courses from non-staff users that aren't members of those teams
-        excluded_private_team_ids = self._get_private_team_ids_to_exclude(course_block)
+        etag = self._get_etag(course_key, configuration_version, organization_protection_status)
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            return self._add_conditional_headers(response, etag)
+
+        topics = _filter_hidden_private_teamsets(
+            request.user, snapshot.topics, course_block
+        )
+
+        # The topics are shared between requests, the serializer adds the team count to a copy
+        page = [dict(topic) for topic in self.paginate_queryset(topics)]
+        teams_by_topic, teams_cursor_by_topic = self._get_teams_by_course(
+            {course_key: course_block},
+            {course_key: snapshot},
+            {course_key: page},
+            {course_key: organization_protection_status},
+            teams_page_size,
+            projection.team_fields if projection else None,
+        )[course_key]
         context = {
             "request": request,
             "course_id": course_key,
             "organization_protection_status": organization_protection_status,
-            "excluded_private_team_ids": excluded_private_team_ids,
-            "result_filter": result_filter,
+            "teams_by_topic": teams_by_topic,
+            "teams_cursor_by_topic": teams_cursor_by_topic,
         }
 
         # Use the serializer that adds team info per topic
-        serializer = CustomTeamSerializer(
-            self.paginate_queryset(topics),
-            context=context,
-            many=True,
-        )
+        with timed_phase(SERIALIZE_PHASE):
+            topics_data = get_custom_team_serializer()(
+                page,
+                context=context,
+                many=True,
+            ).data
+
+        if projection:
+            topics_data = [{field: topic[field] for field in projection.topic_fields} for topic in topics_data]
+
+        response = self.get_paginated_response(topics_data)
+
+        return self._add_conditional_headers(response, etag)
 
-        response = self.get_paginated_response(serializer.data)
+    def _get_etag(self, course_key: CourseKey, configuration_version: str, organization_protection_status) -> str:
+        """
+        Build the ETag of the topics requested by the user.
+
+        The ETag changes whenever the teams configuration, the teams or the
+        memberships of the course change, and it is different for each user,
+        requested page and negotiated media type, so it can be computed without
+        serializing the response.
+
+        Args:
+            course_key (CourseKey): The course of the topics.
+            configuration_version (str): The version of the teams configuration
+                of the course loaded by the request.
+            organization_protection_status: The organization protection status
+                of the user in the course.
+
+        Returns:
+            str: The quoted ETag.
+        """
+        parts = [
+            str(course_key),
+            get_course_version(course_key),
+            configuration_version,
+            str(self.request.user.id),
+            str(has_access(self.request.user, "staff", course_key)),
+            str(organization_protection_status.is_exempt),
+            str(organization_protection_status.is_protected),
+            self.request.accepted_media_type,
+            self.request.META.get("QUERY_STRING", ""),
+        ]
+        digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+        return quote_etag(digest)
+
+    @staticmethod
+    def _add_conditional_headers(response: Response, etag: str) -> Response:
+        """
+        Add the ETag to the response and require clients to revalidate it.
 
+        The ETag depends on the negotiated media type, so caches must key the
+        response on the `Accept` header too.
+        """
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Accept",))
         return response
 
-    def _get_private_team_ids_to_exclude(self, course_block):
+    def _get_options(self) -> tuple:
         """
-        Get the list of team ids that should be excluded from the response.
+        Parse the query parameters that shape the topics of the response.
 
-        Users should not be able to see teams in private teamsets they are not members
-        of unless they're staff.
+        Returns:
+            tuple[int, TopicsProjection, dict]: The maximum number of teams per
+                topic, the fields to return, and the errors of the invalid
+                query parameters.
         """
-        if has_access(self.request.user, "staff", course_block.id):
-            return set()
+        query_params = self.request.query_params
+        field_errors = {}
+        teams_page_size = projection = None
 
-        private_teamset_ids = [
-            teamset.teamset_id
-            for teamset in course_block.teamsets
-            if teamset.is_private_managed
-        ]
-        excluded_team_ids = (
-            CourseTeam.objects.filter(
-                course_id=course_block.id, topic_id__in=private_teamset_ids
+        try:
+            teams_page_size = parse_teams_page_size(query_params.get("teams_page_size"))
+        except ValueError as error:
+            field_errors["teams_page_size"] = str(error)
+
+        try:
+            projection = get_topics_projection(query_params.get("fields"), query_params.get("expand"))
+        except ValueError as error:
+            parameter, message = error.args
+            field_errors[parameter] = message
+
+        return teams_page_size, projection, field_errors
+
+    @staticmethod
+    def _build_topics_snapshots(course_blocks: dict) -> dict:
+        """
+        Build the user independent snapshots of the topics of courses.
+
+        The snapshots hold the sorted topics, the version of the teams
+        configuration they were sorted from and the number of teams of the
+        course, counted with a single query for every course. The serialized
+        teams of each topic are added to the snapshot by the first request that
+        returns them, by `_load_team_payloads`, so a snapshot only holds the
+        teams of the topics that were requested since it was built.
+
+        Args:
+            course_blocks (dict): A mapping of course to its loaded course block.
+
+        Returns:
+            dict: A mapping of course to snapshot.
+        """
+        team_counts = dict(
+            teams_common.CourseTeam.objects.filter(course_id__in=list(course_blocks))
+            .values("course_id")
+            .annotate(team_count=Count("pk"))
+            .values_list("course_id", "team_count")
+            .order_by()
+        )
+        # The course ids of the teams are compared as strings, as they are stored
+        team_counts = {str(course_id): team_count for course_id, team_count in team_counts.items()}
+
+        return {
+            course_key: TopicsSnapshot(
+                get_teams_configuration_version(course_block.teams_configuration),
+                get_alphabetical_topics(course_block),
+                team_counts.get(str(course_key), 0),
+                {},
+            )
+            for course_key, course_block in course_blocks.items()
+        }
+
+    def _get_teams_by_course(
+        self,
+        course_blocks: dict,
+        snapshots: dict,
+        topics_by_course: dict,
+        organization_protection_statuses: dict,
+        teams_page_size: int = None,
+        team_fields: tuple = None,
+    ) -> dict:
+        """
+        Get the serialized teams of the given topics visible to the user, for several courses.
+
+        The serialized teams of each topic are kept in the snapshot of its
+        course, shared by every user, and the teams the user can not see are
+        filtered out of them for each request. The topics without serialized
+        teams in their snapshot are loaded with `_load_team_payloads`, with a
+        single query for every course. The teams are returned in the order of
+        the topic teams endpoint, so the teams left out of a topic can be
+        fetched from it.
+
+        Without the memberships in `team_fields`, the teams are serialized with
+        `TeamSummarySerializer`, kept apart from the full teams, so the
+        memberships are not fetched.
+
+        Args:
+            course_blocks (dict): A mapping of course to its course block.
+            snapshots (dict): A mapping of course to its topics snapshot.
+            topics_by_course (dict): A mapping of course to the topics to get
+                the teams of.
+            organization_protection_statuses (dict): A mapping of course to the
+                organization protection status of the user in the course.
+            teams_page_size (int, optional): The maximum number of teams to
+                return per topic. Every team is returned if it is None.
+            team_fields (tuple, optional): The fields of the teams to return.
+                Every field is returned if it is None.
+
+        Returns:
+            dict: A mapping of course to a tuple of the mapping of topic id to
+                the list of serialized teams of that topic, and the mapping of
+                topic id to the cursor of the teams that were left out, for the
+                topics with more teams than `teams_page_size`.
+        """
+        with_membership = team_fields is None or MEMBERSHIP_FIELD in team_fields
+        missing_topic_ids = {}
+        for course_key, topics in topics_by_course.items():
+            topic_ids = [
+                topic.get("id")
+                for topic in topics
+                if (topic.get("id"), with_membership) not in snapshots[course_key].team_payloads
+            ]
+            if topic_ids:
+                missing_topic_ids[course_key] = topic_ids
+        if missing_topic_ids:
+            self._load_team_payloads(snapshots, missing_topic_ids, with_membership)
+
+        private_team_pks = self._get_private_team_pks(course_blocks, topics_by_course)
+
+        teams_by_course = {}
+        for course_key, topics in topics_by_course.items():
+            organization_protection_status = organization_protection_statuses[course_key]
+            teams_by_topic = {}
+            teams_cursor_by_topic = {}
+            for topic in topics:
+                topic_id = topic.get("id")
+                user_team_pks = private_team_pks[course_key].get(topic_id)
+                payloads = [
+                    payload
+                    for payload in snapshots[course_key].team_payloads[(topic_id, with_membership)]
+                    if (user_team_pks is None or payload.pk in user_team_pks) and (
+                        organization_protection_status.is_exempt
+                        or payload.organization_protected == organization_protection_status.is_protected
+                    )
+                ]
+                if teams_page_size is not None and len(payloads) > teams_page_size:
+                    payloads = payloads[:teams_page_size]
+                    teams_cursor_by_topic[topic_id] = TeamsCursorPagination.get_cursor_after(payloads[-1].pk)
+                teams_by_topic[topic_id] = [
+                    payload.data if team_fields is None else project_team(payload.data, team_fields)
+                    for payload in payloads
+                ]
+            teams_by_course[course_key] = (teams_by_topic, teams_cursor_by_topic)
+
+        return teams_by_course
+
+    def _load_team_payloads(self, snapshots: dict, topic_ids_by_course: dict, with_membership: bool) -> None:
+        """
+        Serialize the teams of some topics into the snapshots of their courses.
+
+        Every team of the topics is fetched with a single query for every
+        course, along with their memberships and users, or with the number of
+        members counted by the query if `with_membership` is False, so the
+        number of queries does not grow with the number of topics, teams or
+        courses.
+
+        Args:
+            snapshots (dict): A mapping of course to its topics snapshot.
+            topic_ids_by_course (dict): A mapping of course to the topics to
+                serialize the teams of.
+            with_membership (bool): Whether to serialize the memberships of the
+                teams, or only their number.
+        """
+        # The course ids of the teams are compared as strings, as they are stored
+        course_keys = {str(course_key): course_key for course_key in topic_ids_by_course}
+        topic_teams = Q()
+        for course_key, topic_ids in topic_ids_by_course.items():
+            topic_teams |= Q(course_id=course_key, topic_id__in=topic_ids)
+
+        teams = teams_common.CourseTeam.objects.filter(topic_teams).order_by(TeamsCursorPagination.ordering)
+        if with_membership:
+            teams = teams.prefetch_related("membership__user")
+            serializer_class = teams_lms.CourseTeamSerializer
+        else:
+            teams = teams.annotate(member_count=Count("membership"))
+            serializer_class = get_team_summary_serializer()
+
+        teams = list(teams)
+        with timed_phase(SERIALIZE_PHASE):
+            teams_data = serializer_class(
+                teams, context={"request": self.request}, many=True
+            ).data
+
+        payloads = {
+            (course_key, topic_id): []
+            for course_key, topic_ids in topic_ids_by_course.items()
+            for topic_id in topic_ids
+        }
+        for team, team_data in zip(teams, teams_data):
+            payloads[(course_keys[str(team.course_id)], team.topic_id)].append(
+                TeamPayload(team.pk, team.organization_protected, team_data)
+            )
+        for (course_key, topic_id), topic_payloads in payloads.items():
+            snapshots[course_key].team_payloads[(topic_id, with_membership)] = topic_payloads
+
+    def _get_private_team_pks(self, course_blocks: dict, topics_by_course: dict) -> dict:
+        """
+        Get the teams of the user in the private topics of several courses.
+
+        Users should not be able to see teams in private teamsets they are not
+        members of unless they're staff. The teams of the user in every course
+        are fetched with a single query.
+
+        Args:
+            course_blocks (dict): A mapping of course to its course block.
+            topics_by_course (dict): A mapping of course to the topics to get
+                the teams of.
+
+        Returns:
+            dict: A mapping of course to the mapping of each private topic the
+                user only sees their own teams of, to the primary keys of
+                those teams.
+        """
+        private_team_pks = {course_key: {} for course_key in topics_by_course}
+        user_teams = Q()
+        for course_key, topics in topics_by_course.items():
+            if has_access(self.request.user, "staff", course_key):
+                continue
+
+            topic_ids = {topic.get("id") for topic in topics}
+            private_topic_ids = [
+                teamset.teamset_id
+                for teamset in course_blocks[course_key].teamsets
+                if teamset.is_private_managed and teamset.teamset_id in topic_ids
+            ]
+            if private_topic_ids:
+                private_team_pks[course_key] = {topic_id: set() for topic_id in private_topic_ids}
+                user_teams |= Q(course_id=course_key, topic_id__in=private_topic_ids)
+
+        if user_teams:
+            course_keys = {str(course_key): course_key for course_key in topics_by_course}
+            for pk, course_id, topic_id in teams_common.CourseTeam.objects.filter(
+                user_teams, membership__user=self.request.user
+            ).values_list("pk", "course_id", "topic_id"):
+                private_team_pks[course_keys[str(course_id)]][topic_id].add(pk)
+
+        return private_team_pks
+
+
+class TopicsBulkReadOnlyAPIView(TopicsReadOnlyAPIView):
+    """
+    API view for the topics of several courses.
+
+    This class provides GET method to get the topics of several courses with a
+    single request.
+
+    `Use Cases`:
+
+        * GET: Get the topics and teams of several courses, e.g. for the
+            dashboard of a program. The courses are loaded and their teams are
+            fetched together, and the access of the user is checked once per
+            course.
+
+    `Example Requests`:
+
+        * GET: /platform-plugin-teams/{course_id}/api/topics/bulk/?course_ids={course_ids}
+
+            * Path Parameters:
+                * course_id (str): The first course to get topics for (required).
+
+            * Query Parameters:
+                * course_ids (str): Comma separated ids of the other courses to
+                    get topics for (optional). At most
+                    `PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES` courses are
+                    accepted, including the one in the path.
+                * teams_page_size (int): The maximum number of teams to return per
+                    topic (optional). By default every team is returned.
+                * fields (str), expand (str): The fields of the topics and teams
+                    to return, as in the topics endpoint (optional).
+
+    `Example Responses`:
+
+        * GET: /platform-plugin-teams/{course_id}/api/topics/bulk/?course_ids={course_ids}
+
+            * 400:
+                * Too many courses were requested.
+                * The supplied teams_page_size is not valid.
+                * The supplied fields or expand are not supported.
+
+            * 200: Returns the topics of the courses the user has access to.
+
+                The response body will contain the following fields:
+
+                * results (list): The courses the user has access to, in the
+                    order they were requested.
+
+                    * course_id (str): The id of the course.
+                    * topics (list): All the topics of the course, with the same
+                        fields as the topics endpoint.
+
+                * errors (dict): The courses that could not be returned, mapped
+                    to the reason: the course does not exist, is not found or
+                    the user does not have access to its Team API.
+    """
+
+    pagination_class = None
+
+    def get(self, request, course_id: str):
+        """GET request handler for the topics bulk view."""
+        teams_page_size, projection, field_errors = self._get_options()
+        if field_errors:
+            return api_field_errors(field_errors)
+
+        course_ids = [course_id] + request.query_params.get("course_ids", "").split(",")
+        course_ids = [course_id for course_id in dict.fromkeys(course_ids) if course_id]
+        max_courses = get_topics_bulk_max_courses()
+        if len(course_ids) > max_courses:
+            return api_field_errors(
+                {"course_ids": f"At most {max_courses} courses can be requested at once."}
+            )
+
+        errors = {}
+        course_blocks = {}
+        for requested_course_id in course_ids:
+            try:
+                course_key = CourseKey.from_string(requested_course_id)
+            except InvalidKeyError:
+                errors[requested_course_id] = f"The supplied course_id={requested_course_id!r} does not exists."
+                continue
+
+            course_block = get_course(course_key)
+            if course_block is None:
+                errors[str(course_key)] = f"The supplied course_id='{course_key}' is not found."
+            elif not has_team_api_access(request.user, course_key):
+                errors[str(course_key)] = f"The {request.user=} do not have access to the Team API for the course."
+            else:
+                course_blocks[course_key] = course_block
+
+        snapshots = topics_snapshot_cache.get_many_or_build(
+            list(course_blocks),
+            lambda missing_course_keys: self._build_topics_snapshots(
+                {course_key: course_blocks[course_key] for course_key in missing_course_keys}
+            ),
+            source_versions={
+                course_key: get_teams_configuration_version(course_block.teams_configuration)
+                for course_key, course_block in course_blocks.items()
+            },
+        )
+
+        organization_protection_statuses = {}
+        topics_by_course = {}
+        for course_key, course_block in course_blocks.items():
+            organization_protection_statuses[course_key] = user_organization_protection_status(
+                request.user, course_key
             )
-            .exclude(membership__user=self.request.user)
-            .values_list("team_id", flat=True)
+            topics_by_course[course_key] = [
+                dict(topic)
+                for topic in _filter_hidden_private_teamsets(request.user, snapshots[course_key].topics, course_block)
+            ]
+
+        teams_by_course = self._get_teams_by_course(
+            course_blocks,
+            snapshots,
+            topics_by_course,
+            organization_protection_statuses,
+            teams_page_size,
+            projection.team_fields if projection else None,
         )
-        return set(excluded_team_ids)
 
+        results = []
+        for course_key, topics in topics_by_course.items():
+            teams_by_topic, teams_cursor_by_topic = teams_by_course[course_key]
+            context = {
+                "request": request,
+                "course_id": course_key,
+                "organization_protection_status": organization_protection_statuses[course_key],
+                "teams_by_topic": teams_by_topic,
+                "teams_cursor_by_topic": teams_cursor_by_topic,
+            }
+            with timed_phase(SERIALIZE_PHASE):
+                topics_data = get_custom_team_serializer()(topics, context=context, many=True).data
+
+            if projection:
+                topics_data = [{field: topic[field] for field in projection.topic_fields} for topic in topics_data]
+
+            results.append({"course_id": str(course_key), "topics": topics_data})
+
+        return Response({"results": results, "errors": errors}, status=status.HTTP_200_OK)
+
+
+class TopicTeamsAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the teams of a topic.
+
+    This class provides GET method to page through the teams of a topic.
+
+    `Use Cases`:
+
+        * GET: Get the teams of a topic on demand, e.g. the teams left out of a
+            topics response sent with `teams_page_size`. The pages are fetched
+            by keyset, after the last team of the previous page, so every page
+            costs the same whatever the number of teams of the topic.
+
+    `Example Requests`:
+
+        * GET: /platform-plugin-teams/{course_id}/api/topics/{topic_id}/teams/?cursor={cursor}&page_size={page_size}
+
+            * Path Parameters:
+                * course_id (str): The course id of the topic (required).
+                * topic_id (str): The id of the topic (required).
+
+            * Query Parameters:
+                * cursor (str): The cursor of the page, from the `teams_cursor`
+                    of a topic or the `next` link of a previous page (optional).
+                    By default the first page is returned.
+                * page_size (int): The number of teams to return per page
+                    (optional). 100 by default, at most 1000.
+
+    `Example Responses`:
+
+        * GET: /platform-plugin-teams/{course_id}/api/topics/{topic_id}/teams/
+
+            * 404:
+                * The supplied course_id does not exists.
+                * The supplied course is not found.
+                * The supplied topic_id is not found.
+                * The supplied cursor is not valid.
+
+            * 403:
+                * The user do not have access to the Team API for the given course.
+
+            * 200: Returns a page of the teams of the topic visible to the user,
+                with the same fields as the teams of the topics endpoint.
+
+                The response body will contain the following fields:
 
-class TeamMembershipAPIView(GenericAPIView):
+                * next (str): The URL to the next page of teams, or null if this
+                    is the last page.
+                * previous (str): The URL to the previous page of teams, or null
+                    if this is the first page.
+                * results (list[dict]): The teams of the page.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = TeamsCursorPagination
+
+    def get_serializer_class(self):
+        """Get the platform team serializer, resolved on first use."""
+        return teams_lms.CourseTeamSerializer
+
+    def get(self, request, course_id: str, topic_id: str):
+        """GET request handler for the topic teams view."""
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_team_api_access(request.user, course_key):
+            return api_error(
+                f"The {request.user=} do not have access to the Team API for the given course.",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+
+        topics = [topic for topic in course_block.teams_topics if topic["id"] == topic_id]
+        if not _filter_hidden_private_teamsets(request.user, topics, course_block):
+            return api_field_errors(
+                {"topic_id": f"The supplied {topic_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        queryset = teams_common.CourseTeam.objects.filter(course_id=course_key, topic_id=topic_id)
+
+        organization_protection_status = user_organization_protection_status(
+            request.user, course_key
+        )
+        if not organization_protection_status.is_exempt:
+            queryset = queryset.filter(
+                organization_protected=organization_protection_status.is_protected
+            )
+
+        # Hide the teams of private_managed teamsets the user is not a member of, unless they're staff
+        is_private_managed = any(
+            teamset.teamset_id == topic_id and teamset.is_private_managed
+            for teamset in course_block.teamsets
+        )
+        if is_private_managed and not has_access(request.user, "staff", course_key):
+            queryset = queryset.filter(membership__user=request.user)
+
+        page = self.paginate_queryset(queryset.prefetch_related("membership__user"))
+        with timed_phase(SERIALIZE_PHASE):
+            teams = self.get_serializer(page, many=True).data
+
+        return self.get_paginated_response(teams)
+
+
+class TeamMembershipAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
     """
     API view for the team membership endpoints.
 
@@ -191,7 +815,9 @@ class TeamMembershipAPIView(GenericAPIView):
     `Use Cases`:
 
         * POST: Add a list of users to a team. If the user is already on a team,
-            they will be removed from that team and added to the new team.
+            they will be removed from that team and added to the new team. The
+            users are added all at once, or none of them is added if any of them
+            can not join the team.
 
     `Example Requests`:
 
@@ -207,6 +833,7 @@ class TeamMembershipAPIView(GenericAPIView):
 
             * 400:
                 * The usernames and/or team_id is missing from the request body.
+                * The usernames are not a list of strings.
                 * The team does not have enough space for the given users.
                 * The user is not enrolled in the course associated with this team.
 
@@ -243,7 +870,10 @@ class TeamMembershipAPIView(GenericAPIView):
         SessionAuthenticationAllowInactiveUser,
     )
     permission_classes = (permissions.IsAuthenticated,)
-    serializer_class = MembershipSerializer
+
+    def get_serializer_class(self):
+        """Get the platform membership serializer, resolved on first use."""
+        return teams_lms.MembershipSerializer
 
     def post(self, request, course_id: str):  # pylint: disable=unused-argument
         """POST request handler for the team membership view."""
@@ -257,86 +887,291 @@ class TeamMembershipAPIView(GenericAPIView):
 
         if not usernames:
             field_errors["usernames"] = "The [usernames] query parameter is required."
+        elif not isinstance(usernames, list) or not all(isinstance(username, str) for username in usernames):
+            field_errors["usernames"] = "The [usernames] query parameter must be a list of usernames."
 
         if field_errors:
             return api_field_errors(field_errors)
 
-        team = get_team_by_team_id(team_id=team_id)
-        if not team:
+        # Adding the same user twice would only replace its first membership
+        usernames = list(dict.fromkeys(usernames))
+
+        try:
+            team = get_team_to_join(request.user, team_id)
+
+            users = []
+            for _username, user, error in check_users_to_add(request.user, team, usernames):
+                if error:
+                    raise error
+                users.append(user)
+
+            memberships = add_users_to_team(
+                team, users, max_team_size=get_max_team_size(team)
+            )
+        except MembershipError as error:
+            record_rejected_memberships(error, len(usernames))
+            return membership_error_response(error)
+
+        with timed_phase(SERIALIZE_PHASE):
+            memberships = self.get_serializer(memberships, many=True).data
+
+        return Response({"memberships": memberships}, status=status.HTTP_201_CREATED)
+
+
+class TeamMembershipImportAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the team membership import endpoints.
+
+    This class provides POST and GET methods for importing a roster of team
+    memberships in the background and following its progress.
+
+    `Use Cases`:
+
+        * POST: Start the import of a roster of (username, team_id) pairs. The users
+            are added to their teams with the same rules as the team membership
+            endpoint, in chunks that are written in their own transaction.
+        * GET: Get the progress of a roster import.
+
+    `Example Requests`:
+
+        * POST: /platform-plugin-teams/{course_id}/api/team-membership/import/
+
+            * Path Parameters:
+                * course_id (str): The course id of the teams (required).
+
+            * Body Parameters (JSON):
+                * rows (list[dict]): The `username` and `team_id` of each membership (required).
+
+            * Body Parameters (multipart):
+                * file (file): A CSV file with `username` and `team_id` columns (required).
+
+        * GET: /platform-plugin-teams/{course_id}/api/team-membership/import/{job_id}/
+
+            * Path Parameters:
+                * course_id (str): The course id of the teams (required).
+                * job_id (str): The id of the import job (required).
+
+    `Example Responses`:
+
+        * POST: /platform-plugin-teams/{course_id}/api/team-membership/import/
+
+            * 400:
+                * The roster is missing or malformed.
+                * The roster has more rows than allowed.
+
+            * 404:
+                * The supplied course_id does not exists.
+
+            * 403:
+                * The user do not have access to the Team API for the given course.
+
+            * 202: The import was started.
+
+                The response body will contain the fields of the job described below.
+
+        * GET: /platform-plugin-teams/{course_id}/api/team-membership/import/{job_id}/
+
+            * 404:
+                * The supplied job_id does not exists, has expired or was started
+                    by another user.
+
+            * 200: The progress of the import.
+
+                The response body will contain the following fields:
+
+                * job_id (str): The id of the import job.
+                * status (str): One of `pending`, `running`, `completed` or `failed`.
+                * total (int): The number of rows of the roster.
+                * processed (int): The number of rows processed so far.
+                * failed (int): The number of rows that could not be imported.
+                * errors (list[dict]): The `row`, `username`, `team_id` and `error`
+                    of the first rows that could not be imported.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, course_id: str):
+        """POST request handler for the team membership import view."""
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
             return api_field_errors(
-                {"team_id": f"The supplied {team_id=} does not exists."},
+                {"course_id": f"The supplied {course_id=} does not exists."},
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        if not has_specific_team_access(request.user, team):
-            return api_error(
-                f"The {request.user=} do not have access to the specified team.",
-                status_code=status.HTTP_403_FORBIDDEN,
+        if get_course(course_key) is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        if not can_user_modify_team(request.user, team):
+        if not has_team_api_access(request.user, course_key):
             return api_error(
-                f"The {request.user=} can't join an instructor managed team.",
+                f"The {request.user=} do not have access to the Team API for the given course.",
                 status_code=status.HTTP_403_FORBIDDEN,
             )
 
-        course_block = modulestore().get_course(team.course_id)
-
-        max_team_size = course_block.teams_configuration.calc_max_team_size(
-            team.topic_id
+        if "file" in request.FILES:
+            try:
+                content = request.FILES["file"].read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                return api_field_errors({"file": "The [file] must be an UTF-8 CSV file."})
+            raw_rows = list(csv.DictReader(io.StringIO(content)))
+            field = "file"
+        else:
+            raw_rows = request.data.get("rows")
+            field = "rows"
+
+        if not raw_rows or not isinstance(raw_rows, list):
+            return api_field_errors({field: f"The [{field}] parameter is required."})
+
+        max_rows = get_roster_import_max_rows()
+        if len(raw_rows) > max_rows:
+            return api_field_errors({field: f"The [{field}] can have at most {max_rows} rows."})
+
+        rows = []
+        for raw_row in raw_rows:
+            if (
+                not isinstance(raw_row, dict)
+                or not raw_row.get("username")
+                or not raw_row.get("team_id")
+            ):
+                return api_field_errors(
+                    {field: f"Every row of the [{field}] needs a [username] and a [team_id]."}
+                )
+            rows.append((str(raw_row["username"]).strip(), str(raw_row["team_id"]).strip()))
+
+        job = start_job(
+            ROSTER_IMPORT_JOB,
+            request.user,
+            course_key,
+            len(rows),
+            import_roster,
+            request.user,
+            course_key,
+            rows,
         )
+
+        return Response(job.to_public_dict(), status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request, course_id: str, job_id: str):
+        """GET request handler for the team membership import view."""
+        job = Job.get(job_id)
         if (
-            max_team_size is not None
-            and team.users.exclude(username__in=usernames).count() + len(usernames)
-            > max_team_size
+            job is None
+            or job.kind != ROSTER_IMPORT_JOB
+            or job.user_id != request.user.id
+            or job.course_id != course_id
         ):
-            return api_error(
-                f"The {team_id=} does not have enough space for the given users."
+            return api_field_errors(
+                {"job_id": f"The supplied {job_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        memberships = []
+        return Response(job.to_public_dict(), status=status.HTTP_200_OK)
 
-        for username in usernames:
-            if not has_team_api_access(
-                request.user, team.course_id, access_username=username
-            ):
-                return api_error(
-                    (
-                        f"The {request.user=} do not have access "
-                        "to the Team API for the given course."
-                    ),
-                    status_code=status.HTTP_403_FORBIDDEN,
-                )
 
-            try:
-                user = get_user_by_username_or_email(username)
-            except User.DoesNotExist:
-                return api_field_errors(
-                    {"usernames": f"The {username=} does not exists."},
-                    status_code=status.HTTP_404_NOT_FOUND,
-                )
+class TeamsExportAPIView(InstrumentedAPIViewMixin, FastJSONRendererMixin, GenericAPIView):
+    """
+    API view for the teams export endpoint.
 
-            try:
-                membership = team.add_user(user)
-            except AlreadyOnTeamInTeamset:
-                old_membership = CourseTeamMembership.objects.filter(
-                    user=user,
-                    team__course_id=team.course_id,
-                    team__topic_id=team.topic_id,
-                ).first()
-                old_membership.delete()
-                membership = team.add_user(user)
-            except NotEnrolledInCourseForTeam:
-                return api_field_errors(
-                    {
-                        "usernames": (
-                            f"The {username=} is not enrolled in "
-                            "the course associated with this team."
-                        )
-                    },
-                )
+    This class provides a GET method to export every teamset, team and
+    membership of a course.
 
-            serializer = self.get_serializer(instance=membership)
-            memberships.append(serializer.data)
+    `Use Cases`:
 
-        return Response({"memberships": memberships}, status=status.HTTP_201_CREATED)
+        * GET: Export the teams of a course for analytics, as a file with a record
+            per teamset, team and membership, streamed while it is read from the
+            database. The memory used does not grow with the size of the course.
+
+    `Example Requests`:
+
+        * GET: /platform-plugin-teams/{course_id}/api/export/?file_format=csv
+
+            * Path Parameters:
+                * course_id (str): The course id to export (required).
+
+            * Query Parameters:
+                * file_format (str): `ndjson` (default) or `csv`.
+
+    `Example Responses`:
+
+        * GET: /platform-plugin-teams/{course_id}/api/export/
+
+            * 400:
+                * The supplied file_format is not supported.
+
+            * 403:
+                * The user is not course staff.
+
+            * 404:
+                * The supplied course_id does not exists.
+
+            * 200: The export, as an attachment.
+
+                Each record has a `record` field with its kind, `teamset`,
+                `team` or `membership`, and the fields of that kind:
+
+                * teamset: teamset_id, name, description, teamset_type, max_team_size.
+                * team: teamset_id, team_id, name, description, country, language,
+                    organization_protected, team_size, date_created, last_activity_at.
+                * membership: teamset_id, team_id, username, date_joined, last_activity_at.
+
+                The teamsets come first, then each batch of teams followed by
+                their memberships. The CSV file has a column for each field of
+                any record, empty for the fields of the other kinds.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, course_id: str):
+        """GET request handler for the teams export view."""
+        export_format = request.query_params.get(EXPORT_FORMAT_PARAMETER, NDJSON_FORMAT)
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return api_field_errors(
+                {
+                    EXPORT_FORMAT_PARAMETER: (
+                        f"The supplied file format {export_format!r} must be one of {list(EXPORT_CONTENT_TYPES)}."
+                    )
+                }
+            )
+
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        course_block = get_course(course_key)
+        if course_block is None:
+            return api_field_errors(
+                {"course_id": f"The supplied {course_id=} is not found."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        if not has_access(request.user, "staff", course_key):
+            return api_error(
+                f"The {request.user=} is not staff of the given course.",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+
+        response = StreamingHttpResponse(
+            iter_course_export(course_block, export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        filename = f"teams-{slugify(course_id)}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
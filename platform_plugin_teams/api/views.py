@@ -0,0 +1,133 @@
+"""Views shared by the LMS and CMS APIs of the Teams plugin."""
+from django.http import HttpResponse
+from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
+from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
+from rest_framework import permissions, status
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from platform_plugin_teams.edxapp_wrapper.authentication import BearerAuthenticationAllowInactiveUser
+from platform_plugin_teams.metrics import get_metrics_backend
+from platform_plugin_teams.profiling import RequestProfile
+from platform_plugin_teams.utils import api_error, api_field_errors
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ProfileAPIView(GenericAPIView):
+    """
+    API view for the request profiles endpoint.
+
+    `Use Cases`:
+
+        * GET: Get the profile of a request to the plugin endpoints, run with
+            the `X-Platform-Plugin-Teams-Profile` header or the `profile` query
+            parameter by a global staff user.
+
+    `Example Requests`:
+
+        * GET: /platform-plugin-teams/{course-id}/api/profiles/{profile-id}/
+
+            * Path Parameters:
+                * course_id (str): The course id of the profiled request (required).
+                * profile_id (str): The id of the profile, returned in the
+                    `X-Platform-Plugin-Teams-Profile` header (required).
+
+    `Example Responses`:
+
+        * GET: /platform-plugin-teams/{course-id}/api/profiles/{profile-id}/
+
+            * 403:
+                * The user is not global staff.
+
+            * 404:
+                * The supplied profile_id does not exists, has expired or
+                    belongs to another course.
+
+            * 200: The profile of the request.
+
+                The response body will contain the following fields:
+
+                * profile_id (str): The id of the profile.
+                * user_id (int): The user that made the request.
+                * course_id (str): The course of the request.
+                * view (str): The view that served the request.
+                * method (str): The HTTP method of the request.
+                * path (str): The path of the request.
+                * status_code (int): The status code of the response.
+                * duration_ms (float): The time spent in the view.
+                * functions (list[dict]): The functions that took the most
+                    cumulative time, with their number of calls, own time
+                    (`total_ms`) and cumulative time (`cumulative_ms`).
+                * query_count (int): The number of SQL statements run.
+                * query_ms (float): The time spent running SQL statements.
+                * queries (list[dict]): The SQL statements run, without their
+                    parameters, with their durations (`duration_ms`).
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, course_id: str, profile_id: str):  # pylint: disable=unused-argument
+        """GET request handler for the profiles view."""
+        profile = RequestProfile.get(profile_id)
+        if profile is None or profile.course_id != course_id:
+            return api_field_errors(
+                {"profile_id": f"The supplied {profile_id=} does not exists."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(profile.to_dict(), status=status.HTTP_200_OK)
+
+
+class MetricsAPIView(GenericAPIView):
+    """
+    API view for the metrics endpoint.
+
+    `Use Cases`:
+
+        * GET: Get the metrics of the plugin kept by the process that serves the
+            request, in the Prometheus text format. Only available with the
+            in-process metrics backend.
+
+    `Example Requests`:
+
+        * GET: /platform-plugin-teams/{course-id}/api/metrics/
+
+            * Path Parameters:
+                * course_id (str): Any course id. The metrics are of every course.
+
+    `Example Responses`:
+
+        * GET: /platform-plugin-teams/{course-id}/api/metrics/
+
+            * 403:
+                * The user is not global staff.
+
+            * 404:
+                * The metrics backend does not keep the metrics in the process.
+
+            * 200: The metrics, in the Prometheus text format.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request, course_id: str):  # pylint: disable=unused-argument
+        """GET request handler for the metrics view."""
+        backend = get_metrics_backend()
+        if not hasattr(backend, "render"):
+            return api_error(
+                "The metrics are not kept by the plugin.",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        return HttpResponse(backend.render(), content_type=PROMETHEUS_CONTENT_TYPE)
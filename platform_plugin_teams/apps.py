@@ -44,3 +44,36 @@ class PlatformPluginTeamsConfig(AppConfig):
             },
         },
     }
+
+    def ready(self):
+        """
+        Connect the signal handlers of the plugin.
+
+        The signal receivers need the classes of the teams models, so the
+        teams common backend is resolved here. Django imports the models of
+        every installed app before calling `ready`, so this only imports the
+        backend module. The other backends are still resolved on first use.
+        """
+        from django.db.models.signals import post_delete, post_save  # pylint: disable=import-outside-toplevel
+        from django.test.signals import setting_changed  # pylint: disable=import-outside-toplevel
+
+        from platform_plugin_teams import signals  # pylint: disable=import-outside-toplevel
+        from platform_plugin_teams.edxapp_wrapper import teams_common  # pylint: disable=import-outside-toplevel
+
+        # The backends are resolved on first use, and again if their setting changes
+        setting_changed.connect(
+            signals.reset_edxapp_backend,
+            dispatch_uid="platform_plugin_teams.reset_edxapp_backend",
+        )
+
+        for signal_name, signal in (("post_save", post_save), ("post_delete", post_delete)):
+            signal.connect(
+                signals.invalidate_course_team_cache,
+                sender=teams_common.CourseTeam,
+                dispatch_uid=f"platform_plugin_teams.course_team.{signal_name}",
+            )
+            signal.connect(
+                signals.invalidate_course_team_membership_cache,
+                sender=teams_common.CourseTeamMembership,
+                dispatch_uid=f"platform_plugin_teams.course_team_membership.{signal_name}",
+            )
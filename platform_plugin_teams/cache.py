@@ -0,0 +1,348 @@
+"""
+Caching utilities for the Teams plugin.
+
+The topics of a course change far less often than they are read, so the LMS
+topics API keeps a per-course snapshot of the sorted topics and of the
+serialized teams of each topic in a bounded, in-process LRU cache. The teams of
+a topic are added to the snapshot by the first request that returns them, and
+the teams each user can see are filtered out of the shared snapshot for every
+request.
+
+Each snapshot is tagged with the course version stored in the Django cache, and
+with the version of the course data it was built from (e.g. its teams
+configuration). Any write that affects the topics or teams of a course bumps
+the course version, which invalidates the snapshots of every process sharing
+the Django cache, and a snapshot built from another version of the course data
+than the one loaded by the request is rebuilt, whoever changed the course.
+
+Calls to the platform that are repeated with the same arguments within a
+request (e.g. access checks) are memoized in the request cache.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from edx_django_utils.cache import RequestCache
+
+from platform_plugin_teams import metrics
+
+log = logging.getLogger(__name__)
+
+COURSE_VERSION_CACHE_KEY = "platform_plugin_teams.course_version.{course_key}"
+COURSE_LOCK_CACHE_KEY = "platform_plugin_teams.course_lock.{name}.{course_key}"
+REQUEST_CACHE_NAMESPACE = "platform_plugin_teams.edxapp_wrapper"
+REQUEST_CACHE_STATS_NAMESPACE = "platform_plugin_teams.edxapp_wrapper.stats"
+
+_deferred_invalidation = threading.local()
+
+
+def get_course_version(course_key) -> str:
+    """
+    Get the current version of the topics and teams of a course.
+
+    If the version is not in the Django cache a new one is generated, so an
+    evicted version invalidates the snapshots built with the old one.
+
+    Args:
+        course_key (CourseKey): The course to get the version for.
+
+    Returns:
+        str: The version of the course.
+    """
+    cache_key = COURSE_VERSION_CACHE_KEY.format(course_key=course_key)
+    version = cache.get(cache_key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(cache_key, version, timeout=None):
+            version = cache.get(cache_key, version)
+
+    return version
+
+
+def invalidate_course(course_key) -> None:
+    """
+    Invalidate the cached topics and teams of a course in every process.
+
+    Inside a transaction, the course is invalidated again when it is
+    committed, so the snapshots built by other requests from the data read
+    before the commit are not used.
+
+    Args:
+        course_key (CourseKey): The course to invalidate.
+    """
+    cache_key = COURSE_VERSION_CACHE_KEY.format(course_key=course_key)
+    cache.set(cache_key, uuid4().hex, timeout=None)
+    topics_snapshot_cache.discard(course_key)
+
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: invalidate_course(course_key))
+
+
+@contextmanager
+def course_lock(course_key, name: str, timeout: int = 60, wait: float = 10):
+    """
+    Hold a named lock on a course, shared by every process using the Django cache.
+
+    The lock is taken with an atomic `cache.add`. It expires after `timeout`
+    seconds, so a process that dies while holding it does not block the
+    course forever.
+
+    Args:
+        course_key (CourseKey): The course to lock.
+        name (str): The name of the lock.
+        timeout (int, optional): Seconds after which the lock is released anyway.
+        wait (float, optional): Seconds to wait for the lock if it is held.
+
+    Yields:
+        bool: Whether the lock was acquired.
+    """
+    cache_key = COURSE_LOCK_CACHE_KEY.format(name=name, course_key=course_key)
+    token = uuid4().hex
+    deadline = time.monotonic() + wait
+    acquired = cache.add(cache_key, token, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.05)
+        acquired = cache.add(cache_key, token, timeout)
+
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(cache_key) == token:
+            cache.delete(cache_key)
+
+
+@contextmanager
+def deferred_course_invalidation(course_key):
+    """
+    Invalidate a course once when the block exits, instead of on every change inside it.
+
+    The signal handlers do not invalidate anything while the block runs, so bulk
+    operations on a course do not pay for an invalidation per changed row.
+
+    Args:
+        course_key (CourseKey): The course changed inside the block.
+    """
+    depth = getattr(_deferred_invalidation, "depth", 0)
+    _deferred_invalidation.depth = depth + 1
+    try:
+        yield
+    finally:
+        _deferred_invalidation.depth = depth
+        invalidate_course(course_key)
+
+
+def is_invalidation_deferred() -> bool:
+    """Whether the current thread runs inside `deferred_course_invalidation`."""
+    return getattr(_deferred_invalidation, "depth", 0) > 0
+
+
+class CourseSnapshotCache:
+    """
+    Bounded LRU cache of per-course snapshots.
+
+    Entries are keyed by course and an optional variant, and are considered
+    stale when the course version changes, when they were built from another
+    version of the course data, or when they are older than the configured
+    timeout. The hits and misses are counted in the `cache.snapshot` metric,
+    tagged with the name of the cache.
+    """
+
+    def __init__(self, name: str, max_size_setting: str, timeout_setting: str):
+        self.name = name
+        self.max_size_setting = max_size_setting
+        self.timeout_setting = timeout_setting
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of snapshots kept in memory."""
+        return getattr(settings, self.max_size_setting, 128)
+
+    @property
+    def timeout(self) -> int:
+        """Number of seconds a snapshot is considered fresh."""
+        return getattr(settings, self.timeout_setting, 300)
+
+    def get_or_build(self, course_key, builder, variant: str = "", source_version: str = ""):
+        """
+        Get the snapshot of a course, building it if it is missing or stale.
+
+        Args:
+            course_key (CourseKey): The course to get the snapshot for.
+            builder (callable): Called with no arguments to build the snapshot.
+                It can return None, in which case nothing is cached.
+            variant (str, optional): Distinguishes snapshots of the same course.
+            source_version (str, optional): The version of the course data the
+                snapshot is built from. A snapshot built from another version
+                is stale.
+
+        Returns:
+            The snapshot returned by the builder.
+        """
+        snapshots = self.get_many_or_build(
+            [course_key],
+            lambda course_keys: {course_key: builder()},
+            variant=variant,
+            source_versions={course_key: source_version},
+        )
+        return snapshots.get(course_key)
+
+    def get_many_or_build(
+        self, course_keys: list, builder, variant: str = "", source_versions: dict = None
+    ) -> dict:
+        """
+        Get the snapshots of several courses, building the missing or stale ones together.
+
+        Args:
+            course_keys (list[CourseKey]): The courses to get the snapshots for.
+            builder (callable): Called with the list of courses without a fresh
+                snapshot, returns a mapping of course to snapshot. The courses
+                missing from the mapping, or mapped to None, are not cached.
+            variant (str, optional): Distinguishes snapshots of the same courses.
+            source_versions (dict, optional): A mapping of course to the version
+                of the course data its snapshot is built from. A snapshot built
+                from another version is stale.
+
+        Returns:
+            dict: A mapping of course to snapshot, without the courses the
+                builder did not return a snapshot for.
+        """
+        if not self.max_size:
+            return {
+                course_key: snapshot
+                for course_key, snapshot in builder(list(course_keys)).items()
+                if snapshot is not None
+            }
+
+        source_versions = source_versions or {}
+        versions = {
+            course_key: (get_course_version(course_key), source_versions.get(course_key, ""))
+            for course_key in course_keys
+        }
+        snapshots = {}
+        missing_course_keys = []
+
+        with self._lock:
+            for course_key in course_keys:
+                key = (str(course_key), variant)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry_version, created, snapshot = entry
+                    if entry_version == versions[course_key] and time.monotonic() - created < self.timeout:
+                        self._entries.move_to_end(key)
+                        snapshots[course_key] = snapshot
+                        continue
+                    del self._entries[key]
+                missing_course_keys.append(course_key)
+
+        metrics.increment("cache.snapshot", len(snapshots), tags={"cache": self.name, "result": "hit"})
+        metrics.increment("cache.snapshot", len(missing_course_keys), tags={"cache": self.name, "result": "miss"})
+        if not missing_course_keys:
+            return snapshots
+
+        built_snapshots = {
+            course_key: snapshot
+            for course_key, snapshot in builder(missing_course_keys).items()
+            if snapshot is not None
+        }
+        snapshots.update(built_snapshots)
+
+        with self._lock:
+            for course_key, snapshot in built_snapshots.items():
+                key = (str(course_key), variant)
+                self._entries[key] = (versions[course_key], time.monotonic(), snapshot)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return snapshots
+
+    def discard(self, course_key) -> None:
+        """
+        Drop every snapshot of a course from this process.
+
+        Args:
+            course_key (CourseKey): The course to drop.
+        """
+        course_key = str(course_key)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == course_key]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every snapshot from this process."""
+        with self._lock:
+            self._entries.clear()
+
+
+topics_snapshot_cache = CourseSnapshotCache(
+    "topics",
+    "PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_SIZE",
+    "PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_TIMEOUT",
+)
+
+
+def request_cached(func):
+    """
+    Memoize the calls to a function for the duration of the current request.
+
+    Calls with unhashable arguments are not memoized. The hits and misses of
+    each function are counted and can be retrieved with `get_request_cache_stats`.
+    The memoized calls of the function are forgotten with its `cache_clear`
+    attribute, e.g. after a write that changes what it returns.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        request_cache = RequestCache(REQUEST_CACHE_NAMESPACE)
+        stats = RequestCache(REQUEST_CACHE_STATS_NAMESPACE).data.setdefault(
+            func.__qualname__, {"hits": 0, "misses": 0}
+        )
+
+        cached_response = request_cache.get_cached_response(key)
+        if cached_response.is_found:
+            stats["hits"] += 1
+            log.debug("Request cache hit for %s: %s", func.__qualname__, stats)
+            return cached_response.value
+
+        stats["misses"] += 1
+        log.debug("Request cache miss for %s: %s", func.__qualname__, stats)
+        value = func(*args, **kwargs)
+        request_cache.set(key, value)
+        return value
+
+    def cache_clear():
+        """Forget the memoized calls of the function in the current request."""
+        request_cache = RequestCache(REQUEST_CACHE_NAMESPACE)
+        for key in [key for key in request_cache.data if key[:2] == (func.__module__, func.__qualname__)]:
+            request_cache.delete(key)
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def get_request_cache_stats() -> dict:
+    """
+    Get the hits and misses of the request cached functions in the current request.
+
+    Returns:
+        dict: A mapping of function name to its `hits` and `misses` counts.
+    """
+    return {
+        name: dict(stats)
+        for name, stats in RequestCache(REQUEST_CACHE_STATS_NAMESPACE).data.items()
+    }
@@ -1,21 +1,25 @@
 """
 Authentication generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.edxapp_wrapper.registry import backends
 
 
 def get_bearer_authentication_allow_inactive_user_class():
     """
     Wrapper for `lms.djangoapps.courseware.courses.has_access`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_AUTHENTICATION_BACKEND
-    backend = import_module(backend_function)
+    return backends.authentication.BearerAuthenticationAllowInactiveUser
+
+
+BearerAuthenticationAllowInactiveUser: type
 
-    return backend.BearerAuthenticationAllowInactiveUser
 
+def __getattr__(name):
+    """
+    Resolve `BearerAuthenticationAllowInactiveUser` on first access, so
+    importing this module does not import the platform authentication classes.
+    """
+    if name == "BearerAuthenticationAllowInactiveUser":
+        return get_bearer_authentication_allow_inactive_user_class()
 
-BearerAuthenticationAllowInactiveUser = (
-    get_bearer_authentication_allow_inactive_user_class()
-)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,58 @@
 """
 Authentication test definitions for Open edX Palm release.
 """
-BearerAuthenticationAllowInactiveUser = object
+from django.contrib.auth import get_user_model
+from django.core import signing
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+BEARER_TOKEN_SALT = "platform_plugin_teams.bearer_token"
+
+User = get_user_model()
+
+
+def create_bearer_token(user) -> str:
+    """
+    Create a bearer token for a user, accepted by `BearerAuthenticationAllowInactiveUser`.
+
+    The tokens are signed with the `SECRET_KEY` of the settings and do not expire.
+
+    Args:
+        user (User): The user to authenticate with the token.
+
+    Returns:
+        str: The token.
+    """
+    return signing.dumps({"user_id": user.id}, salt=BEARER_TOKEN_SALT)
+
+
+class BearerAuthenticationAllowInactiveUser(BaseAuthentication):
+    """
+    Stand-in of `openedx.core.lib.api.authentication.BearerAuthenticationAllowInactiveUser`.
+
+    There is no OAuth2 provider to issue the access tokens, so it accepts the
+    tokens created with `create_bearer_token` instead. As the platform class,
+    it authenticates inactive users too, and looks up the user of the token
+    with one query.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+
+        try:
+            token = auth[1].decode()
+            user = User.objects.get(pk=signing.loads(token, salt=BEARER_TOKEN_SALT)["user_id"])
+        except (UnicodeError, signing.BadSignature, KeyError, TypeError, User.DoesNotExist) as error:
+            raise exceptions.AuthenticationFailed("Invalid token.") from error
+
+        return user, token
+
+    def authenticate_header(self, request):
+        return f'{self.keyword} realm="api"'
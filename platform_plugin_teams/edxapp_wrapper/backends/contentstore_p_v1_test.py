@@ -1,4 +1,43 @@
 """
 Contentstore test definitions for Open edX Palm release.
 """
-update_course_advanced_settings = object
+from django.core.exceptions import ValidationError
+
+from platform_plugin_teams.edxapp_wrapper.backends.modulestore_p_v1_test import modulestore
+from platform_plugin_teams.edxapp_wrapper.backends.teams_config_p_v1_test import TeamsConfig
+
+
+def update_course_advanced_settings(course_block, data: dict, user) -> dict:
+    """
+    Stand-in of `cms.djangoapps.contentstore.views.course.update_course_advanced_settings`.
+
+    Only the `teams_configuration` setting is supported.
+
+    Args:
+        course_block (CourseBlock): The course to update.
+        data (dict): The settings to update, as `{key: {"value": value}}`.
+        user (User): The user that updates the course.
+
+    Raises:
+        ValidationError: If any setting is not supported.
+
+    Returns:
+        dict: The advanced settings of the course after the update.
+    """
+    unsupported_keys = set(data) - {"teams_configuration"}
+    if unsupported_keys:
+        raise ValidationError(f"Unsupported advanced settings: {sorted(unsupported_keys)}")
+
+    if "teams_configuration" in data:
+        course_block.teams_configuration = TeamsConfig(data["teams_configuration"]["value"])
+        modulestore().update_item(course_block, user.id)
+
+    return {
+        "teams_configuration": {
+            "value": course_block.teams_configuration.cleaned_data,
+            "display_name": "Teams Configuration",
+            "help": "Configure the teams and teamsets of the course.",
+            "deprecated": False,
+            "hide_on_enabled_publisher": False,
+        },
+    }
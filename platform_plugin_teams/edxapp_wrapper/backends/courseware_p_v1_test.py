@@ -1,4 +1,49 @@
 """
 Courseware test definitions for Open edX Palm release.
 """
-has_access = object
+from test_utils.models import CourseAccessRole
+
+STAFF_ROLES = ("staff", "instructor")
+
+
+def get_course_roles(user) -> set:
+    """
+    Get the `(course_id, role)` pairs of a user.
+
+    As the platform `RoleCache`, the roles are loaded with one query and kept
+    in the user object, so they are loaded once per request.
+    """
+    if not hasattr(user, "_roles"):
+        user._roles = set(  # pylint: disable=protected-access
+            CourseAccessRole.objects.filter(user_id=user.id).values_list("course_id", "role")
+        )
+
+    return user._roles  # pylint: disable=protected-access
+
+
+def has_course_role(user, course_key, roles) -> bool:
+    """
+    Check whether a user has any of the given roles in a course.
+    """
+    course_roles = get_course_roles(user)
+    return any((str(course_key), role) in course_roles for role in roles)
+
+
+def has_access(user, action: str, obj, course_key=None) -> bool:  # pylint: disable=unused-argument
+    """
+    Stand-in of `lms.djangoapps.courseware.access.has_access`.
+
+    The global staff and the users with the `staff` or `instructor` role in the
+    course have the `staff` access, and only the global staff and the users with
+    the `instructor` role have the `instructor` access. Every active user has
+    any other access.
+    """
+    if not user.is_active:
+        return False
+
+    if action in ("staff", "instructor"):
+        return user.is_staff or has_course_role(
+            user, obj, STAFF_ROLES if action == "staff" else ("instructor",)
+        )
+
+    return True
@@ -1,4 +1,177 @@
 """
 Modulestore test definitions for Open edX Palm release.
+
+An in-memory stand-in of the modulestore, holding the teams configuration of
+each course. As with the platform modulestore, every `get_course` call builds a
+new course block from the stored data, so the blocks of a request are not
+changed by the writes of other requests.
+
+For load tests with several processes, the courses can be kept in a JSON file
+shared by all of them, set in `PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_PATH`,
+and the round trip to the platform modulestore can be simulated with a delay
+set in `PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_LATENCY` (in seconds).
 """
-modulestore = object
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from platform_plugin_teams.edxapp_wrapper.backends.teams_config_p_v1_test import TeamsConfig
+
+
+class CourseBlock:
+    """
+    Stand-in of a course block, with the fields of the course the plugin reads.
+    """
+
+    def __init__(self, course_key, display_name: str = "", teams_configuration: dict = None):
+        self.id = course_key  # pylint: disable=invalid-name
+        self.display_name = display_name
+        self.teams_configuration = TeamsConfig(teams_configuration or {})
+
+    @property
+    def teamsets(self) -> list:
+        """The teamsets of the course."""
+        return self.teams_configuration.teamsets
+
+    @property
+    def teams_topics(self) -> list:
+        """The cleaned teamsets of the course."""
+        return self.teams_configuration.cleaned_data["team_sets"]
+
+
+class InMemoryModuleStore:
+    """
+    Stand-in of the modulestore, with the courses stored in memory or in a JSON file.
+    """
+
+    def __init__(self):
+        self._courses = {}
+        self._file_courses = {}
+        self._file_version = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _simulate_latency() -> None:
+        """Wait for the configured round trip time of the modulestore."""
+        latency = getattr(settings, "PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_LATENCY", 0)
+        if latency:
+            time.sleep(latency)
+
+    def _get_courses(self) -> dict:
+        """
+        Get the stored courses, reading the JSON file again only if it changed.
+        """
+        path = getattr(settings, "PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_PATH", None)
+        if not path:
+            return self._courses
+
+        try:
+            file_version = (path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return {}
+
+        if file_version != self._file_version:
+            with open(path, encoding="utf-8") as courses_file:
+                self._file_courses = json.load(courses_file)
+            self._file_version = file_version
+
+        return self._file_courses
+
+    def _set_courses(self, courses: dict) -> None:
+        """
+        Store the courses, replacing the JSON file at once so other processes
+        never read a partial file.
+        """
+        path = getattr(settings, "PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_PATH", None)
+        if not path:
+            self._courses = courses
+            return
+
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as courses_file:
+            json.dump(courses, courses_file)
+        os.replace(temporary_path, path)
+
+    def create_course(self, course_key, display_name: str = "", teams_configuration: dict = None) -> CourseBlock:
+        """
+        Create or replace a course.
+
+        Args:
+            course_key (CourseKey): The key of the course.
+            display_name (str, optional): The name of the course.
+            teams_configuration (dict, optional): The raw teams configuration.
+
+        Returns:
+            CourseBlock: The course block.
+        """
+        course_block = CourseBlock(course_key, display_name, teams_configuration)
+        self.update_item(course_block)
+        return self.get_course(course_key)
+
+    def get_course(self, course_key, depth: int = 0, **kwargs):  # pylint: disable=unused-argument
+        """
+        Get a course.
+
+        Args:
+            course_key (CourseKey): The key of the course.
+
+        Returns:
+            CourseBlock: A new block of the course, or None if it does not exist.
+        """
+        self._simulate_latency()
+        with self._lock:
+            course_data = self._get_courses().get(str(course_key))
+
+        if course_data is None:
+            return None
+
+        return CourseBlock(course_key, course_data["display_name"], course_data["teams_configuration"])
+
+    def update_item(self, course_block: CourseBlock, user_id: int = None, **kwargs):  # pylint: disable=unused-argument
+        """
+        Store the fields of a course block.
+
+        Args:
+            course_block (CourseBlock): The block to store.
+            user_id (int, optional): The id of the user that changed the block.
+
+        Returns:
+            CourseBlock: The stored block.
+        """
+        self._simulate_latency()
+        with self._lock:
+            courses = dict(self._get_courses())
+            courses[str(course_block.id)] = {
+                "display_name": course_block.display_name,
+                "teams_configuration": course_block.teams_configuration.cleaned_data,
+            }
+            self._set_courses(courses)
+
+        return course_block
+
+    def delete_course(self, course_key, user_id: int = None):  # pylint: disable=unused-argument
+        """
+        Delete a course.
+
+        Args:
+            course_key (CourseKey): The key of the course.
+            user_id (int, optional): The id of the user that deleted the course.
+        """
+        self._simulate_latency()
+        with self._lock:
+            courses = dict(self._get_courses())
+            courses.pop(str(course_key), None)
+            self._set_courses(courses)
+
+
+_modulestore = InMemoryModuleStore()
+
+
+def modulestore() -> InMemoryModuleStore:
+    """
+    Stand-in of `xmodule.modulestore.django.modulestore`.
+    """
+    return _modulestore
@@ -2,6 +2,8 @@
 Student definitions for Open edX Palm release.
 """
 from common.djangoapps.student.auth import has_studio_write_access  # pylint: disable=import-error, unused-import
+from common.djangoapps.student.models import CourseEnrollment  # pylint: disable=import-error, unused-import
 from common.djangoapps.student.models.user import (  # pylint: disable=import-error, unused-import
     get_user_by_username_or_email,
 )
+from openedx.core.djangoapps.user_api.models import UserRetirementRequest  # pylint: disable=import-error, unused-import
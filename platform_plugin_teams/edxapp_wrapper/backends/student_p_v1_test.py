@@ -1,5 +1,37 @@
 """
 Student test definitions for Open edX Palm release.
 """
-has_studio_write_access = object
-get_user_by_username_or_email = object
+from django.contrib.auth import get_user_model
+
+from platform_plugin_teams.edxapp_wrapper.backends.courseware_p_v1_test import STAFF_ROLES, has_course_role
+from test_utils.models import CourseEnrollment, UserRetirementRequest  # pylint: disable=unused-import
+
+User = get_user_model()
+
+
+def has_studio_write_access(user, course_key) -> bool:
+    """
+    Stand-in of `common.djangoapps.student.auth.has_studio_write_access`.
+
+    The global staff and the course staff and instructors can change a course.
+    """
+    return user.is_active and (user.is_staff or has_course_role(user, course_key, STAFF_ROLES))
+
+
+def get_user_by_username_or_email(username_or_email: str):
+    """
+    Stand-in of `common.djangoapps.student.models.user.get_user_by_username_or_email`.
+
+    Raises:
+        User.DoesNotExist: If no user has the username or email, or the user
+            requested the retirement of their account.
+    """
+    username_or_email = username_or_email.strip()
+    try:
+        user = User.objects.get(username=username_or_email)
+    except User.DoesNotExist:
+        user = User.objects.get(email=username_or_email)
+
+    if UserRetirementRequest.has_user_requested_retirement(user):
+        raise User.DoesNotExist
+    return user
@@ -1,4 +1,4 @@
 """
 Teams common definitions for Open edX Palm release.
 """
-from lms.djangoapps.teams.models import CourseTeam  # pylint: disable=import-error, unused-import
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership  # pylint: disable=import-error, unused-import
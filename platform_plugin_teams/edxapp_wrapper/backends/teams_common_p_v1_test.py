@@ -1,4 +1,4 @@
 """
 Teams common test definitions for Open edX Palm release.
 """
-CourseTeam = object
+from test_utils.models import CourseTeam, CourseTeamMembership  # pylint: disable=unused-import
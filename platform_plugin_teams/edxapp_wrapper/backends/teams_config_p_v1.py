@@ -1,4 +1,4 @@
 """
 Teams Config definitions for Open edX Palm release.
 """
-from openedx.core.lib.teams_config import TeamsetType  # pylint: disable=import-error, unused-import
+from openedx.core.lib.teams_config import TeamsConfig, TeamsetType  # pylint: disable=import-error, unused-import
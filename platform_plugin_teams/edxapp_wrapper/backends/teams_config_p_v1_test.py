@@ -1,4 +1,153 @@
 """
 Teams Config test definitions for Open edX Palm release.
+
+In-memory stand-ins of `openedx.core.lib.teams_config`, with the subset of its
+behavior the plugin relies on.
 """
-TeamsetType = object
+from enum import Enum
+from functools import cached_property
+
+DEFAULT_COURSE_RUN_MAX_TEAM_SIZE = 50
+MANAGED_TEAM_MAX_TEAM_SIZE = 10000
+
+
+class TeamsetType(Enum):
+    """
+    Stand-in of `openedx.core.lib.teams_config.TeamsetType`.
+    """
+
+    open = "open"
+    open_managed = "open_managed"
+    public_managed = "public_managed"
+    private_managed = "private_managed"
+
+    @classmethod
+    def get_default(cls):
+        """Get the type of the teamsets that do not set one."""
+        return cls.open
+
+
+class TeamsetConfig:
+    """
+    Stand-in of `openedx.core.lib.teams_config.TeamsetConfig`.
+    """
+
+    def __init__(self, data: dict):
+        self._data = data if isinstance(data, dict) else {}
+
+    @cached_property
+    def cleaned_data(self) -> dict:
+        """The normalized teamset, as stored in the course."""
+        return {
+            "id": self.teamset_id,
+            "name": self.name,
+            "description": self.description,
+            "max_team_size": self.max_team_size,
+            "type": self.teamset_type.value,
+        }
+
+    @cached_property
+    def teamset_id(self) -> str:
+        """The id of the teamset."""
+        return str(self._data.get("id", "")).strip()
+
+    @cached_property
+    def name(self) -> str:
+        """The name of the teamset, or its id if it has none."""
+        return str(self._data.get("name") or self.teamset_id)
+
+    @cached_property
+    def description(self) -> str:
+        """The description of the teamset."""
+        return str(self._data.get("description", ""))
+
+    @cached_property
+    def max_team_size(self):
+        """The maximum size of the teams of the teamset, or None to use the course one."""
+        max_team_size = self._data.get("max_team_size")
+        return max_team_size if isinstance(max_team_size, int) and max_team_size > 0 else None
+
+    @cached_property
+    def teamset_type(self) -> TeamsetType:
+        """The type of the teamset."""
+        try:
+            return TeamsetType(self._data["type"])
+        except (KeyError, ValueError):
+            return TeamsetType.get_default()
+
+    @property
+    def is_private_managed(self) -> bool:
+        """Whether only the members of its teams and the staff can see the teamset."""
+        return self.teamset_type == TeamsetType.private_managed
+
+
+class TeamsConfig:
+    """
+    Stand-in of `openedx.core.lib.teams_config.TeamsConfig`.
+    """
+
+    def __init__(self, data: dict):
+        self._data = data if isinstance(data, dict) else {}
+
+    @cached_property
+    def cleaned_data(self) -> dict:
+        """The normalized teams configuration, as stored in the course."""
+        return {
+            "enabled": self.is_enabled,
+            "max_team_size": self.default_max_team_size,
+            "team_sets": [teamset.cleaned_data for teamset in self.teamsets],
+        }
+
+    @cached_property
+    def is_enabled(self) -> bool:
+        """Whether teams are enabled for the course."""
+        if "enabled" in self._data:
+            return bool(self._data["enabled"])
+
+        return bool(self.teamsets)
+
+    @cached_property
+    def teamsets(self) -> list:
+        """The teamsets of the course, skipping the ones without id or with a repeated id."""
+        teamsets = []
+        teamset_ids = set()
+        for teamset_data in self._data.get("team_sets") or self._data.get("topics") or []:
+            teamset = TeamsetConfig(teamset_data)
+            if teamset.teamset_id and teamset.teamset_id not in teamset_ids:
+                teamset_ids.add(teamset.teamset_id)
+                teamsets.append(teamset)
+
+        return teamsets
+
+    @cached_property
+    def teamsets_by_id(self) -> dict:
+        """The teamsets of the course by id."""
+        return {teamset.teamset_id: teamset for teamset in self.teamsets}
+
+    @cached_property
+    def default_max_team_size(self) -> int:
+        """The maximum team size of the teamsets that do not set one."""
+        max_team_size = self._data.get("max_team_size")
+        if isinstance(max_team_size, int) and max_team_size > 0:
+            return max_team_size
+
+        return DEFAULT_COURSE_RUN_MAX_TEAM_SIZE
+
+    def calc_max_team_size(self, teamset_id: str):
+        """
+        Get the maximum size of the teams of a teamset.
+
+        Args:
+            teamset_id (str): The id of the teamset.
+
+        Returns:
+            int: The maximum team size, or None if the teamset does not exist.
+        """
+        teamset = self.teamsets_by_id.get(teamset_id)
+        if teamset is None:
+            return None
+
+        if teamset.teamset_type != TeamsetType.open:
+            return MANAGED_TEAM_MAX_TEAM_SIZE
+
+        return teamset.max_team_size or self.default_max_team_size
@@ -12,9 +12,9 @@ from lms.djangoapps.teams.errors import (  # pylint: disable=import-error, unuse
     AlreadyOnTeamInTeamset,
     NotEnrolledInCourseForTeam,
 )
-from lms.djangoapps.teams.models import CourseTeamMembership  # pylint: disable=import-error, unused-import
 from lms.djangoapps.teams.serializers import (  # pylint: disable=import-error, unused-import
     BulkTeamCountTopicSerializer,
+    CourseTeamCreationSerializer,
     CourseTeamSerializer,
     MembershipSerializer,
 )
@@ -1,17 +1,409 @@
 """
 Teams LMS test definitions for Open edX Palm release.
+
+Stand-ins of the LMS teams API, errors, serializers and views, with the same
+access rules and response fields the plugin relies on. The course staff are the
+global staff and the users with the `staff` or `instructor` role in the course,
+and the users enrolled in an organization protected mode (e.g. `masters`) only
+see the organization protected teams.
 """
-can_user_modify_team = object
-get_team_by_team_id = object
-has_specific_team_access = object
-has_team_api_access = object
-user_organization_protection_status = object
-AlreadyOnTeamInTeamset = object
-NotEnrolledInCourseForTeam = object
-CourseTeamMembership = object
-BulkTeamCountTopicSerializer = object
-CourseTeamSerializer = object
-MembershipSerializer = object
-TopicsPagination = object
-_filter_hidden_private_teamsets = object
-get_alphabetical_topics = object
+from enum import Enum
+
+from django.db.models import Count
+from edx_rest_framework_extensions.paginators import DefaultPagination
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+from platform_plugin_teams.edxapp_wrapper.backends.courseware_p_v1_test import has_access
+from platform_plugin_teams.edxapp_wrapper.backends.modulestore_p_v1_test import modulestore
+from platform_plugin_teams.edxapp_wrapper.backends.teams_config_p_v1_test import TeamsetType
+from test_utils.models import CourseEnrollment, CourseTeam, CourseTeamMembership
+
+ORGANIZATION_PROTECTED_MODES = ("masters",)
+TOPICS_PER_PAGE = 12
+USER_URL = "/api/user/v1/accounts/{username}"
+TEAM_URL = "/api/team/v0/teams/{team_id}"
+COUNTRIES = ("CO", "DE", "ES", "FR", "MX", "US")
+LANGUAGES = ("de", "en", "es", "fr")
+
+
+class TeamAPIRequestError(Exception):
+    """
+    Stand-in of `lms.djangoapps.teams.errors.TeamAPIRequestError`.
+    """
+
+
+class AlreadyOnTeamInTeamset(TeamAPIRequestError):
+    """
+    Stand-in of `lms.djangoapps.teams.errors.AlreadyOnTeamInTeamset`.
+    """
+
+
+class NotEnrolledInCourseForTeam(TeamAPIRequestError):
+    """
+    Stand-in of `lms.djangoapps.teams.errors.NotEnrolledInCourseForTeam`.
+    """
+
+
+class OrganizationProtectionStatus(Enum):
+    """
+    Stand-in of `lms.djangoapps.teams.api.OrganizationProtectionStatus`.
+    """
+
+    protected = "org_protected"
+    protection_exempt = "org_protection_exempt"
+    unprotected = "org_unprotected"
+
+    @property
+    def is_protected(self) -> bool:
+        """Whether the user only sees the organization protected teams."""
+        return self == self.protected
+
+    @property
+    def is_exempt(self) -> bool:
+        """Whether the user sees every team."""
+        return self == self.protection_exempt
+
+
+def has_course_staff_privileges(user, course_key) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.has_course_staff_privileges`.
+    """
+    return has_access(user, "staff", course_key)
+
+
+def has_team_api_access(user, course_key, access_username: str = None) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.has_team_api_access`.
+
+    The course staff have access for any user, the enrolled learners only for
+    themselves.
+    """
+    if has_course_staff_privileges(user, course_key):
+        return True
+
+    if access_username and access_username != user.username:
+        return False
+
+    return CourseEnrollment.is_enrolled(user, course_key)
+
+
+def user_organization_protection_status(user, course_key) -> OrganizationProtectionStatus:
+    """
+    Stand-in of `lms.djangoapps.teams.api.user_organization_protection_status`.
+
+    Raises:
+        ValueError: If the user is neither course staff nor enrolled in the course.
+    """
+    if has_course_staff_privileges(user, course_key):
+        return OrganizationProtectionStatus.protection_exempt
+
+    enrollment = CourseEnrollment.get_enrollment(user, course_key)
+    if enrollment is None or not enrollment.is_active:
+        raise ValueError(f"Cannot check the protection status of {user!r}, who is not enrolled in {course_key}.")
+
+    if enrollment.mode in ORGANIZATION_PROTECTED_MODES:
+        return OrganizationProtectionStatus.protected
+
+    return OrganizationProtectionStatus.unprotected
+
+
+def user_protection_status_matches_team(user, team) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.user_protection_status_matches_team`.
+    """
+    try:
+        protection_status = user_organization_protection_status(user, team.course_id)
+    except ValueError:
+        return False
+
+    return protection_status.is_exempt or protection_status.is_protected == team.organization_protected
+
+
+def get_teamset(course_key, teamset_id: str):
+    """
+    Get a teamset of a course from the modulestore.
+
+    Returns:
+        TeamsetConfig: The teamset, or None if it does not exist.
+    """
+    course_block = modulestore().get_course(course_key)
+    if course_block is None:
+        return None
+
+    return course_block.teams_configuration.teamsets_by_id.get(teamset_id)
+
+
+def has_specific_teamset_access(user, course_block, teamset_id: str) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.has_specific_teamset_access`.
+
+    Only the course staff and the members of its teams can see a private teamset.
+    """
+    teamset = course_block.teams_configuration.teamsets_by_id.get(teamset_id)
+    if teamset is None or not teamset.is_private_managed:
+        return teamset is not None
+
+    if has_course_staff_privileges(user, course_block.id):
+        return True
+
+    return CourseTeamMembership.objects.filter(
+        user_id=user.id, team__course_id=course_block.id, team__topic_id=teamset_id
+    ).exists()
+
+
+def has_specific_team_access(user, team) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.has_specific_team_access`.
+    """
+    if has_course_staff_privileges(user, team.course_id):
+        return True
+
+    course_block = modulestore().get_course(team.course_id)
+    return (
+        course_block is not None
+        and has_team_api_access(user, team.course_id)
+        and has_specific_teamset_access(user, course_block, team.topic_id)
+        and user_protection_status_matches_team(user, team)
+    )
+
+
+def is_instructor_managed_team(team) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.is_instructor_managed_team`.
+    """
+    teamset = get_teamset(team.course_id, team.topic_id)
+    return teamset is not None and teamset.teamset_type in (
+        TeamsetType.public_managed,
+        TeamsetType.private_managed,
+    )
+
+
+def can_user_modify_team(user, team) -> bool:
+    """
+    Stand-in of `lms.djangoapps.teams.api.can_user_modify_team`.
+
+    Only the course staff can change the teams of the instructor managed teamsets.
+    """
+    return not is_instructor_managed_team(team) or has_course_staff_privileges(user, team.course_id)
+
+
+def get_team_by_team_id(team_id: str):
+    """
+    Stand-in of `lms.djangoapps.teams.api.get_team_by_team_id`.
+    """
+    try:
+        return CourseTeam.objects.get(team_id=team_id)
+    except CourseTeam.DoesNotExist:
+        return None
+
+
+def get_user_reference(user, request) -> dict:
+    """
+    Build the collapsed representation of a user.
+    """
+    url = USER_URL.format(username=user.username)
+    return {
+        "username": user.username,
+        "url": request.build_absolute_uri(url) if request else url,
+    }
+
+
+def get_team_reference(team, request) -> dict:
+    """
+    Build the collapsed representation of a team.
+    """
+    url = TEAM_URL.format(team_id=team.team_id)
+    return {
+        "team_id": team.team_id,
+        "url": request.build_absolute_uri(url) if request else url,
+    }
+
+
+class UserMembershipSerializer(serializers.ModelSerializer):
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.UserMembershipSerializer`.
+    """
+
+    user = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CourseTeamMembership
+        fields = ("user", "date_joined", "last_activity_at")
+        read_only_fields = fields
+
+    def get_user(self, membership) -> dict:
+        """Get the collapsed user of the membership."""
+        return get_user_reference(membership.user, self.context.get("request"))
+
+
+class CourseTeamSerializer(serializers.ModelSerializer):
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.CourseTeamSerializer`.
+    """
+
+    id = serializers.CharField(source="team_id", read_only=True)  # pylint: disable=invalid-name
+    membership = UserMembershipSerializer(many=True, read_only=True)
+    course_id = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = CourseTeam
+        fields = (
+            "id",
+            "discussion_topic_id",
+            "name",
+            "course_id",
+            "topic_id",
+            "date_created",
+            "description",
+            "country",
+            "language",
+            "last_activity_at",
+            "membership",
+            "organization_protected",
+        )
+        read_only_fields = ("course_id", "date_created", "discussion_topic_id", "last_activity_at")
+
+
+class CourseTeamCreationSerializer(serializers.ModelSerializer):
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.CourseTeamCreationSerializer`.
+
+    The countries and languages are a few of the choices of the platform fields.
+    """
+
+    course_id = serializers.CharField()
+    country = serializers.ChoiceField(choices=COUNTRIES, allow_blank=True, required=False)
+    language = serializers.ChoiceField(choices=LANGUAGES, allow_blank=True, required=False)
+
+    class Meta:
+        model = CourseTeam
+        fields = (
+            "name",
+            "course_id",
+            "description",
+            "topic_id",
+            "country",
+            "language",
+            "organization_protected",
+        )
+
+
+class MembershipSerializer(serializers.ModelSerializer):
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.MembershipSerializer`.
+    """
+
+    user = serializers.SerializerMethodField()
+    team = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CourseTeamMembership
+        fields = ("user", "team", "date_joined", "last_activity_at")
+        read_only_fields = ("date_joined", "last_activity_at")
+
+    def get_user(self, membership) -> dict:
+        """Get the collapsed user of the membership."""
+        return get_user_reference(membership.user, self.context.get("request"))
+
+    def get_team(self, membership) -> dict:
+        """Get the collapsed team of the membership."""
+        return get_team_reference(membership.team, self.context.get("request"))
+
+
+class BaseTopicSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.BaseTopicSerializer`.
+    """
+
+    description = serializers.CharField()
+    name = serializers.CharField()
+    id = serializers.CharField()  # pylint: disable=invalid-name
+    type = serializers.CharField()
+    max_team_size = serializers.IntegerField()
+
+
+class BulkTeamCountTopicSerializer(BaseTopicSerializer):  # pylint: disable=abstract-method
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.BulkTeamCountTopicSerializer`.
+
+    The team count of every topic is added with a single query when the
+    serializer is built with the list of topics.
+    """
+
+    team_count = serializers.IntegerField(read_only=True)
+
+    def __init__(self, instance=None, data=empty, **kwargs):
+        super().__init__(instance, data, **kwargs)
+        if isinstance(instance, list):
+            add_team_count(
+                instance,
+                self.context["course_id"],
+                self.context.get("organization_protection_status"),
+            )
+
+
+def add_team_count(topics: list, course_id, organization_protection_status=None) -> None:
+    """
+    Stand-in of `lms.djangoapps.teams.serializers.add_team_count`.
+
+    Adds the number of teams visible to the user to each topic, in place.
+    """
+    filters = {"course_id": course_id, "topic_id__in": [topic["id"] for topic in topics]}
+    if organization_protection_status is not None and not organization_protection_status.is_exempt:
+        filters["organization_protected"] = organization_protection_status.is_protected
+
+    team_counts = dict(
+        CourseTeam.objects.filter(**filters)
+        .values("topic_id")
+        .annotate(team_count=Count("topic_id"))
+        .values_list("topic_id", "team_count")
+        .order_by()
+    )
+    for topic in topics:
+        topic["team_count"] = team_counts.get(topic["id"], 0)
+
+
+class TopicsPagination(DefaultPagination):
+    """
+    Stand-in of `lms.djangoapps.teams.views.TopicsPagination`.
+    """
+
+    page_size = TOPICS_PER_PAGE
+
+
+def _filter_hidden_private_teamsets(user, teamsets: list, course_block) -> list:
+    """
+    Stand-in of `lms.djangoapps.teams.views._filter_hidden_private_teamsets`.
+
+    Hides the private teamsets from the users that are not on any of their
+    teams, unless they are course staff.
+    """
+    if not teamsets or has_course_staff_privileges(user, course_block.id):
+        return teamsets
+
+    private_teamset_ids = [
+        teamset.teamset_id for teamset in course_block.teamsets if teamset.is_private_managed
+    ]
+    if not private_teamset_ids:
+        return teamsets
+
+    visible_private_teamset_ids = set(
+        CourseTeam.objects.filter(
+            course_id=course_block.id,
+            topic_id__in=private_teamset_ids,
+            membership__user=user,
+        ).values_list("topic_id", flat=True)
+    )
+    return [
+        teamset
+        for teamset in teamsets
+        if teamset["id"] not in private_teamset_ids or teamset["id"] in visible_private_teamset_ids
+    ]
+
+
+def get_alphabetical_topics(course_block) -> list:
+    """
+    Stand-in of `lms.djangoapps.teams.views.get_alphabetical_topics`.
+    """
+    return sorted(course_block.teams_topics, key=lambda topic: topic["name"].lower())
@@ -1,16 +1,20 @@
 """
 Contentstore generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.edxapp_wrapper.modulestore import get_course
+from platform_plugin_teams.edxapp_wrapper.registry import backends
+from platform_plugin_teams.instrumentation import COURSE_PHASE, timed
 
 
+@timed(COURSE_PHASE)
 def update_course_advanced_settings(*args, **kwargs):
     """
     Wrapper for `cms.djangoapps.contentstore.views.course.update_course_advanced_settings`
-    """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_CONTENTSTORE_BACKEND
-    backend = import_module(backend_function)
 
-    return backend.update_course_advanced_settings(*args, **kwargs)
+    The courses memoized by `get_course` in the current request are forgotten,
+    so the following calls load the updated course.
+    """
+    try:
+        return backends.contentstore.update_course_advanced_settings(*args, **kwargs)
+    finally:
+        get_course.cache_clear()
@@ -1,16 +1,15 @@
 """
 Courseware generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.cache import request_cached
+from platform_plugin_teams.edxapp_wrapper.registry import backends
+from platform_plugin_teams.instrumentation import ACCESS_PHASE, timed
 
 
+@timed(ACCESS_PHASE)
+@request_cached
 def has_access(*args, **kwargs):
     """
     Wrapper for `lms.djangoapps.courseware.courses.has_access`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_COURSEWARE_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.has_access(*args, **kwargs)
+    return backends.courseware.has_access(*args, **kwargs)
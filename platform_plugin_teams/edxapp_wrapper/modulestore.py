@@ -1,16 +1,22 @@
 """
 Modulestore generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.cache import request_cached
+from platform_plugin_teams.edxapp_wrapper.registry import backends
+from platform_plugin_teams.instrumentation import COURSE_PHASE, timed
 
 
 def modulestore(*args, **kwargs):
     """
     Wrapper for `xmodule.modulestore.django.modulestore`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_MODULESTORE_BACKEND
-    backend = import_module(backend_function)
+    return backends.modulestore.modulestore(*args, **kwargs)
+
 
-    return backend.modulestore(*args, **kwargs)
+@timed(COURSE_PHASE)
+@request_cached
+def get_course(*args, **kwargs):
+    """
+    Wrapper for `xmodule.modulestore.django.modulestore().get_course`
+    """
+    return modulestore().get_course(*args, **kwargs)
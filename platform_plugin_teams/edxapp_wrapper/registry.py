@@ -0,0 +1,80 @@
+"""
+Registry of the edxapp backends configured for the plugin.
+
+The backends are resolved once, on first use, so the wrappers can call them
+directly instead of importing the configured module on every call, and the
+processes that never use a backend (e.g. the LMS teams backend in the CMS) do
+not pay for importing it. A backend is resolved again only when its setting
+changes.
+"""
+from importlib import import_module
+
+from django.conf import settings
+
+BACKEND_SETTINGS = (
+    "PLATFORM_PLUGIN_TEAMS_AUTHENTICATION_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_CONTENTSTORE_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_COURSEWARE_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_MODULESTORE_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_STUDENT_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_TEAMS_COMMON_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_TEAMS_CONFIG_BACKEND",
+    "PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND",
+)
+
+
+def get_backend_name(setting_name: str) -> str:
+    """
+    Get the registry attribute of a backend setting.
+
+    e.g. `PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND` -> `teams_lms`
+    """
+    return setting_name[len("PLATFORM_PLUGIN_TEAMS_"):-len("_BACKEND")].lower()
+
+
+class EdxappBackends:
+    """
+    Resolved edxapp backends, available as attributes named after their setting.
+
+    e.g. `backends.teams_lms` is the module configured in the
+    `PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND` setting. A backend that was not
+    resolved yet is resolved on first access.
+    """
+
+    def __getattr__(self, name: str):
+        setting_name = f"PLATFORM_PLUGIN_TEAMS_{name.upper()}_BACKEND"
+        if setting_name not in BACKEND_SETTINGS:
+            raise AttributeError(name)
+
+        return self.resolve(setting_name)
+
+    def resolve(self, setting_name: str):
+        """
+        Import the backend configured in a setting and store it in the registry.
+
+        Args:
+            setting_name (str): The name of the backend setting.
+
+        Returns:
+            module: The backend module.
+        """
+        backend = import_module(getattr(settings, setting_name))
+        setattr(self, get_backend_name(setting_name), backend)
+        return backend
+
+    def resolve_all(self) -> None:
+        """Import every configured backend."""
+        for setting_name in BACKEND_SETTINGS:
+            self.resolve(setting_name)
+
+    def reset(self, setting_name: str) -> None:
+        """
+        Forget a backend so it is resolved again on its next access.
+
+        Args:
+            setting_name (str): The name of the backend setting.
+        """
+        self.__dict__.pop(get_backend_name(setting_name), None)
+
+
+backends = EdxappBackends()
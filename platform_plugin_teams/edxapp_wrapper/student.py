@@ -1,26 +1,54 @@
 """
 Student generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.edxapp_wrapper.registry import backends
+from platform_plugin_teams.instrumentation import ACCESS_PHASE, timed
 
 
 def get_user_by_username_or_email(*args, **kwargs):
     """
     Wrapper for `student.models.user.get_user_by_username_or_email`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_STUDENT_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.get_user_by_username_or_email(*args, **kwargs)
+    return backends.student.get_user_by_username_or_email(*args, **kwargs)
 
 
+@timed(ACCESS_PHASE)
 def has_studio_write_access(*args, **kwargs):
     """
     Wrapper for `student.auth.has_studio_write_access`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_STUDENT_BACKEND
-    backend = import_module(backend_function)
+    return backends.student.has_studio_write_access(*args, **kwargs)
+
+
+def get_course_enrollment_model():
+    """
+    Wrapper for `student.models.CourseEnrollment`
+    """
+    return backends.student.CourseEnrollment
+
+
+def get_user_retirement_request_model():
+    """
+    Wrapper for `openedx.core.djangoapps.user_api.models.UserRetirementRequest`
+    """
+    return backends.student.UserRetirementRequest
+
+
+LAZY_ATTRIBUTES = {
+    "CourseEnrollment": get_course_enrollment_model,
+    "UserRetirementRequest": get_user_retirement_request_model,
+}
+
+CourseEnrollment: type
+UserRetirementRequest: type
+
+
+def __getattr__(name):
+    """
+    Resolve the models of `LAZY_ATTRIBUTES` on first access, so importing this
+    module does not import the platform student and user API models.
+    """
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
 
-    return backend.has_studio_write_access(*args, **kwargs)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
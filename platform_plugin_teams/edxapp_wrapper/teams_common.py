@@ -1,19 +1,38 @@
 """
 Teams common generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.edxapp_wrapper.registry import backends
 
 
 def get_course_team_model():
     """
     Wrapper for `teams.models.CourseTeam`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_COMMON_BACKEND
-    backend = import_module(backend_function)
+    return backends.teams_common.CourseTeam
+
+
+def get_course_team_membership_model():
+    """
+    Wrapper for `teams.models.CourseTeamMembership`
+    """
+    return backends.teams_common.CourseTeamMembership
 
-    return backend.CourseTeam
 
+LAZY_ATTRIBUTES = {
+    "CourseTeam": get_course_team_model,
+    "CourseTeamMembership": get_course_team_membership_model,
+}
+
+CourseTeam: type
+CourseTeamMembership: type
+
+
+def __getattr__(name):
+    """
+    Resolve the models of `LAZY_ATTRIBUTES` on first access, so importing this
+    module does not import the platform teams models.
+    """
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
 
-CourseTeam = get_course_team_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,38 @@
 """
 Teams Config generalized definitions.
 """
-from importlib import import_module
+from platform_plugin_teams.edxapp_wrapper.registry import backends
 
-from django.conf import settings
+
+def get_teams_config_class():
+    """
+    Wrapper for `openedx.core.lib.teams_config.TeamsConfig`
+    """
+    return backends.teams_config.TeamsConfig
 
 
 def get_teamset_type_enum():
     """
     Wrapper for `openedx.core.lib.teams_config.TeamsetType`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_CONFIG_BACKEND
-    backend = import_module(backend_function)
+    return backends.teams_config.TeamsetType
+
 
-    return backend.TeamsetType
+LAZY_ATTRIBUTES = {
+    "TeamsConfig": get_teams_config_class,
+    "TeamsetType": get_teamset_type_enum,
+}
 
+TeamsConfig: type
+TeamsetType: type
+
+
+def __getattr__(name):
+    """
+    Resolve the backend classes of `LAZY_ATTRIBUTES` on first access, so
+    importing this module does not import the platform teams configuration.
+    """
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
 
-TeamsetType = get_teamset_type_enum()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
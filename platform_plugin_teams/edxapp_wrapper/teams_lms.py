@@ -1,139 +1,107 @@
 """
 Teams LMS generalized definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_teams.cache import request_cached
+from platform_plugin_teams.edxapp_wrapper.registry import backends
+from platform_plugin_teams.instrumentation import ACCESS_PHASE, timed
 
 
+@timed(ACCESS_PHASE)
 def can_user_modify_team(*args, **kwargs):
     """
     Wrapper for `teams.api.can_user_modify_team`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.can_user_modify_team(*args, **kwargs)
+    return backends.teams_lms.can_user_modify_team(*args, **kwargs)
 
 
 def get_team_by_team_id(*args, **kwargs):
     """
     Wrapper for `teams.api.get_team_by_team_id`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.get_team_by_team_id(*args, **kwargs)
+    return backends.teams_lms.get_team_by_team_id(*args, **kwargs)
 
 
+@timed(ACCESS_PHASE)
 def has_specific_team_access(*args, **kwargs):
     """
     Wrapper for `teams.api.has_specific_team_access`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.has_specific_team_access(*args, **kwargs)
+    return backends.teams_lms.has_specific_team_access(*args, **kwargs)
 
 
+@timed(ACCESS_PHASE)
+@request_cached
 def has_team_api_access(*args, **kwargs):
     """
     Wrapper for `teams.api.has_team_api_access`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.has_team_api_access(*args, **kwargs)
+    return backends.teams_lms.has_team_api_access(*args, **kwargs)
 
 
+@timed(ACCESS_PHASE)
+@request_cached
 def user_organization_protection_status(*args, **kwargs):
     """
     Wrapper for `teams.api.user_organization_protection_status`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.user_organization_protection_status(*args, **kwargs)
+    return backends.teams_lms.user_organization_protection_status(*args, **kwargs)
 
 
 def get_already_on_team_in_teamset_error():
     """
     Wrapper for `teams.errors.AlreadyOnTeamInTeamset`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.AlreadyOnTeamInTeamset
+    return backends.teams_lms.AlreadyOnTeamInTeamset
 
 
 def get_not_enrolled_in_course_for_team_error():
     """
     Wrapper for `teams.errors.NotEnrolledInCourseForTeam`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.NotEnrolledInCourseForTeam
-
-
-def get_course_team_membership_model():
-    """
-    Wrapper for `teams.models.CourseTeamMembership`
-    """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.CourseTeamMembership
+    return backends.teams_lms.NotEnrolledInCourseForTeam
 
 
 def get_membership_serializer():
     """
     Wrapper for `teams.serializers.MembershipSerializer`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.MembershipSerializer
+    return backends.teams_lms.MembershipSerializer
 
 
 def get_bulk_team_count_topic_serializer():
     """
     Wrapper for `teams.serializers.BulkTeamCountTopicSerializer`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.BulkTeamCountTopicSerializer
+    return backends.teams_lms.BulkTeamCountTopicSerializer
 
 
 def get_course_team_serializer():
     """
     Wrapper for `teams.serializers.CourseTeamSerializer`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
+    return backends.teams_lms.CourseTeamSerializer
+
 
-    return backend.CourseTeamSerializer
+def get_course_team_creation_serializer():
+    """
+    Wrapper for `teams.serializers.CourseTeamCreationSerializer`
+    """
+    return backends.teams_lms.CourseTeamCreationSerializer
 
 
 def get_topics_pagination_view():
     """
     Wrapper for `teams.views.TopicsPagination`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend.TopicsPagination
+    return backends.teams_lms.TopicsPagination
 
 
+@timed(ACCESS_PHASE)
 def _filter_hidden_private_teamsets(*args, **kwargs):
     """
     Wrapper for `teams.views._filter_hidden_private_teamsets`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
-
-    return backend._filter_hidden_private_teamsets(  # pylint: disable=protected-access
+    return backends.teams_lms._filter_hidden_private_teamsets(  # pylint: disable=protected-access
         *args, **kwargs
     )
 
@@ -142,16 +110,35 @@ def get_alphabetical_topics(*args, **kwargs):
     """
     Wrapper for `teams.views.get_alphabetical_topics`
     """
-    backend_function = settings.PLATFORM_PLUGIN_TEAMS_TEAMS_LMS_BACKEND
-    backend = import_module(backend_function)
+    return backends.teams_lms.get_alphabetical_topics(*args, **kwargs)
+
+
+# The backend classes are resolved when they are first accessed, so importing
+# this module does not import the LMS teams views, serializers and models.
+AlreadyOnTeamInTeamset: type
+NotEnrolledInCourseForTeam: type
+MembershipSerializer: type
+TopicsPagination: type
+BulkTeamCountTopicSerializer: type
+CourseTeamSerializer: type
+CourseTeamCreationSerializer: type
 
-    return backend.get_alphabetical_topics(*args, **kwargs)
+LAZY_ATTRIBUTES = {
+    "AlreadyOnTeamInTeamset": get_already_on_team_in_teamset_error,
+    "NotEnrolledInCourseForTeam": get_not_enrolled_in_course_for_team_error,
+    "MembershipSerializer": get_membership_serializer,
+    "TopicsPagination": get_topics_pagination_view,
+    "BulkTeamCountTopicSerializer": get_bulk_team_count_topic_serializer,
+    "CourseTeamSerializer": get_course_team_serializer,
+    "CourseTeamCreationSerializer": get_course_team_creation_serializer,
+}
 
 
-AlreadyOnTeamInTeamset = get_already_on_team_in_teamset_error()
-NotEnrolledInCourseForTeam = get_not_enrolled_in_course_for_team_error()
-CourseTeamMembership = get_course_team_membership_model()
-MembershipSerializer = get_membership_serializer()
-TopicsPagination = get_topics_pagination_view()
-BulkTeamCountTopicSerializer = get_bulk_team_count_topic_serializer()
-CourseTeamSerializer = get_course_team_serializer()
+def __getattr__(name):
+    """
+    Resolve the backend classes of `LAZY_ATTRIBUTES` on first access.
+    """
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,264 @@
+"""
+Streaming export of the teams of a course for the Teams plugin.
+
+The teamsets, teams and memberships of a course are exported as records, one
+per line of an NDJSON or CSV file, generated while the response is sent. The
+teams and the memberships are read in batches of
+`PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE` rows, each batch starting after the
+primary key of the previous one, so the memory used does not grow with the
+size of the course and no query holds a cursor open across the whole export.
+
+The batches are read in separate queries, so an export reflects the changes
+made to the course while it runs.
+"""
+import csv
+import io
+import json
+
+from django.conf import settings
+from rest_framework import serializers
+
+from platform_plugin_teams.edxapp_wrapper import teams_common
+
+TEAMSET_RECORD = "teamset"
+TEAM_RECORD = "team"
+MEMBERSHIP_RECORD = "membership"
+# Size from which the rendered records are sent, so each write is not a single record
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+NDJSON_FORMAT = "ndjson"
+CSV_FORMAT = "csv"
+EXPORT_CONTENT_TYPES = {
+    NDJSON_FORMAT: "application/x-ndjson",
+    CSV_FORMAT: "text/csv; charset=utf-8",
+}
+
+TEAM_FIELDS = (
+    "pk",
+    "topic_id",
+    "team_id",
+    "name",
+    "description",
+    "country",
+    "language",
+    "organization_protected",
+    "team_size",
+    "date_created",
+    "last_activity_at",
+)
+MEMBERSHIP_FIELDS = ("pk", "team__topic_id", "team__team_id", "user__username", "date_joined", "last_activity_at")
+
+# The columns of the CSV export, the union of the fields of every record
+CSV_FIELDS = (
+    "record",
+    "teamset_id",
+    "team_id",
+    "username",
+    "name",
+    "description",
+    "teamset_type",
+    "max_team_size",
+    "country",
+    "language",
+    "organization_protected",
+    "team_size",
+    "date_created",
+    "date_joined",
+    "last_activity_at",
+)
+# First characters that make a spreadsheet read a CSV value as a formula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def get_export_batch_size() -> int:
+    """Number of teams or memberships read with each query of an export."""
+    return getattr(settings, "PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE", 1000)
+
+
+def iter_batches(queryset, fields: tuple, batch_size: int):
+    """
+    Iterate over the rows of a queryset in batches ordered by primary key.
+
+    Each batch is read with its own query, starting after the last primary key
+    of the previous batch.
+
+    Args:
+        queryset (QuerySet): The rows to read.
+        fields (tuple): The fields of each row, starting with `pk`.
+        batch_size (int): The number of rows of each batch.
+
+    Yields:
+        list[tuple]: The values of the rows of each batch.
+    """
+    last_pk = None
+    while True:
+        batch_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(batch_queryset.order_by("pk").values_list(*fields)[:batch_size])
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last_pk = batch[-1][0]
+
+
+def iter_course_records(course_block):
+    """
+    Iterate over the teamsets, teams and memberships of a course.
+
+    The teams are read in batches, each one followed by the memberships of its
+    teams.
+
+    Args:
+        course_block (CourseBlock): The course to export.
+
+    Yields:
+        dict: The fields of each record, with its kind in `record`.
+    """
+    date_time_field = serializers.DateTimeField()
+
+    def format_date_time(value):
+        return date_time_field.to_representation(value) if value else None
+
+    for teamset in course_block.teams_configuration.cleaned_data["team_sets"]:
+        yield {
+            "record": TEAMSET_RECORD,
+            "teamset_id": teamset["id"],
+            "name": teamset["name"],
+            "description": teamset["description"],
+            "teamset_type": teamset["type"],
+            "max_team_size": teamset["max_team_size"],
+        }
+
+    batch_size = get_export_batch_size()
+    teams = teams_common.CourseTeam.objects.filter(course_id=course_block.id)
+    for team_batch in iter_batches(teams, TEAM_FIELDS, batch_size):
+        for (
+            _pk,
+            topic_id,
+            team_id,
+            name,
+            description,
+            country,
+            language,
+            organization_protected,
+            team_size,
+            date_created,
+            last_activity_at,
+        ) in team_batch:
+            yield {
+                "record": TEAM_RECORD,
+                "teamset_id": topic_id,
+                "team_id": team_id,
+                "name": name,
+                "description": description,
+                "country": str(country or ""),
+                "language": language,
+                "organization_protected": organization_protected,
+                "team_size": team_size,
+                "date_created": format_date_time(date_created),
+                "last_activity_at": format_date_time(last_activity_at),
+            }
+
+        memberships = teams_common.CourseTeamMembership.objects.filter(team_id__in=[team[0] for team in team_batch])
+        for membership_batch in iter_batches(memberships, MEMBERSHIP_FIELDS, batch_size):
+            for _pk, topic_id, team_id, username, date_joined, last_activity_at in membership_batch:
+                yield {
+                    "record": MEMBERSHIP_RECORD,
+                    "teamset_id": topic_id,
+                    "team_id": team_id,
+                    "username": username,
+                    "date_joined": format_date_time(date_joined),
+                    "last_activity_at": format_date_time(last_activity_at),
+                }
+
+
+def iter_ndjson(records):
+    """
+    Render records as NDJSON, one JSON object per line.
+
+    Args:
+        records (iterable): The records to render.
+
+    Yields:
+        bytes: Chunks of about `EXPORT_CHUNK_SIZE` bytes of lines.
+    """
+    lines = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield b"".join(lines)
+            lines = []
+            size = 0
+
+    if lines:
+        yield b"".join(lines)
+
+
+def escape_csv_value(value):
+    """
+    Escape a value of the CSV export, so spreadsheets do not read it as a formula.
+
+    Args:
+        value: The value of a field of a record.
+
+    Returns:
+        The value, prefixed with `'` if it is a string starting with one of `CSV_FORMULA_PREFIXES`.
+    """
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(records):
+    """
+    Render records as CSV, with the `CSV_FIELDS` columns.
+
+    The values that a spreadsheet would read as a formula are escaped, as the
+    names and descriptions of the teams are written by the learners.
+
+    Args:
+        records (iterable): The records to render.
+
+    Yields:
+        bytes: Chunks of about `EXPORT_CHUNK_SIZE` bytes of rows, starting with the header.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, restval="")
+
+    def flush() -> bytes:
+        content = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return content
+
+    writer.writeheader()
+    for record in records:
+        writer.writerow({field: escape_csv_value(value) for field, value in record.items()})
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield flush()
+
+    if buffer.tell():
+        yield flush()
+
+
+EXPORT_RENDERERS = {
+    NDJSON_FORMAT: iter_ndjson,
+    CSV_FORMAT: iter_csv,
+}
+
+
+def iter_course_export(course_block, export_format: str):
+    """
+    Render the export of a course in a format.
+
+    Args:
+        course_block (CourseBlock): The course to export.
+        export_format (str): One of `ndjson` or `csv`.
+
+    Returns:
+        iterator: The chunks of the export, as bytes.
+    """
+    return EXPORT_RENDERERS[export_format](iter_course_records(course_block))
@@ -0,0 +1,235 @@
+"""
+Automatic team formation for the Teams plugin.
+
+Every enrolled learner that is not on a team of a topic is placed on one, keeping
+the teams within the maximum team size of the topic and as even as possible, and
+creating the teams that are missing.
+
+The plan works on flat arrays of ids instead of model instances, and runs in
+O(n log n) for n learners (the sort of the learners dominates), so whole course
+enrollments can be planned in a request:
+
+1. The learners are sorted by the attribute to balance (e.g. their country).
+2. The free places of the teams are listed level by level (water filling): first
+   a place on each of the smallest teams, then on the teams one member larger,
+   and so on. Consecutive places are on different teams.
+3. The sorted learners are dealt to the places in order, so every group of
+   learners with the same attribute is spread across all the teams.
+"""
+import math
+from array import array
+from collections import namedtuple
+from itertools import islice
+
+from django.db.models import Count
+
+from platform_plugin_teams.edxapp_wrapper import student, teams_common
+from platform_plugin_teams.memberships import add_memberships
+from platform_plugin_teams.teams import create_teams, get_generated_team_names
+
+BALANCE_ATTRIBUTES = ("country", "gender", "level_of_education", "year_of_birth")
+FORMATION_CHUNK_SIZE = 5000
+
+FormationPlan = namedtuple(
+    "FormationPlan",
+    ["teams", "new_team_names", "user_ids", "usernames", "team_indexes"],
+)
+FormationPlan.__doc__ = """
+The proposed placement of the learners of a course on the teams of a topic.
+
+Attributes:
+    teams (list): `(pk, team_id, name, team_size)` of the existing teams of the topic.
+    new_team_names (list): The names of the teams to create.
+    user_ids (array): The ids of the learners to place.
+    usernames (list): The usernames of the learners, in the same order.
+    team_indexes (array): The team of each learner, as an index of `teams`
+        followed by `new_team_names`.
+"""
+
+
+class TeamFormationError(Exception):
+    """
+    The teams of a topic can not be formed.
+    """
+
+
+def get_formation_slots(team_sizes: list, learner_count: int, max_team_size: int = None) -> tuple:
+    """
+    Get the places of the teams of a topic to fill with a number of learners.
+
+    Args:
+        team_sizes (list): The current size of each team.
+        learner_count (int): The number of learners to place.
+        max_team_size (int, optional): The maximum team size. If not given, the
+            learners are spread across the existing teams only.
+
+    Raises:
+        TeamFormationError: If there are no teams and no maximum team size.
+
+    Returns:
+        tuple: The number of teams to add, and an array with the index of the
+            team of each place, as an index of `team_sizes` followed by the new
+            teams. Consecutive places of the same level are on different teams.
+    """
+    team_sizes = list(team_sizes)
+    if max_team_size is None:
+        if not team_sizes:
+            raise TeamFormationError("The topic has no teams and no maximum team size.")
+        max_team_size = math.ceil((sum(team_sizes) + learner_count) / len(team_sizes))
+
+    capacity = sum(max(0, max_team_size - team_size) for team_size in team_sizes)
+    new_team_count = math.ceil(max(0, learner_count - capacity) / max_team_size)
+    team_sizes.extend([0] * new_team_count)
+
+    slots = array("l")
+    if not learner_count:
+        return new_team_count, slots
+
+    teams_by_size = sorted(range(len(team_sizes)), key=team_sizes.__getitem__)
+    open_teams = 0
+    level = team_sizes[teams_by_size[0]]
+    while len(slots) < learner_count:
+        while open_teams < len(teams_by_size) and team_sizes[teams_by_size[open_teams]] <= level:
+            open_teams += 1
+        slots.extend(islice(teams_by_size, min(open_teams, learner_count - len(slots))))
+        level += 1
+
+    return new_team_count, slots
+
+
+def sort_learners(learners: list, balanced: bool = False) -> None:
+    """
+    Sort the learners to place, in place, so they are dealt to the teams in order.
+
+    Args:
+        learners (list): `(user_id, username)` tuples of the learners, followed by
+            the value of the attribute to balance if `balanced`.
+        balanced (bool, optional): Whether to group the learners by the value of
+            the attribute to balance.
+    """
+    if balanced:
+        learners.sort(key=lambda learner: (str(learner[2] or ""), learner[0]))
+    else:
+        learners.sort()
+
+
+def plan_team_formation(
+    course_key,
+    topic_id: str,
+    max_team_size: int = None,
+    balance_by: str = None,
+    name_prefix: str = "Team",
+) -> FormationPlan:
+    """
+    Plan the placement of the learners of a course that are not on a team of a topic.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        max_team_size (int, optional): The maximum team size of the topic.
+        balance_by (str, optional): The profile attribute to balance across the
+            teams, one of `BALANCE_ATTRIBUTES`.
+        name_prefix (str, optional): The prefix of the names of the new teams.
+
+    Raises:
+        TeamFormationError: If the teams can not be formed.
+
+    Returns:
+        FormationPlan: The proposed placement.
+    """
+    teams = list(
+        teams_common.CourseTeam.objects.filter(course_id=course_key, topic_id=topic_id)
+        .annotate(membership_count=Count("membership"))
+        .order_by("pk")
+        .values_list("pk", "team_id", "name", "membership_count")
+    )
+    member_ids = teams_common.CourseTeamMembership.objects.filter(
+        team__course_id=course_key, team__topic_id=topic_id
+    ).values("user_id")
+
+    fields = ["user_id", "user__username"]
+    if balance_by:
+        fields.append(f"user__profile__{balance_by}")
+    learners = list(
+        student.CourseEnrollment.objects.filter(course_id=course_key, is_active=True)
+        .exclude(user_id__in=member_ids)
+        .values_list(*fields)
+    )
+    sort_learners(learners, balanced=bool(balance_by))
+
+    new_team_count, team_indexes = get_formation_slots(
+        [team[3] for team in teams], len(learners), max_team_size
+    )
+
+    return FormationPlan(
+        teams=teams,
+        new_team_names=get_generated_team_names(course_key, topic_id, new_team_count, name_prefix),
+        user_ids=array("l", (learner[0] for learner in learners)),
+        usernames=[learner[1] for learner in learners],
+        team_indexes=team_indexes,
+    )
+
+
+def get_plan_summary(plan: FormationPlan) -> list:
+    """
+    Get the proposed teams of a formation plan, with the usernames added to each one.
+
+    Args:
+        plan (FormationPlan): The plan.
+
+    Returns:
+        list: A dict for each existing or new team, with its `team_id` (None for
+            new teams), `name`, current `team_size` and `added` usernames.
+    """
+    summary = [
+        {"team_id": team_id, "name": name, "team_size": team_size, "added": []}
+        for _, team_id, name, team_size in plan.teams
+    ]
+    summary.extend(
+        {"team_id": None, "name": name, "team_size": 0, "added": []}
+        for name in plan.new_team_names
+    )
+    for username, team_index in zip(plan.usernames, plan.team_indexes):
+        summary[team_index]["added"].append(username)
+
+    return summary
+
+
+def form_teams_job(job, course_key, topic_id: str, max_team_size: int, balance_by: str, name_prefix: str) -> None:
+    """
+    Place the learners of a course that are not on a team of a topic, as a background job.
+
+    The placement is planned when the job runs, the missing teams are created
+    with bulk inserts, and the memberships are added in chunks, each one in its
+    own transaction that locks the teams of the chunk. The learners that joined
+    a team of the topic since the plan, or whose team was filled since, are
+    reported as errors.
+
+    Args:
+        job (Job): The job that forms the teams.
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        max_team_size (int): The maximum team size of the topic.
+        balance_by (str): The profile attribute to balance across the teams.
+        name_prefix (str): The prefix of the names of the new teams.
+    """
+    plan = plan_team_formation(course_key, topic_id, max_team_size, balance_by, name_prefix)
+    job.total = len(plan.user_ids)
+    job.save()
+
+    new_teams = create_teams(course_key, topic_id, [{"name": name} for name in plan.new_team_names])
+    team_pks = [team[0] for team in plan.teams] + [team.pk for team in new_teams]
+
+    for start in range(0, len(plan.user_ids), FORMATION_CHUNK_SIZE):
+        end = min(start + FORMATION_CHUNK_SIZE, len(plan.user_ids))
+        skipped_user_ids = add_memberships(
+            course_key,
+            topic_id,
+            [(team_pks[plan.team_indexes[index]], plan.user_ids[index]) for index in range(start, end)],
+            max_team_size,
+        )
+        for index in range(start, end):
+            if plan.user_ids[index] in skipped_user_ids:
+                job.add_error(username=plan.usernames[index], error=skipped_user_ids[plan.user_ids[index]])
+        job.processed += end - start
+        job.save()
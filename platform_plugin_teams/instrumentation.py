@@ -0,0 +1,267 @@
+"""
+Request instrumentation for the Teams plugin.
+
+A sample of the requests to the plugin views, set with
+`PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE` (0 to 1), record the time
+and the number of calls of each phase of the request:
+
+* `course`: reads and writes of the course through the modulestore.
+* `access`: the permission checks done through the edxapp wrappers.
+* `db`: the database queries.
+* `serialize`: the serialization of the response data.
+
+The timings are returned in the `Server-Timing` header of the response and
+logged as a JSON line. The phases can overlap, e.g. the queries of an access
+check are counted in both `access` and `db`.
+
+The requests that are not sampled only pay for a thread-local lookup in each
+instrumented call.
+
+The views are instrumented with `InstrumentedAPIViewMixin`, which also runs
+the requests asked by the global staff under the profiler of
+`platform_plugin_teams.profiling`, and records the latency of every request
+and the request cache hits in `platform_plugin_teams.metrics`. The views can
+add tags to the latency of a request in `metric_tags`.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+from platform_plugin_teams import metrics
+from platform_plugin_teams.cache import get_request_cache_stats
+from platform_plugin_teams.profiling import PROFILE_HEADER, RequestProfiler, can_profile, is_profile_requested
+
+log = logging.getLogger(__name__)
+
+COURSE_PHASE = "course"
+ACCESS_PHASE = "access"
+DB_PHASE = "db"
+SERIALIZE_PHASE = "serialize"
+TOTAL_PHASE = "total"
+
+_current = threading.local()
+
+
+class RequestTimings:
+    """
+    The time and the number of calls of each phase of a request.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def add(self, phase: str, duration: float) -> None:
+        """
+        Add a call to a phase.
+
+        Args:
+            phase (str): The name of the phase.
+            duration (float): The duration of the call, in seconds.
+        """
+        total, count = self.phases.get(phase, (0.0, 0))
+        self.phases[phase] = (total + duration, count + 1)
+
+    def finish(self) -> None:
+        """Record the total duration of the request."""
+        self.duration = time.perf_counter() - self.start
+
+    def to_header(self) -> str:
+        """
+        Build the `Server-Timing` header value of the timings.
+
+        e.g. `total;dur=12.5, db;dur=3.1;desc="7 calls"`
+        """
+        entries = [f"{TOTAL_PHASE};dur={self.duration * 1000:.1f}"]
+        entries.extend(
+            f'{phase};dur={total * 1000:.1f};desc="{count} calls"'
+            for phase, (total, count) in self.phases.items()
+        )
+        return ", ".join(entries)
+
+    def to_dict(self) -> dict:
+        """Get the timings in milliseconds, and the call counts, of each phase."""
+        return {
+            "total_ms": round(self.duration * 1000, 1),
+            "phases": {
+                phase: {"ms": round(total * 1000, 1), "calls": count}
+                for phase, (total, count) in self.phases.items()
+            },
+        }
+
+
+def get_request_timings():
+    """
+    Get the timings of the request being instrumented in the current thread.
+
+    Returns:
+        RequestTimings: The timings, or None if the request is not instrumented.
+    """
+    return getattr(_current, "timings", None)
+
+
+@contextmanager
+def timed_phase(phase: str):
+    """
+    Record the time spent in a block as a call to a phase of the current request.
+
+    Args:
+        phase (str): The name of the phase.
+    """
+    timings = getattr(_current, "timings", None)
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def timed(phase: str):
+    """
+    Record each call of the decorated function as a call to a phase of the current request.
+
+    Args:
+        phase (str): The name of the phase.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = getattr(_current, "timings", None)
+            if timings is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(phase, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def _record_query(execute, sql, params, many, context):
+    """Database execute wrapper that records each query in the `db` phase."""
+    with timed_phase(DB_PHASE):
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def instrument():
+    """
+    Record the timings of the phases run in the block, in the current thread.
+
+    Yields:
+        RequestTimings: The timings, finished when the block exits.
+    """
+    timings = RequestTimings()
+    previous = getattr(_current, "timings", None)
+    _current.timings = timings
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield timings
+    finally:
+        _current.timings = previous
+        timings.finish()
+
+
+def should_sample() -> bool:
+    """Whether to instrument the current request, at the configured sample rate."""
+    sample_rate = getattr(settings, "PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE", 0)
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+class InstrumentedAPIViewMixin:
+    """
+    Instrument a sample of the requests to an API view, and profile the ones
+    the global staff ask for.
+
+    The timings are added to the `Server-Timing` header of the response, along
+    with any other timing already there, and logged. The id of a stored profile
+    is returned in the `X-Platform-Plugin-Teams-Profile` header.
+    """
+
+    profiler = None
+    metric_tags = None
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Start profiling the request once the user is authenticated and allowed
+        to use the view, if the user asked for it and can profile requests.
+        """
+        super().initial(request, *args, **kwargs)
+        if is_profile_requested(request) and can_profile(request.user):
+            profiler = RequestProfiler()
+            try:
+                profiler.start()
+            except ValueError:
+                log.warning("Could not profile %s %s, another profiler is active.", request.method, request.path)
+            else:
+                self.profiler = profiler
+
+    def dispatch(self, request, *args, **kwargs):
+        """Dispatch the request, instrumenting and profiling it as requested."""
+        self.profiler = None
+        self.metric_tags = {"view": type(self).__name__, "method": request.method}
+        with metrics.timer("request.duration", self.metric_tags):
+            try:
+                if should_sample():
+                    response = self.instrumented_dispatch(request, *args, **kwargs)
+                else:
+                    response = super().dispatch(request, *args, **kwargs)
+            finally:
+                if self.profiler is not None:
+                    self.profiler.stop()
+            self.metric_tags["status"] = f"{response.status_code // 100}xx"
+
+        if self.profiler is not None:
+            profile = self.profiler.save(self.request, self, response, kwargs.get("course_id"))
+            response[PROFILE_HEADER] = profile.profile_id
+
+        for function, stats in get_request_cache_stats().items():
+            metrics.increment("cache.request", stats["hits"], {"function": function, "result": "hit"})
+            metrics.increment("cache.request", stats["misses"], {"function": function, "result": "miss"})
+
+        return response
+
+    def instrumented_dispatch(self, request, *args, **kwargs):
+        """Dispatch the request, recording and reporting its timings."""
+        with instrument() as timings:
+            response = super().dispatch(request, *args, **kwargs)
+
+        server_timing = timings.to_header()
+        if response.has_header("Server-Timing"):
+            server_timing = f"{response['Server-Timing']}, {server_timing}"
+        response["Server-Timing"] = server_timing
+
+        log.info(
+            "Request timings: %s",
+            json.dumps(
+                {
+                    "view": type(self).__name__,
+                    "method": request.method,
+                    "path": request.path,
+                    "course_id": kwargs.get("course_id"),
+                    "status_code": response.status_code,
+                    **timings.to_dict(),
+                },
+                sort_keys=True,
+            ),
+        )
+        return response
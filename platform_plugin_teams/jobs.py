@@ -0,0 +1,183 @@
+"""
+Background jobs for the Teams plugin.
+
+Long running operations (e.g. importing a roster with thousands of learners)
+run in a pool of worker threads of the process that received the request. Their
+progress is stored in the Django cache, so it can be reported by any process
+sharing the cache.
+
+The jobs are not persisted: a job that was running when its process stopped
+stays in the `running` status until it expires from the cache.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from edx_django_utils.cache import RequestCache
+
+log = logging.getLogger(__name__)
+
+JOB_CACHE_KEY = "platform_plugin_teams.job.{job_id}"
+JOB_CACHE_TIMEOUT = 60 * 60 * 24
+MAX_REPORTED_ERRORS = 1000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class Job:
+    """
+    Progress of a background job.
+
+    Attributes:
+        job_id (str): Unique identifier of the job.
+        kind (str): The operation the job runs.
+        user_id (int): The user that started the job.
+        course_id (str): The course the job works on.
+        total (int): Number of items to process.
+        status (str): One of `pending`, `running`, `completed` or `failed`.
+        processed (int): Number of items processed so far.
+        failed (int): Number of items that could not be processed.
+        errors (list[dict]): Details of the first failed items.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        job_id: str,
+        kind: str,
+        user_id: int,
+        course_id: str,
+        total: int,
+        status: str = PENDING,
+        processed: int = 0,
+        failed: int = 0,
+        errors: list = None,
+    ):
+        self.job_id = job_id
+        self.kind = kind
+        self.user_id = user_id
+        self.course_id = course_id
+        self.total = total
+        self.status = status
+        self.processed = processed
+        self.failed = failed
+        self.errors = errors or []
+
+    @classmethod
+    def get(cls, job_id: str):
+        """
+        Get a job by its id.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            Job: The job, or None if it does not exist or has expired.
+        """
+        data = cache.get(JOB_CACHE_KEY.format(job_id=job_id))
+        if data is None:
+            return None
+
+        return cls(**data)
+
+    def save(self) -> None:
+        """Store the progress of the job."""
+        cache.set(JOB_CACHE_KEY.format(job_id=self.job_id), self.to_dict(), JOB_CACHE_TIMEOUT)
+
+    def add_error(self, **error) -> None:
+        """
+        Record an item that could not be processed.
+
+        Only the first `MAX_REPORTED_ERRORS` errors are kept, so the job fits in
+        the cache, but all of them are counted.
+        """
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def to_dict(self) -> dict:
+        """Get the representation of the job."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "user_id": self.user_id,
+            "course_id": self.course_id,
+            "total": self.total,
+            "status": self.status,
+            "processed": self.processed,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def to_public_dict(self) -> dict:
+        """Get the representation of the job returned by the API."""
+        data = self.to_dict()
+        del data["kind"], data["user_id"], data["course_id"]
+        return data
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the worker pool of the process, creating it on first use."""
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PLATFORM_PLUGIN_TEAMS_JOB_WORKERS", 2),
+                thread_name_prefix="platform_plugin_teams",
+            )
+
+    return _executor
+
+
+def start_job(kind: str, user, course_key, total: int, func, *args) -> Job:
+    """
+    Run a function in the background.
+
+    Args:
+        kind (str): The operation the job runs.
+        user (User): The user that starts the job.
+        course_key (CourseKey): The course the job works on.
+        total (int): Number of items to process.
+        func (callable): Called with the job and `args`. It must update the
+            progress of the job as it goes.
+        *args: Extra arguments of `func`.
+
+    Returns:
+        Job: The pending job.
+    """
+    job = Job(uuid4().hex, kind, user.id, str(course_key), total)
+    job.save()
+    get_executor().submit(run_job, job, func, *args)
+    return job
+
+
+def run_job(job: Job, func, *args) -> None:
+    """
+    Run a job in the current thread and record its final status.
+
+    The worker threads are reused between jobs, so the request cache and the
+    database connections of the thread are cleaned up around each job.
+    """
+    RequestCache.clear_all_namespaces()
+    job.status = Job.RUNNING
+    job.save()
+
+    try:
+        func(job, *args)
+        job.status = Job.COMPLETED
+    except Exception:  # pylint: disable=broad-except
+        log.exception("The %s job %s failed.", job.kind, job.job_id)
+        job.status = Job.FAILED
+    finally:
+        job.save()
+        RequestCache.clear_all_namespaces()
+        connections.close_all()
@@ -0,0 +1,536 @@
+"""
+Bulk team membership operations for the Teams plugin.
+
+These functions work on whole lists of users with a constant number of queries,
+instead of going through `CourseTeam.add_user` once per user. Since bulk inserts
+and updates do not call `save` nor send model signals, they keep the team sizes
+and the plugin caches up to date themselves, and send the `post_save` signals
+of the written rows.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework import status
+
+from platform_plugin_teams import metrics
+from platform_plugin_teams.cache import deferred_course_invalidation
+from platform_plugin_teams.edxapp_wrapper import student, teams_common
+from platform_plugin_teams.edxapp_wrapper.modulestore import get_course
+from platform_plugin_teams.edxapp_wrapper.teams_lms import (
+    can_user_modify_team,
+    get_team_by_team_id,
+    has_specific_team_access,
+    has_team_api_access,
+)
+from platform_plugin_teams.utils import send_post_save
+
+User = get_user_model()
+
+BULK_CREATE_BATCH_SIZE = 500
+TEAM_ACTIVITY_FIELDS = ["team_size", "last_activity_at"]
+
+
+class MembershipError(Exception):
+    """
+    A team membership change can not be applied.
+
+    Attributes:
+        message (str): Description of the error.
+        field (str): The request field the error is about, if any.
+        status_code (int): HTTP status code that describes the error.
+        reason (str): Why the change is rejected, to tag the metrics: one of
+            `invalid`, `not_found`, `access`, `not_enrolled` or `capacity`.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        field: str = None,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+        reason: str = "invalid",
+    ):
+        super().__init__(message)
+        self.message = message
+        self.field = field
+        self.status_code = status_code
+        self.reason = reason
+
+
+class TeamCapacityExceeded(MembershipError):
+    """
+    The users can not be added because the team would exceed its maximum size.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message, reason="capacity")
+
+
+def record_rejected_memberships(error: MembershipError, count: int = 1) -> None:
+    """
+    Count memberships that could not be added in the `memberships.rejected` metric.
+
+    Args:
+        error (MembershipError): Why the memberships were rejected.
+        count (int, optional): The number of rejected memberships.
+    """
+    metrics.increment("memberships.rejected", count, {"reason": error.reason})
+
+
+def get_team_to_join(requesting_user, team_id: str):
+    """
+    Get a team the requesting user can add users to.
+
+    Args:
+        requesting_user (User): The user adding the users to the team.
+        team_id (str): The team id of the team.
+
+    Raises:
+        MembershipError: If the team does not exist or can not be modified.
+
+    Returns:
+        CourseTeam: The team.
+    """
+    team = get_team_by_team_id(team_id=team_id)
+    if not team:
+        raise MembershipError(
+            f"The supplied {team_id=} does not exists.",
+            field="team_id",
+            status_code=status.HTTP_404_NOT_FOUND,
+            reason="not_found",
+        )
+
+    if not has_specific_team_access(requesting_user, team):
+        raise MembershipError(
+            f"The request.user={requesting_user!r} do not have access to the specified team.",
+            status_code=status.HTTP_403_FORBIDDEN,
+            reason="access",
+        )
+
+    if not can_user_modify_team(requesting_user, team):
+        raise MembershipError(
+            f"The request.user={requesting_user!r} can't join an instructor managed team.",
+            status_code=status.HTTP_403_FORBIDDEN,
+            reason="access",
+        )
+
+    return team
+
+
+def check_users_to_add(requesting_user, team, usernames: list) -> list:
+    """
+    Check which users can be added to a team, with a constant number of queries.
+
+    Args:
+        requesting_user (User): The user adding the users to the team.
+        team (CourseTeam): The team to add the users to.
+        usernames (list): Usernames or emails of the users to add.
+
+    Returns:
+        list: A `(username, user, error)` tuple for each username, in the same
+            order. `user` is None when the user can not be added, and `error`
+            is the MembershipError that explains why.
+    """
+    users_by_username = get_users_by_username_or_email(usernames)
+    enrolled_user_ids = get_enrolled_user_ids(
+        team.course_id, list(users_by_username.values())
+    )
+
+    results = []
+    for username in usernames:
+        user = users_by_username.get(username)
+        if not has_team_api_access(
+            requesting_user, team.course_id, access_username=username
+        ):
+            error = MembershipError(
+                (
+                    f"The request.user={requesting_user!r} do not have access "
+                    "to the Team API for the given course."
+                ),
+                status_code=status.HTTP_403_FORBIDDEN,
+                reason="access",
+            )
+        elif user is None:
+            error = MembershipError(
+                f"The {username=} does not exists.",
+                field="usernames",
+                status_code=status.HTTP_404_NOT_FOUND,
+                reason="not_found",
+            )
+        elif user.id not in enrolled_user_ids:
+            error = MembershipError(
+                (
+                    f"The {username=} is not enrolled in "
+                    "the course associated with this team."
+                ),
+                field="usernames",
+                reason="not_enrolled",
+            )
+        else:
+            error = None
+
+        results.append((username, None if error else user, error))
+
+    return results
+
+
+def get_max_team_size(team):
+    """
+    Get the maximum size of a team, as configured for its teamset.
+
+    Args:
+        team (CourseTeam): The team.
+
+    Returns:
+        int: The maximum team size, or None if the team size is not limited.
+    """
+    course_block = get_course(team.course_id)
+    return course_block.teams_configuration.calc_max_team_size(team.topic_id)
+
+
+def get_users_by_username_or_email(identifiers: list) -> dict:
+    """
+    Get the users matching a list of usernames or emails with a single query.
+
+    As in `get_user_by_username_or_email`, the identifiers are stripped, a
+    username match takes precedence over an email match, and the users that
+    requested the retirement of their account are not found. The identifiers
+    are matched case-insensitively, as the usernames and emails are by the
+    collation of the platform database. Their lowercase forms are also looked
+    up, so they still match the lowercase usernames and emails on databases
+    with a case-sensitive collation.
+
+    Args:
+        identifiers (list): Usernames or emails of the users.
+
+    Returns:
+        dict: A mapping of each found identifier, as given, to its user.
+    """
+    stripped_identifiers = {identifier: identifier.strip() for identifier in identifiers}
+    lookups = set(stripped_identifiers.values())
+    lookups.update(stripped_identifier.lower() for stripped_identifier in stripped_identifiers.values())
+    users = User.objects.filter(Q(username__in=lookups) | Q(email__in=lookups)).exclude(
+        pk__in=student.UserRetirementRequest.objects.values("user_id")
+    )
+    users_by_username = {}
+    users_by_email = {}
+    for user in users:
+        users_by_username[user.username.lower()] = user
+        users_by_email[user.email.lower()] = user
+
+    found_users = {}
+    for identifier, stripped_identifier in stripped_identifiers.items():
+        key = stripped_identifier.lower()
+        user = users_by_username.get(key) or users_by_email.get(key)
+        if user is not None:
+            found_users[identifier] = user
+
+    return found_users
+
+
+def get_enrolled_user_ids(course_key, users: list) -> set:
+    """
+    Get the ids of the users with an active enrollment in a course with a single query.
+
+    Args:
+        course_key (CourseKey): The course to check.
+        users (list): The users to check.
+
+    Returns:
+        set: The ids of the enrolled users.
+    """
+    return set(
+        student.CourseEnrollment.objects.filter(
+            course_id=course_key, user__in=users, is_active=True
+        ).values_list("user_id", flat=True)
+    )
+
+
+def lock_teams(team_pks) -> None:
+    """
+    Lock the rows of several teams until the end of the current transaction.
+
+    The rows are locked in primary key order, so the transactions that lock
+    several of the same teams wait for each other instead of deadlocking.
+
+    Args:
+        team_pks (iterable): Primary keys of the teams to lock.
+    """
+    # Evaluate the queryset to acquire the row locks
+    list(
+        teams_common.CourseTeam.objects.select_for_update()
+        .filter(pk__in=team_pks)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def reset_team_sizes(team_pks, active_team_pks=(), last_activity_at=None) -> list:
+    """
+    Recompute the `team_size` of several teams with one query and one bulk update.
+
+    Args:
+        team_pks (iterable): Primary keys of the teams to update.
+        active_team_pks (iterable, optional): Primary keys of the teams that
+            had new members, whose `last_activity_at` is updated too.
+        last_activity_at (datetime, optional): The last activity of the
+            `active_team_pks` teams.
+
+    Returns:
+        list: The updated teams.
+    """
+    active_team_pks = set(active_team_pks)
+    teams = list(
+        teams_common.CourseTeam.objects.filter(pk__in=team_pks).annotate(
+            membership_count=Count("membership")
+        )
+    )
+    for team in teams:
+        team.team_size = team.membership_count
+        if team.pk in active_team_pks:
+            team.last_activity_at = last_activity_at
+
+    teams_common.CourseTeam.objects.bulk_update(
+        teams, TEAM_ACTIVITY_FIELDS if active_team_pks else ["team_size"]
+    )
+    return teams
+
+
+def add_users_to_team(team, users: list, max_team_size: int = None) -> list:
+    """
+    Add several users to a team in a single transaction.
+
+    The memberships the users have in any team of the same teamset are removed
+    with one delete, and the new memberships are inserted with one bulk insert.
+    The callers are responsible for checking the users can join the team.
+
+    The rows of the team and of the teams the users leave are locked in primary
+    key order before counting the members, so concurrent requests that change
+    the same teams check and fill them one at a time without deadlocking each
+    other, while requests for other teams are not blocked.
+
+    The changes are the ones of `CourseTeam.add_user` for each user: the sizes
+    of the changed teams are updated, and the `last_activity_at` of the team.
+    The deleted memberships send their `pre_delete` and `post_delete` signals,
+    and `post_save` is sent for the created memberships and the updated teams,
+    so the platform receivers (e.g. the teams search index) see the changes.
+
+    Args:
+        team (CourseTeam): The team to add the users to.
+        users (list): The users to add.
+        max_team_size (int, optional): Maximum number of members of the team.
+
+    Raises:
+        TeamCapacityExceeded: If the team does not have enough space for the users.
+
+    Returns:
+        list: The created memberships, in the same order as the users. A user
+            given more than once (e.g. by username and by email) is added once.
+    """
+    users = list({user.id: user for user in users}.values())
+
+    with deferred_course_invalidation(team.course_id), transaction.atomic():
+        conflicting_memberships = teams_common.CourseTeamMembership.objects.filter(
+            user__in=users,
+            team__course_id=team.course_id,
+            team__topic_id=team.topic_id,
+        )
+        locked_team_pks = set()
+        while True:
+            conflicting_team_pks = list(
+                conflicting_memberships.values_list("team_id", flat=True)
+            )
+            affected_team_pks = set(conflicting_team_pks) | {team.pk}
+            if affected_team_pks <= locked_team_pks:
+                break
+            # The users may have moved to other teams while the first teams were locked
+            lock_teams(affected_team_pks - locked_team_pks)
+            locked_team_pks |= affected_team_pks
+
+        if max_team_size is not None:
+            member_ids = set(
+                teams_common.CourseTeamMembership.objects.filter(team=team).values_list("user_id", flat=True)
+            )
+            if len(member_ids - {user.id for user in users}) + len(users) > max_team_size:
+                raise TeamCapacityExceeded(
+                    f"The team_id={team.team_id!r} does not have enough space for the given users."
+                )
+
+        conflicting_memberships.delete()
+
+        now = timezone.now()
+        teams_common.CourseTeamMembership.objects.bulk_create(
+            [
+                teams_common.CourseTeamMembership(user=user, team=team, last_activity_at=now)
+                for user in users
+            ]
+        )
+        # Read the memberships back, as bulk inserts do not set the primary keys in every database
+        memberships_by_user_id = {
+            membership.user_id: membership
+            for membership in teams_common.CourseTeamMembership.objects.filter(
+                team=team, user__in=users
+            ).select_related("user", "team")
+        }
+        memberships = [memberships_by_user_id[user.id] for user in users]
+
+        teams = reset_team_sizes(affected_team_pks, {team.pk}, now)
+        send_post_save(teams_common.CourseTeamMembership, memberships, created=True)
+        send_post_save(teams_common.CourseTeam, teams, created=False, update_fields=TEAM_ACTIVITY_FIELDS)
+
+    moved_count = sum(1 for team_pk in conflicting_team_pks if team_pk != team.pk)
+    metrics.increment("memberships.added", len(users) - len(conflicting_team_pks))
+    metrics.increment("memberships.moved", moved_count)
+
+    return memberships
+
+
+def add_memberships(course_key, topic_id: str, memberships: list, max_team_size: int = None) -> dict:
+    """
+    Add users to teams of a topic in a single transaction, with a constant number of queries.
+
+    Unlike `add_users_to_team`, the users and teams are given by id and several
+    teams are filled at once. The callers are responsible for checking the users
+    can join the teams.
+
+    The teams are locked in primary key order, as in `add_users_to_team`, before
+    checking which users can still be added: the users that are already on a
+    team of the topic and, if a maximum team size is given, the users whose team
+    is full are skipped. The changes and signals are the ones of
+    `add_users_to_team`.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        memberships (list): `(team_pk, user_id)` pairs.
+        max_team_size (int, optional): Maximum number of members of the teams.
+
+    Returns:
+        dict: The ids of the skipped users, with the reason each one was skipped.
+    """
+    team_pks = {team_pk for team_pk, _ in memberships}
+
+    with deferred_course_invalidation(course_key), transaction.atomic():
+        lock_teams(team_pks)
+        skipped_user_ids = dict.fromkeys(
+            teams_common.CourseTeamMembership.objects.filter(
+                team__course_id=course_key,
+                team__topic_id=topic_id,
+                user_id__in=[user_id for _, user_id in memberships],
+            ).values_list("user_id", flat=True),
+            "The user is already on a team of the topic.",
+        )
+
+        team_sizes = dict(
+            teams_common.CourseTeamMembership.objects.filter(team_id__in=team_pks)
+            .values("team_id")
+            .annotate(team_size=Count("pk"))
+            .values_list("team_id", "team_size")
+            .order_by()
+        )
+        added_memberships = []
+        for team_pk, user_id in memberships:
+            if user_id in skipped_user_ids:
+                continue
+            if max_team_size is not None and team_sizes.get(team_pk, 0) >= max_team_size:
+                skipped_user_ids[user_id] = "The team is full."
+                continue
+            team_sizes[team_pk] = team_sizes.get(team_pk, 0) + 1
+            added_memberships.append((team_pk, user_id))
+
+        now = timezone.now()
+        teams_common.CourseTeamMembership.objects.bulk_create(
+            [
+                teams_common.CourseTeamMembership(user_id=user_id, team_id=team_pk, last_activity_at=now)
+                for team_pk, user_id in added_memberships
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+        created_memberships = list(
+            teams_common.CourseTeamMembership.objects.filter(
+                team_id__in=team_pks,
+                user_id__in=[user_id for _, user_id in added_memberships],
+            ).select_related("user", "team")
+        )
+
+        active_team_pks = {team_pk for team_pk, _ in added_memberships}
+        teams = reset_team_sizes(team_pks, active_team_pks, now)
+        send_post_save(teams_common.CourseTeamMembership, created_memberships, created=True)
+        send_post_save(
+            teams_common.CourseTeam,
+            [team for team in teams if team.pk in active_team_pks],
+            created=False,
+            update_fields=TEAM_ACTIVITY_FIELDS,
+        )
+
+    return skipped_user_ids
+
+
+def import_roster(job, requesting_user, course_key, rows: list) -> None:
+    """
+    Add the users of a roster to their teams, as a background job.
+
+    The rows are grouped by team and each team is filled in chunks, each one
+    validated and written in its own transaction with the same rules as the
+    team membership API. The progress and the errors of each row are recorded
+    in the job after every chunk.
+
+    Args:
+        job (Job): The job that runs the import.
+        requesting_user (User): The user that started the import.
+        course_key (CourseKey): The course of the teams.
+        rows (list): `(username, team_id)` pairs.
+    """
+    chunk_size = getattr(settings, "PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_CHUNK_SIZE", 500)
+
+    rows_by_team = defaultdict(list)
+    for row, (username, team_id) in enumerate(rows, start=1):
+        rows_by_team[team_id].append((row, username))
+
+    for team_id, team_rows in rows_by_team.items():
+        try:
+            team = get_team_to_join(requesting_user, team_id)
+            if str(team.course_id) != str(course_key):
+                raise MembershipError(f"The supplied {team_id=} does not exists.", reason="not_found")
+            max_team_size = get_max_team_size(team)
+        except MembershipError as error:
+            record_rejected_memberships(error, len(team_rows))
+            for row, username in team_rows:
+                job.add_error(row=row, username=username, team_id=team_id, error=error.message)
+            job.processed += len(team_rows)
+            job.save()
+            continue
+
+        for start in range(0, len(team_rows), chunk_size):
+            chunk = team_rows[start:start + chunk_size]
+            rows_by_username = defaultdict(list)
+            for row, username in chunk:
+                rows_by_username[username].append(row)
+
+            users_by_username = {}
+            failed_usernames = {}
+            for username, user, error in check_users_to_add(
+                requesting_user, team, list(rows_by_username)
+            ):
+                if error:
+                    failed_usernames[username] = error
+                else:
+                    users_by_username[username] = user
+
+            if users_by_username:
+                try:
+                    add_users_to_team(
+                        team, list(users_by_username.values()), max_team_size=max_team_size
+                    )
+                except MembershipError as error:
+                    failed_usernames.update(dict.fromkeys(users_by_username, error))
+
+            for username, error in failed_usernames.items():
+                record_rejected_memberships(error, len(rows_by_username.get(username, [])))
+                for row in rows_by_username.get(username, []):
+                    job.add_error(row=row, username=username, team_id=team_id, error=error.message)
+            job.processed += len(chunk)
+            job.save()
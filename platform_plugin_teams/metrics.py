@@ -0,0 +1,316 @@
+"""
+Operational metrics of the Teams plugin.
+
+The plugin counts events (e.g. the memberships added to the teams) and
+records durations (e.g. the latency of the endpoints) through the metrics
+backend set in `PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND`, the dotted path of one
+of the classes of this module or of any class with the same interface:
+
+* `InProcessMetricsBackend` (default): keeps the metrics in the memory of each
+  process, and renders them in the Prometheus text format for the metrics
+  endpoint. Each worker process has its own counters, which start from zero
+  when it starts, and the endpoint returns the ones of the worker that serves
+  the request. It suits a single process (e.g. a development server); with
+  several workers, use `StatsdMetricsBackend`, which aggregates the metrics of
+  every worker in the statsd server.
+* `StatsdMetricsBackend`: sends the metrics over UDP to the statsd server set
+  in `PLATFORM_PLUGIN_TEAMS_STATSD_HOST` and `PLATFORM_PLUGIN_TEAMS_STATSD_PORT`,
+  with the tags in the DogStatsD format.
+* `NullMetricsBackend`: drops the metrics.
+
+The names of the metrics are prefixed with `platform_plugin_teams`.
+"""
+import bisect
+import logging
+import socket
+import threading
+from contextlib import contextmanager
+from importlib import import_module
+from time import perf_counter
+
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+METRICS_PREFIX = "platform_plugin_teams"
+DEFAULT_METRICS_BACKEND = "platform_plugin_teams.metrics.InProcessMetricsBackend"
+# Upper bounds of the duration histograms, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Upper bounds of the number of teams of each course size, from the smallest
+COURSE_SIZES = ((1000, "small"), (10000, "medium"))
+LARGEST_COURSE_SIZE = "large"
+
+_backend = None
+_backend_path = None
+_backend_lock = threading.Lock()
+
+
+class NullMetricsBackend:
+    """
+    Metrics backend that drops the metrics.
+    """
+
+    def increment(self, name: str, value: int = 1, tags: dict = None) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (int, optional): The amount to add.
+            tags (dict, optional): The tags of the event.
+        """
+
+    def timing(self, name: str, seconds: float, tags: dict = None) -> None:
+        """
+        Record a duration.
+
+        Args:
+            name (str): The name of the duration histogram.
+            seconds (float): The duration, in seconds.
+            tags (dict, optional): The tags of the duration.
+        """
+
+
+class InProcessMetricsBackend(NullMetricsBackend):
+    """
+    Metrics backend that keeps the counters and the duration histograms in
+    the memory of the process.
+
+    The metrics are not shared between the worker processes of a server, so
+    each scrape of the metrics endpoint sees the metrics of a single worker.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(name: str, tags: dict) -> tuple:
+        return name, tuple(sorted((tags or {}).items()))
+
+    def increment(self, name: str, value: int = 1, tags: dict = None) -> None:
+        key = self._get_key(name, tags)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def timing(self, name: str, seconds: float, tags: dict = None) -> None:
+        key = self._get_key(name, tags)
+        bucket = bisect.bisect_left(DURATION_BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * (len(DURATION_BUCKETS) + 1), "sum": 0.0}
+            histogram["buckets"][bucket] += 1
+            histogram["sum"] += seconds
+
+    def get_counter(self, name: str, tags: dict = None) -> int:
+        """
+        Get the value of a counter.
+
+        Args:
+            name (str): The name of the counter.
+            tags (dict, optional): The tags of the counter.
+
+        Returns:
+            int: The value of the counter.
+        """
+        return self._counters.get(self._get_key(name, tags), 0)
+
+    def reset(self) -> None:
+        """Drop every metric."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The counters, as `<name>_total`, and the duration histograms,
+                as `<name>_seconds`.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, {"buckets": list(histogram["buckets"]), "sum": histogram["sum"]})
+                for key, histogram in self._histograms.items()
+            )
+
+        lines = []
+        declared = set()
+        for (name, tags), value in counters:
+            metric_name = f"{get_prometheus_name(name)}_total"
+            if metric_name not in declared:
+                declared.add(metric_name)
+                lines.append(f"# TYPE {metric_name} counter")
+            lines.append(f"{metric_name}{format_prometheus_labels(tags)} {value}")
+
+        for (name, tags), histogram in histograms:
+            metric_name = f"{get_prometheus_name(name)}_seconds"
+            if metric_name not in declared:
+                declared.add(metric_name)
+                lines.append(f"# TYPE {metric_name} histogram")
+            count = 0
+            for upper_bound, bucket_count in zip(DURATION_BUCKETS + ("+Inf",), histogram["buckets"]):
+                count += bucket_count
+                labels = format_prometheus_labels(tags + (("le", str(upper_bound)),))
+                lines.append(f"{metric_name}_bucket{labels} {count}")
+            lines.append(f"{metric_name}_sum{format_prometheus_labels(tags)} {histogram['sum']}")
+            lines.append(f"{metric_name}_count{format_prometheus_labels(tags)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class StatsdMetricsBackend(NullMetricsBackend):
+    """
+    Metrics backend that sends the metrics to a statsd server over UDP.
+
+    The tags are sent in the DogStatsD format (`|#key:value`), supported by the
+    Datadog agent, Telegraf and the Prometheus statsd exporter. The durations
+    are sent as timers, in milliseconds. Sending never blocks nor fails the
+    request: a metric that can not be sent is dropped.
+    """
+
+    def __init__(self):
+        host = getattr(settings, "PLATFORM_PLUGIN_TEAMS_STATSD_HOST", "localhost")
+        try:
+            # Resolve the host once, instead of on every metric sent
+            host = socket.gethostbyname(host)
+        except OSError as error:
+            log.warning("Could not resolve the statsd host %s: %s", host, error)
+        self.address = (host, getattr(settings, "PLATFORM_PLUGIN_TEAMS_STATSD_PORT", 8125))
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def _send(self, name: str, value: str, metric_type: str, tags: dict) -> None:
+        """
+        Send a metric to the statsd server, as a `<prefix>.<name>:<value>|<type>|#<tags>` line.
+
+        Args:
+            name (str): The name of the metric.
+            value (str): The formatted value of the metric.
+            metric_type (str): The statsd type of the metric, e.g. `c` or `ms`.
+            tags (dict): The tags of the metric, if any.
+        """
+        line = f"{METRICS_PREFIX}.{name}:{value}|{metric_type}"
+        if tags:
+            line += "|#" + ",".join(f"{key}:{tag_value}" for key, tag_value in sorted(tags.items()))
+        try:
+            self._socket.sendto(line.encode("utf-8"), self.address)
+        except OSError as error:
+            log.debug("Could not send the %s metric to statsd: %s", name, error)
+
+    def increment(self, name: str, value: int = 1, tags: dict = None) -> None:
+        self._send(name, str(value), "c", tags)
+
+    def timing(self, name: str, seconds: float, tags: dict = None) -> None:
+        self._send(name, f"{seconds * 1000:.3f}", "ms", tags)
+
+
+def get_prometheus_name(name: str) -> str:
+    """
+    Build the Prometheus name of a metric.
+
+    e.g. `memberships.added` -> `platform_plugin_teams_memberships_added`
+    """
+    return f"{METRICS_PREFIX}_{name}".replace(".", "_")
+
+
+def format_prometheus_labels(tags: tuple) -> str:
+    """
+    Format the labels of a Prometheus sample.
+
+    e.g. `(("reason", "capacity"),)` -> `{reason="capacity"}`
+    """
+    if not tags:
+        return ""
+
+    labels = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in tags
+    )
+    return f"{{{labels}}}"
+
+
+def get_metrics_backend():
+    """
+    Get the metrics backend set in `PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND`.
+
+    The backend is built once, and again only when the setting changes.
+
+    Returns:
+        NullMetricsBackend: The metrics backend.
+    """
+    global _backend, _backend_path  # pylint: disable=global-statement
+
+    backend_path = getattr(settings, "PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND", None) or DEFAULT_METRICS_BACKEND
+    if backend_path != _backend_path:
+        with _backend_lock:
+            if backend_path != _backend_path:
+                module_name, class_name = backend_path.rsplit(".", 1)
+                _backend = getattr(import_module(module_name), class_name)()
+                _backend_path = backend_path
+
+    return _backend
+
+
+def increment(name: str, value: int = 1, tags: dict = None) -> None:
+    """
+    Add to a counter of the metrics backend.
+
+    Args:
+        name (str): The name of the counter.
+        value (int, optional): The amount to add. Nothing is recorded if it is 0.
+        tags (dict, optional): The tags of the event.
+    """
+    if value:
+        get_metrics_backend().increment(name, value, tags)
+
+
+def timing(name: str, seconds: float, tags: dict = None) -> None:
+    """
+    Record a duration in the metrics backend.
+
+    Args:
+        name (str): The name of the duration histogram.
+        seconds (float): The duration, in seconds.
+        tags (dict, optional): The tags of the duration.
+    """
+    get_metrics_backend().timing(name, seconds, tags)
+
+
+@contextmanager
+def timer(name: str, tags: dict = None):
+    """
+    Record the duration of a block in the metrics backend.
+
+    Args:
+        name (str): The name of the duration histogram.
+        tags (dict, optional): The tags of the duration. The block can add
+            tags to the dictionary, e.g. once it knows the size of the course.
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timing(name, perf_counter() - start, tags)
+
+
+def get_course_size(team_count: int) -> str:
+    """
+    Get the size of a course, to tag the metrics of its requests.
+
+    Args:
+        team_count (int): The number of teams of the course.
+
+    Returns:
+        str: `small` (less than 1,000 teams), `medium` (less than 10,000 teams)
+            or `large`.
+    """
+    for max_team_count, size in COURSE_SIZES:
+        if team_count < max_team_count:
+            return size
+
+    return LARGEST_COURSE_SIZE
@@ -0,0 +1,253 @@
+"""
+On-demand profiling of single requests to the Teams plugin.
+
+When `PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED` is set, the global staff can run
+a request to the plugin views under a profiler by sending the
+`X-Platform-Plugin-Teams-Profile` header or the `profile` query parameter. The
+profile, with the functions that took the most cumulative time and the SQL
+statements run with their durations, is stored in the Django cache and its id
+is returned in the `X-Platform-Plugin-Teams-Profile` response header, so it can
+be read from any process sharing the cache.
+
+The SQL parameters are not stored, as they can hold personal data.
+"""
+import cProfile
+import logging
+import pstats
+import time
+from contextlib import ExitStack
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+log = logging.getLogger(__name__)
+
+PROFILE_CACHE_KEY = "platform_plugin_teams.profile.{profile_id}"
+PROFILE_CACHE_TIMEOUT = 60 * 60 * 24
+PROFILE_HEADER = "X-Platform-Plugin-Teams-Profile"
+PROFILE_QUERY_PARAMETER = "profile"
+MAX_PROFILE_FUNCTIONS = 50
+MAX_PROFILE_QUERIES = 500
+LOGGED_PROFILE_FUNCTIONS = 10
+
+
+def is_profile_requested(request) -> bool:
+    """
+    Whether the request asks to be profiled.
+
+    Args:
+        request (Request): The request to the plugin view.
+    """
+    return bool(request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAMETER))
+
+
+def can_profile(user) -> bool:
+    """
+    Whether a user can profile the requests.
+
+    Only the global staff can, as the profiles show the SQL statements run for
+    every course.
+
+    Args:
+        user (User): The user of the request.
+    """
+    return getattr(settings, "PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED", False) and user.is_staff
+
+
+class RequestProfile:
+    """
+    Profile of a request.
+
+    Attributes:
+        profile_id (str): Unique identifier of the profile.
+        user_id (int): The user that made the request.
+        course_id (str): The course of the request.
+        view (str): The name of the view that served the request.
+        method (str): The HTTP method of the request.
+        path (str): The path of the request.
+        status_code (int): The status code of the response.
+        duration_ms (float): The time spent in the view, in milliseconds.
+        functions (list[dict]): The functions that took the most cumulative time.
+        query_count (int): The number of SQL statements run.
+        query_ms (float): The time spent running SQL statements, in milliseconds.
+        queries (list[dict]): The first SQL statements run, with their durations.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        profile_id: str,
+        user_id: int,
+        course_id: str,
+        view: str,
+        method: str,
+        path: str,
+        status_code: int = None,
+        duration_ms: float = 0,
+        functions: list = None,
+        query_count: int = 0,
+        query_ms: float = 0,
+        queries: list = None,
+    ):
+        self.profile_id = profile_id
+        self.user_id = user_id
+        self.course_id = course_id
+        self.view = view
+        self.method = method
+        self.path = path
+        self.status_code = status_code
+        self.duration_ms = duration_ms
+        self.functions = functions or []
+        self.query_count = query_count
+        self.query_ms = query_ms
+        self.queries = queries or []
+
+    @classmethod
+    def get(cls, profile_id: str):
+        """
+        Get a profile by its id.
+
+        Args:
+            profile_id (str): The id of the profile.
+
+        Returns:
+            RequestProfile: The profile, or None if it does not exist or has expired.
+        """
+        data = cache.get(PROFILE_CACHE_KEY.format(profile_id=profile_id))
+        if data is None:
+            return None
+
+        return cls(**data)
+
+    def save(self) -> None:
+        """Store the profile."""
+        cache.set(PROFILE_CACHE_KEY.format(profile_id=self.profile_id), self.to_dict(), PROFILE_CACHE_TIMEOUT)
+
+    def to_dict(self) -> dict:
+        """Get the representation of the profile."""
+        return {
+            "profile_id": self.profile_id,
+            "user_id": self.user_id,
+            "course_id": self.course_id,
+            "view": self.view,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "functions": self.functions,
+            "query_count": self.query_count,
+            "query_ms": self.query_ms,
+            "queries": self.queries,
+        }
+
+
+class RequestProfiler:
+    """
+    Profile the code and the SQL statements run in the current thread between
+    `start` and `stop`.
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries = []
+        self.query_count = 0
+        self.query_time = 0.0
+        self.start_time = None
+        self.duration = 0.0
+        self._exit_stack = ExitStack()
+
+    def _record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper that records each SQL statement and its duration."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.query_time += duration
+            if len(self.queries) < MAX_PROFILE_QUERIES:
+                self.queries.append({"sql": sql, "many": many, "duration_ms": round(duration * 1000, 3)})
+
+    def start(self) -> None:
+        """
+        Start profiling.
+
+        Raises:
+            ValueError: If another profiler is active in the thread.
+        """
+        self.profiler.enable()
+        for connection in connections.all():
+            self._exit_stack.enter_context(connection.execute_wrapper(self._record_query))
+        self.start_time = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self.start_time
+        self._exit_stack.close()
+
+    def get_functions(self) -> list:
+        """
+        Get the functions that took the most cumulative time.
+
+        Returns:
+            list[dict]: The first `MAX_PROFILE_FUNCTIONS` functions, by cumulative time.
+        """
+        stats = pstats.Stats(self.profiler).stats
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": pstats.func_std_string(function),
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "total_ms": round(total_time * 1000, 3),
+                "cumulative_ms": round(cumulative_time * 1000, 3),
+            }
+            for function, (primitive_calls, calls, total_time, cumulative_time, _callers)
+            in functions[:MAX_PROFILE_FUNCTIONS]
+        ]
+
+    def save(self, request, view, response, course_id: str = None) -> RequestProfile:
+        """
+        Store the profile of a request and log its summary.
+
+        Args:
+            request (Request): The profiled request.
+            view (APIView): The view that served the request.
+            response (Response): The response of the view.
+            course_id (str, optional): The course of the request.
+
+        Returns:
+            RequestProfile: The stored profile.
+        """
+        profile = RequestProfile(
+            profile_id=uuid4().hex,
+            user_id=request.user.id,
+            course_id=course_id,
+            view=type(view).__name__,
+            method=request.method,
+            path=request.path,
+            status_code=response.status_code,
+            duration_ms=round(self.duration * 1000, 1),
+            functions=self.get_functions(),
+            query_count=self.query_count,
+            query_ms=round(self.query_time * 1000, 1),
+            queries=self.queries,
+        )
+        profile.save()
+
+        log.info(
+            "Profiled %s %s in %.1f ms, %s queries in %.1f ms (profile %s). Top functions: %s",
+            profile.method,
+            profile.path,
+            profile.duration_ms,
+            profile.query_count,
+            profile.query_ms,
+            profile.profile_id,
+            ", ".join(
+                f"{function['function']} {function['cumulative_ms']} ms"
+                for function in profile.functions[:LOGGED_PROFILE_FUNCTIONS]
+            ),
+        )
+        return profile
@@ -0,0 +1,216 @@
+"""
+Team rebalancing for the Teams plugin.
+
+Moves members between the teams of a topic until every team is within a target
+size range, with the minimum number of moves: every team above the range gives
+away exactly its surplus and every team below the range receives exactly its
+deficit. When one side is larger than the other, the rest of the moves go to the
+smallest teams or come from the largest ones that are already within the range,
+so they stay even.
+"""
+import heapq
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from platform_plugin_teams.cache import deferred_course_invalidation
+from platform_plugin_teams.edxapp_wrapper import teams_common
+from platform_plugin_teams.memberships import TEAM_ACTIVITY_FIELDS, lock_teams, reset_team_sizes
+from platform_plugin_teams.topics import get_topic_teams
+from platform_plugin_teams.utils import send_post_save
+
+Move = namedtuple("Move", ["membership_pk", "username", "from_team_id", "to_team_id", "to_team_pk"])
+Move.__doc__ = """
+A member to move to another team of the topic.
+"""
+
+
+class RebalanceError(Exception):
+    """
+    The teams of a topic can not be rebalanced to the target size range.
+    """
+
+
+def get_rebalance_transfers(team_sizes: list, min_size: int, max_size: int) -> list:
+    """
+    Get the minimum transfers of members between teams to bring them within a size range.
+
+    Args:
+        team_sizes (list): The current size of each team.
+        min_size (int): The minimum team size.
+        max_size (int): The maximum team size.
+
+    Raises:
+        RebalanceError: If the members do not fit in the teams within the range.
+
+    Returns:
+        list: `(from_index, to_index, count)` transfers between the teams, as
+            indexes of `team_sizes`.
+    """
+    member_count = sum(team_sizes)
+    if min_size > max_size or not len(team_sizes) * min_size <= member_count <= len(team_sizes) * max_size:
+        raise RebalanceError(
+            f"The {member_count} members of the {len(team_sizes)} teams can not fit "
+            f"in teams of {min_size} to {max_size} members."
+        )
+
+    surplus = {index: size - max_size for index, size in enumerate(team_sizes) if size > max_size}
+    deficit = {index: min_size - size for index, size in enumerate(team_sizes) if size < min_size}
+    extra = sum(surplus.values()) - sum(deficit.values())
+
+    if extra > 0:
+        # Give the rest of the surplus to the smallest teams that have room
+        receivers = [
+            (max(size, min_size), index)
+            for index, size in enumerate(team_sizes)
+            if size < max_size
+        ]
+        heapq.heapify(receivers)
+        for _ in range(extra):
+            size, index = heapq.heappop(receivers)
+            deficit[index] = deficit.get(index, 0) + 1
+            if size + 1 < max_size:
+                heapq.heappush(receivers, (size + 1, index))
+    elif extra < 0:
+        # Take the rest of the deficit from the largest teams above the minimum
+        donors = [
+            (-min(size, max_size), index)
+            for index, size in enumerate(team_sizes)
+            if size > min_size
+        ]
+        heapq.heapify(donors)
+        for _ in range(-extra):
+            size, index = heapq.heappop(donors)
+            surplus[index] = surplus.get(index, 0) + 1
+            if -size - 1 > min_size:
+                heapq.heappush(donors, (size + 1, index))
+
+    transfers = []
+    receivers = list(deficit.items())
+    receiver = 0
+    for from_index, count in surplus.items():
+        while count:
+            to_index, needed = receivers[receiver]
+            moved = min(count, needed)
+            transfers.append((from_index, to_index, moved))
+            count -= moved
+            if moved == needed:
+                receiver += 1
+            else:
+                receivers[receiver] = (to_index, needed - moved)
+
+    return transfers
+
+
+def plan_rebalance(course_key, topic_id: str, min_size: int = None, max_size: int = None) -> list:
+    """
+    Plan the moves of members between the teams of a topic to bring them within a size range.
+
+    The most recently joined members of each team are the ones moved.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        min_size (int, optional): The minimum team size. Defaults to the average
+            team size, rounded down.
+        max_size (int, optional): The maximum team size. Defaults to the average
+            team size, rounded up.
+
+    Raises:
+        RebalanceError: If the teams can not be rebalanced.
+
+    Returns:
+        list[Move]: The moves.
+    """
+    teams = list(
+        teams_common.CourseTeam.objects.filter(course_id=course_key, topic_id=topic_id)
+        .annotate(membership_count=Count("membership"))
+        .order_by("pk")
+        .values_list("pk", "team_id", "membership_count")
+    )
+    if not teams:
+        raise RebalanceError("The topic has no teams.")
+
+    member_count = sum(team[2] for team in teams)
+    if min_size is None:
+        min_size = member_count // len(teams)
+    if max_size is None:
+        max_size = -(-member_count // len(teams))
+
+    transfers = get_rebalance_transfers([team[2] for team in teams], min_size, max_size)
+    moved_counts = {}
+    for from_index, _, count in transfers:
+        moved_counts[teams[from_index][0]] = moved_counts.get(teams[from_index][0], 0) + count
+
+    memberships_by_team = {}
+    for membership in (
+        teams_common.CourseTeamMembership.objects.filter(team_id__in=list(moved_counts))
+        .order_by("team_id", "-date_joined", "-pk")
+        .values_list("pk", "team_id", "user__username")
+    ):
+        team_memberships = memberships_by_team.setdefault(membership[1], [])
+        if len(team_memberships) < moved_counts[membership[1]]:
+            team_memberships.append(membership)
+
+    moves = []
+    for from_index, to_index, count in transfers:
+        from_team_pk, from_team_id, _ = teams[from_index]
+        to_team_pk, to_team_id, _ = teams[to_index]
+        for membership_pk, _, username in memberships_by_team[from_team_pk][:count]:
+            moves.append(Move(membership_pk, username, from_team_id, to_team_id, to_team_pk))
+        del memberships_by_team[from_team_pk][:count]
+
+    return moves
+
+
+def rebalance_teams(course_key, topic_id: str, min_size: int = None, max_size: int = None) -> list:
+    """
+    Move members between the teams of a topic to bring them within a size range.
+
+    The teams of the topic are locked in primary key order, as the membership
+    changes lock them, while the moves are planned and applied, so concurrent
+    membership changes do not invalidate the plan. The moves are applied with a
+    single bulk update, and `post_save` is sent for the moved memberships and
+    the changed teams. The teams that received members have their
+    `last_activity_at` updated, and the moved memberships keep their
+    `date_joined`.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        min_size (int, optional): The minimum team size.
+        max_size (int, optional): The maximum team size.
+
+    Raises:
+        RebalanceError: If the teams can not be rebalanced.
+
+    Returns:
+        list[Move]: The applied moves.
+    """
+    with deferred_course_invalidation(course_key), transaction.atomic():
+        team_pks = list(get_topic_teams(course_key, topic_id).values_list("pk", flat=True))
+        lock_teams(team_pks)
+        moves = plan_rebalance(course_key, topic_id, min_size, max_size)
+
+        memberships = teams_common.CourseTeamMembership.objects.select_related("user").in_bulk(
+            [move.membership_pk for move in moves]
+        )
+        for move in moves:
+            memberships[move.membership_pk].team_id = move.to_team_pk
+        teams_common.CourseTeamMembership.objects.bulk_update(list(memberships.values()), ["team"])
+
+        teams = reset_team_sizes(team_pks, {move.to_team_pk for move in moves}, timezone.now())
+        moved_team_ids = {move.from_team_id for move in moves} | {move.to_team_id for move in moves}
+        send_post_save(
+            teams_common.CourseTeamMembership, list(memberships.values()), created=False, update_fields=["team"]
+        )
+        send_post_save(
+            teams_common.CourseTeam,
+            [team for team in teams if team.team_id in moved_team_ids],
+            created=False,
+            update_fields=TEAM_ACTIVITY_FIELDS,
+        )
+
+    return moves
@@ -0,0 +1,113 @@
+"""
+Fast JSON rendering for the Teams plugin.
+
+The topics of large courses are rendered into responses of several megabytes,
+mostly made of the nested teams of each topic. When
+`PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER` is set and the optional `orjson`
+package is installed, the plugin views render their JSON responses with
+`orjson` instead of the standard library encoder.
+
+The rendered JSON has the same values as the one of the DRF `JSONRenderer`:
+the types `orjson` does not handle the same way (e.g. dates, decimals and
+lazy translations) are converted by the DRF encoder, and the cases the fast
+path can not reproduce (indented or ASCII-only output, non string keys, and
+floats, as `orjson` formats some of them differently, e.g. `1e16` instead of
+`1e+16`, and renders NaN as `null`) are rendered by the DRF renderer.
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = 0
+if orjson is not None:
+    # Let the DRF encoder format the dates, as orjson formats them differently
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def is_fast_json_enabled() -> bool:
+    """Whether the plugin views render their JSON responses with `FastJSONRenderer`."""
+    return orjson is not None and getattr(settings, "PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER", False)
+
+
+def contains_float(data) -> bool:
+    """
+    Whether the data has a float in any of its nested lists, tuples or dict values.
+
+    Args:
+        data: The data to render.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that renders with `orjson`, falling back to the DRF
+    renderer when `orjson` can not produce the same JSON.
+    """
+
+    def __init__(self):
+        self.encoder = self.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # orjson formats some floats differently, e.g. `1e16` instead of `1e+16`
+        if contains_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            rendered = orjson.dumps(data, default=self.encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. non string keys or integers larger than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # As the DRF renderer, escape the line terminators JavaScript does not allow in strings
+        return rendered.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+class FastJSONRendererMixin:
+    """
+    Render the JSON responses of an API view with `FastJSONRenderer`, when
+    `PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER` is set.
+
+    Only the DRF `JSONRenderer` is replaced, the other renderers of the view
+    (e.g. the browsable API) are kept.
+    """
+
+    def get_renderers(self):
+        """Get the renderers of the view, with the fast JSON renderer if it is enabled."""
+        renderers = super().get_renderers()
+        if not is_fast_json_enabled():
+            return renderers
+
+        return [
+            FastJSONRenderer() if type(renderer) is JSONRenderer else renderer  # pylint: disable=unidiomatic-typecheck
+            for renderer in renderers
+        ]
@@ -36,3 +36,19 @@ def plugin_settings(settings):
     settings.PLATFORM_PLUGIN_TEAMS_CONTENTSTORE_BACKEND = (
         "platform_plugin_teams.edxapp_wrapper.backends.contentstore_p_v1"
     )
+    settings.PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_SIZE = 128
+    settings.PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_TIMEOUT = 300
+    settings.PLATFORM_PLUGIN_TEAMS_JOB_WORKERS = 2
+    settings.PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_CHUNK_SIZE = 500
+    settings.PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS = 50000
+    settings.PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD = 500
+    settings.PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE = 500
+    settings.PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT = 10000
+    settings.PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE = 0
+    settings.PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED = False
+    settings.PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND = "platform_plugin_teams.metrics.InProcessMetricsBackend"
+    settings.PLATFORM_PLUGIN_TEAMS_STATSD_HOST = "localhost"
+    settings.PLATFORM_PLUGIN_TEAMS_STATSD_PORT = 8125
+    settings.PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER = False
+    settings.PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE = 1000
+    settings.PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES = 50
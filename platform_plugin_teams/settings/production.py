@@ -56,3 +56,99 @@ def plugin_settings(settings):
         "PLATFORM_PLUGIN_TEAMS_CONTENTSTORE_BACKEND",
         settings.PLATFORM_PLUGIN_TEAMS_CONTENTSTORE_BACKEND,
     )
+    settings.PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_SIZE = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_SIZE",
+        settings.PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_SIZE,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_TIMEOUT = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_TIMEOUT",
+        settings.PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_TIMEOUT,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_JOB_WORKERS = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_JOB_WORKERS",
+        settings.PLATFORM_PLUGIN_TEAMS_JOB_WORKERS,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_CHUNK_SIZE = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_CHUNK_SIZE",
+        settings.PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_CHUNK_SIZE,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS",
+        settings.PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD",
+        settings.PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE",
+        settings.PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT",
+        settings.PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE",
+        settings.PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED",
+        settings.PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND",
+        settings.PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_STATSD_HOST = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_STATSD_HOST",
+        settings.PLATFORM_PLUGIN_TEAMS_STATSD_HOST,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_STATSD_PORT = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_STATSD_PORT",
+        settings.PLATFORM_PLUGIN_TEAMS_STATSD_PORT,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER",
+        settings.PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE",
+        settings.PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE,
+    )
+    settings.PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES = getattr(
+        settings, "ENV_TOKENS", {}
+    ).get(
+        "PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES",
+        settings.PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES,
+    )
@@ -0,0 +1,48 @@
+"""
+Signal handlers for the Teams plugin.
+"""
+from platform_plugin_teams.cache import invalidate_course, is_invalidation_deferred, request_cached
+from platform_plugin_teams.edxapp_wrapper import teams_common
+from platform_plugin_teams.edxapp_wrapper.registry import BACKEND_SETTINGS, backends
+
+
+def invalidate_course_team_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached topics of the course of a saved or deleted team.
+    """
+    if is_invalidation_deferred():
+        return
+
+    invalidate_course(instance.course_id)
+
+
+def invalidate_course_team_membership_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached topics of the course of a saved or deleted membership.
+
+    Bulk deletes send this signal for every membership without their team
+    loaded, so the course of each team is looked up once per request.
+    """
+    if is_invalidation_deferred():
+        return
+
+    if sender.team.is_cached(instance):
+        invalidate_course(instance.team.course_id)
+    else:
+        invalidate_course(get_team_course_id(instance.team_id))
+
+
+@request_cached
+def get_team_course_id(team_pk):
+    """
+    Get the course id of a team.
+    """
+    return teams_common.CourseTeam.objects.filter(pk=team_pk).values_list("course_id", flat=True).first()
+
+
+def reset_edxapp_backend(sender, setting, **kwargs):  # pylint: disable=unused-argument
+    """
+    Resolve an edxapp backend again when its setting changes, e.g. in tests.
+    """
+    if setting in BACKEND_SETTINGS:
+        backends.reset(setting)
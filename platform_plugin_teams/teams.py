@@ -0,0 +1,132 @@
+"""
+Bulk team operations for the Teams plugin.
+
+Teams are built with the platform `CourseTeam.create`, so their ids are
+generated as the platform does, and inserted with bulk inserts instead of one
+save per team.
+"""
+import math
+import re
+
+from django.db import transaction
+
+from platform_plugin_teams.cache import deferred_course_invalidation
+from platform_plugin_teams.edxapp_wrapper import student, teams_common, teams_lms
+from platform_plugin_teams.utils import send_post_save
+
+BULK_CREATE_BATCH_SIZE = 500
+
+
+def get_generated_team_names(course_key, topic_id: str, count: int, name_prefix: str) -> list:
+    """
+    Get the names of a number of generated teams of a topic, e.g. `Team 1`...`Team N`.
+
+    The numbering continues after the highest number already used by the teams
+    of the topic with the same prefix, so generating teams twice does not
+    repeat names.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        count (int): The number of names.
+        name_prefix (str): The prefix of the names.
+
+    Returns:
+        list: The names of the teams.
+    """
+    name_pattern = re.compile(rf"^{re.escape(name_prefix)} (\d+)$")
+    existing_names = teams_common.CourseTeam.objects.filter(
+        course_id=course_key, topic_id=topic_id, name__startswith=name_prefix
+    ).values_list("name", flat=True)
+    last_number = max(
+        (int(match.group(1)) for name in existing_names if (match := name_pattern.match(name))),
+        default=0,
+    )
+
+    return [f"{name_prefix} {number}" for number in range(last_number + 1, last_number + count + 1)]
+
+
+def get_missing_team_count(course_key, topic_id: str, max_team_size: int) -> int:
+    """
+    Get the number of teams a topic needs to fit every enrolled learner of a course.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        max_team_size (int): The maximum size of the teams of the topic.
+
+    Returns:
+        int: The number of teams to add to the existing teams of the topic.
+    """
+    enrolled_count = student.CourseEnrollment.objects.filter(course_id=course_key, is_active=True).count()
+    team_count = teams_common.CourseTeam.objects.filter(course_id=course_key, topic_id=topic_id).count()
+    return max(0, math.ceil(enrolled_count / max_team_size) - team_count)
+
+
+def get_teams_data_errors(course_key, topic_id: str, teams_data: list) -> dict:
+    """
+    Validate the teams to create with the rules of the platform teams API.
+
+    Each team is checked with the platform team creation serializer, so e.g. a
+    too long description or an unknown country or language is rejected as the
+    platform rejects it.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        teams_data (list): Dicts with the fields of each team.
+
+    Returns:
+        dict: The field errors of each invalid team, by its index in `teams_data`.
+    """
+    errors = {}
+    for index, team_data in enumerate(teams_data):
+        serializer = teams_lms.CourseTeamCreationSerializer(
+            data={**team_data, "course_id": str(course_key), "topic_id": topic_id}
+        )
+        if not serializer.is_valid():
+            errors[str(index)] = serializer.errors
+
+    return errors
+
+
+def create_teams(course_key, topic_id: str, teams_data: list) -> list:
+    """
+    Create several teams of a topic in a single transaction.
+
+    The teams are inserted with bulk inserts and read back with one query, so
+    they have their primary keys in every database. Since bulk inserts do not
+    send model signals, `post_save` is sent for each team, so the platform
+    receivers (e.g. the teams search index) still see them.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        teams_data (list): Dicts with the `name`, and optionally the `description`,
+            `country`, `language` and `organization_protected` of each team.
+
+    Returns:
+        list: The created teams, in the same order as `teams_data`.
+    """
+    teams = [
+        teams_common.CourseTeam.create(
+            name=team_data["name"],
+            course_id=course_key,
+            description=team_data.get("description", ""),
+            topic_id=topic_id,
+            country=team_data.get("country", ""),
+            language=team_data.get("language", ""),
+            organization_protected=team_data.get("organization_protected", False),
+        )
+        for team_data in teams_data
+    ]
+
+    with deferred_course_invalidation(course_key), transaction.atomic():
+        teams_common.CourseTeam.objects.bulk_create(teams, batch_size=BULK_CREATE_BATCH_SIZE)
+        teams_by_team_id = teams_common.CourseTeam.objects.in_bulk(
+            [team.team_id for team in teams], field_name="team_id"
+        )
+        teams = [teams_by_team_id[team.team_id] for team in teams]
+        send_post_save(teams_common.CourseTeam, teams, created=True)
+
+    return teams
@@ -0,0 +1,175 @@
+"""
+Bulk topic (teamset) operations for the Teams plugin.
+
+Batches of topic changes are validated and applied to the teams configuration
+of a course together, so they can be stored with a single course write.
+
+Removing a topic from a course removes its teams and their memberships. These
+functions do it with a constant number of queries per call, scoped to the
+course, instead of deleting each team and its memberships one by one.
+"""
+from copy import deepcopy
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import transaction
+
+from platform_plugin_teams.cache import deferred_course_invalidation
+from platform_plugin_teams.edxapp_wrapper import teams_common, teams_config
+
+CREATE_OPERATION = "create"
+UPDATE_OPERATION = "update"
+DELETE_OPERATION = "delete"
+TOPIC_OPERATIONS = (CREATE_OPERATION, UPDATE_OPERATION, DELETE_OPERATION)
+TOPIC_FIELDS = ("name", "description", "type", "max_team_size")
+
+
+def apply_topic_operations(team_sets: list, operations: list) -> tuple:
+    """
+    Apply a batch of create, update and delete operations to the topics of a course.
+
+    The operations are validated in order, each one against the topics left by
+    the previous ones, so e.g. a topic can be renamed and its old name reused in
+    the same batch. The given topics are not modified.
+
+    Args:
+        team_sets (list): The current topics of the course.
+        operations (list): Dicts with the `op` to apply (`create`, `update` or
+            `delete`), the `id` of the topic to update or delete, and the topic
+            fields to set.
+
+    Returns:
+        tuple: The updated topics, the ids of the deleted topics, and a dict with
+            the field errors of each invalid operation, or None if all of them
+            are valid.
+    """
+    valid_team_types = [team_type.value for team_type in teams_config.TeamsetType]
+    team_sets = deepcopy(team_sets)
+    deleted_topic_ids = []
+    errors = []
+
+    for operation in operations:
+        if not isinstance(operation, dict):
+            errors.append({"op": "Each operation must be an object."})
+            continue
+
+        operation_errors = {}
+        op = operation.get("op")
+        topic = None
+        if op not in TOPIC_OPERATIONS:
+            operation_errors["op"] = f"The [op] field must be one of {list(TOPIC_OPERATIONS)}."
+        elif op != CREATE_OPERATION:
+            topic_id = operation.get("id")
+            topic = next((topic for topic in team_sets if topic["id"] == topic_id), None)
+            if topic is None:
+                operation_errors["id"] = f"The supplied {topic_id=} is not found."
+
+        fields = {field: operation[field] for field in TOPIC_FIELDS if field in operation}
+        if op == CREATE_OPERATION or (op == UPDATE_OPERATION and "type" in fields):
+            if fields.get("type") not in valid_team_types:
+                operation_errors["type"] = f"The [type] field must be one of {valid_team_types}."
+
+        if op == CREATE_OPERATION or (op == UPDATE_OPERATION and "name" in fields):
+            name = fields.get("name")
+            if not isinstance(name, str) or not name.strip():
+                operation_errors["name"] = "The [name] field is required."
+            elif any(
+                other["name"] == name.strip() for other in team_sets if other is not topic
+            ):
+                operation_errors["name"] = f"The topic with name={name.strip()!r} already exists."
+            else:
+                fields["name"] = name.strip()
+
+        max_team_size = fields.get("max_team_size")
+        if max_team_size is not None and (
+            isinstance(max_team_size, bool) or not isinstance(max_team_size, int) or max_team_size < 1
+        ):
+            operation_errors["max_team_size"] = "The [max_team_size] field must be a positive integer or null."
+
+        errors.append(operation_errors)
+        if operation_errors:
+            continue
+
+        if op == CREATE_OPERATION:
+            team_sets.append({**fields, "id": str(uuid4())})
+        elif op == UPDATE_OPERATION:
+            topic.update(fields)
+        else:
+            team_sets.remove(topic)
+            deleted_topic_ids.append(topic["id"])
+
+    if any(errors):
+        return team_sets, deleted_topic_ids, {
+            str(index): operation_errors
+            for index, operation_errors in enumerate(errors)
+            if operation_errors
+        }
+
+    return team_sets, deleted_topic_ids, None
+
+
+def get_topic_teams(course_key, topic_id: str):
+    """
+    Get the teams of a topic of a course.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+
+    Returns:
+        QuerySet: The teams of the topic.
+    """
+    return teams_common.CourseTeam.objects.filter(course_id=course_key, topic_id=topic_id)
+
+
+def delete_topic_teams(course_key, topic_id: str, team_pks: list = None) -> None:
+    """
+    Delete the teams of a topic of a course and their memberships in a single transaction.
+
+    The memberships and then the teams are deleted through the ORM, with
+    querysets scoped to the course, so the platform receivers of their delete
+    signals (e.g. the teams search index) still run. The plugin caches of the
+    course are invalidated once, when the transaction ends.
+
+    Args:
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+        team_pks (list, optional): Delete only the teams with these primary keys.
+    """
+    teams = get_topic_teams(course_key, topic_id)
+    memberships = teams_common.CourseTeamMembership.objects.filter(
+        team__course_id=course_key, team__topic_id=topic_id
+    )
+    if team_pks is not None:
+        teams = teams.filter(pk__in=team_pks)
+        memberships = memberships.filter(team_id__in=team_pks)
+
+    with deferred_course_invalidation(course_key), transaction.atomic():
+        memberships.delete()
+        teams.delete()
+
+
+def delete_topic_teams_job(job, course_key, topic_id: str) -> None:
+    """
+    Delete the teams of a topic of a course and their memberships, as a background job.
+
+    The teams are deleted in chunks of `PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE`
+    teams, each one in its own transaction, so the rows are not locked for the
+    whole operation. The progress is recorded in the job after every chunk.
+
+    Args:
+        job (Job): The job that runs the deletion.
+        course_key (CourseKey): The course of the topic.
+        topic_id (str): The id of the topic.
+    """
+    chunk_size = getattr(settings, "PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE", 500)
+
+    team_pks = list(get_topic_teams(course_key, topic_id).values_list("pk", flat=True))
+    job.total = len(team_pks)
+    job.save()
+
+    for start in range(0, len(team_pks), chunk_size):
+        chunk = team_pks[start:start + chunk_size]
+        delete_topic_teams(course_key, topic_id, chunk)
+        job.processed += len(chunk)
+        job.save()
@@ -1,4 +1,9 @@
 """Utils for the Teams plugin."""
+import hashlib
+import json
+
+from django.db import router
+from django.db.models.signals import post_save
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -39,3 +44,42 @@ def api_error(error: str, status_code: int = status.HTTP_400_BAD_REQUEST) -> Res
         data={"error": [error]},
         status=status_code,
     )
+
+
+def get_teams_configuration_version(teams_configuration) -> str:
+    """
+    Build a version token for a teams configuration.
+
+    Args:
+        teams_configuration (TeamsConfig): Teams configuration of a course.
+
+    Returns:
+        str: Digest that changes whenever the teams configuration changes.
+    """
+    serialized = json.dumps(teams_configuration.cleaned_data, sort_keys=True, default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def send_post_save(model, instances: list, created: bool, update_fields=None) -> None:
+    """
+    Send the `post_save` signal of instances written with bulk inserts or updates.
+
+    Bulk writes do not call `save` nor send model signals, so the receivers of
+    the platform (e.g. the teams search index) are notified as `save` would.
+
+    Args:
+        model (type): The model of the instances.
+        instances (list): The written instances.
+        created (bool): Whether the instances were inserted.
+        update_fields (iterable, optional): The updated fields, for updates.
+    """
+    using = router.db_for_write(model)
+    for instance in instances:
+        post_save.send(
+            sender=model,
+            instance=instance,
+            created=created,
+            update_fields=frozenset(update_fields) if update_fields else None,
+            raw=False,
+            using=using,
+        )
@@ -0,0 +1,630 @@
+#!/usr/bin/env python
+"""
+Benchmark the topics and team membership endpoints against synthetic courses.
+
+The script creates an in-memory test database, fills it with a synthetic course
+for each requested size, and runs the LMS topics, topic teams and team
+membership views and the CMS topics view against it, with the in-memory edxapp backends of the test
+settings. For each request it reports the latency (median and 95th
+percentile), the number of database queries and the peak memory allocated
+while serving it. It also compares the time the DRF JSON renderer and the fast
+JSON renderer of the plugin take to render a large page of topics.
+
+Every benchmarked request is expected to run a constant number of queries,
+whatever the size of the course, and its latency and peak memory are expected
+to grow slower than the number of teams of the course. The script exits with an
+error if the query count of a request grows with the size of the course, or if
+its latency or peak memory grows more than the number of teams.
+
+The results can be saved with `--save` and compared with the saved results of a
+previous run with `--baseline`: the script also exits with an error if a request
+of the same size runs more queries, or its median latency or peak memory grows
+more than `--max-latency-growth` or `--max-memory-growth` times.
+
+The team formation planning is benchmarked apart, without the database, for
+growing numbers of learners up to 100k. Its time is expected to grow as
+O(n log n): the script exits with an error if the time per `n log n` of the
+largest run is more than `FORMATION_MAX_GROWTH` times the one of the smallest.
+
+Usage:
+
+    python scripts/benchmark.py --sizes small,medium
+    python scripts/benchmark.py --sizes small,medium,large --iterations 10
+    python scripts/benchmark.py --sizes small,medium --save baseline.json
+    python scripts/benchmark.py --sizes small,medium --baseline baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from uuid import uuid4
+
+Result = namedtuple("Result", ["scenario", "status_code", "median_ms", "p95_ms", "queries", "peak_kb"])
+
+USERS_PER_MEMBERSHIP_REQUEST = 5
+COLD_ITERATIONS = 3
+RENDERED_TOPICS_PAGE_SIZE = 100
+# Latencies and peak memories below these are compared as these, as they are mostly noise
+LATENCY_FLOOR_MS = 20
+MEMORY_FLOOR_KB = 256
+FORMATION_LEARNER_COUNTS = (1_000, 10_000, 100_000)
+FORMATION_LEARNERS_PER_TEAM = 5
+FORMATION_MAX_GROWTH = 3
+
+
+class Scenario:
+    """
+    A request to benchmark.
+
+    Attributes:
+        name (str): The name of the scenario in the report.
+        view (callable): The view to call.
+        build_request (callable): Builds a new `(request, view_kwargs)` for each call.
+        expected_status (int): The status code of a successful response.
+        before (callable): Called before each call, out of the measurements.
+        after (callable): Called with the response of each call, out of the measurements.
+        iterations (int): Maximum number of measured calls.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, name, view, build_request, expected_status, before=None, after=None, iterations=None
+    ):
+        self.name = name
+        self.view = view
+        self.build_request = build_request
+        self.expected_status = expected_status
+        self.before = before
+        self.after = after
+        self.iterations = iterations
+
+    def prepare(self) -> tuple:
+        """Build the arguments of the next call, as a new request."""
+        from edx_django_utils.cache import RequestCache  # pylint: disable=import-outside-toplevel
+
+        # Each call is a new request, as the request cache middleware would do
+        RequestCache.clear_all_namespaces()
+        if self.before:
+            self.before()
+
+        return self.build_request()
+
+    def finish(self, response):
+        """Check the response of a call."""
+        if response.status_code != self.expected_status:
+            raise RuntimeError(
+                f"{self.name}: expected a {self.expected_status} response, got "
+                f"{response.status_code}: {getattr(response, 'data', None)}"
+            )
+
+        if self.after:
+            self.after(response)
+
+
+def build_scenarios(course_key, prefix: str, course_data: dict, calls: int) -> list:
+    """
+    Build the scenarios to benchmark on a synthetic course.
+
+    Args:
+        course_key (CourseKey): The key of the course.
+        prefix (str): The prefix of the usernames and team ids of the course.
+        course_data (dict): The users and teams created with the course.
+        calls (int): The number of calls of each scenario, to create enough
+            users to add to teams.
+
+    Returns:
+        list[Scenario]: The scenarios, in the order they must run.
+    """
+    # pylint: disable=import-outside-toplevel
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from platform_plugin_teams.api.cms.views import TopicsAPIView
+    from platform_plugin_teams.api.lms.views import TeamMembershipAPIView, TopicsReadOnlyAPIView, TopicTeamsAPIView
+    from platform_plugin_teams.cache import invalidate_course
+    from test_utils.synthetic import create_enrolled_users
+
+    factory = APIRequestFactory()
+    course_id = str(course_key)
+    staff = course_data["staff"]
+    learner = course_data["learner"]
+    open_team_ids = course_data["open_team_ids"]
+
+    def authenticated(request, user):
+        # A new user object for each request, so the roles cached in it are loaded again
+        force_authenticate(request, user=type(user).objects.get(pk=user.pk))
+        return request
+
+    def get_topics(user, **params):
+        return lambda: (
+            authenticated(factory.get("/topics/", {"page_size": 12, **params}), user),
+            {"course_id": course_id},
+        )
+
+    def get_topic_teams():
+        return authenticated(factory.get("/teams/", {"page_size": 100}), learner), {
+            "course_id": course_id,
+            "topic_id": "topic-0",
+        }
+
+    joiner_ids = create_enrolled_users(course_key, f"{prefix}-joiner", calls * USERS_PER_MEMBERSHIP_REQUEST)
+    joiner_usernames = [f"{prefix}-joiner-{index}" for index in range(len(joiner_ids))]
+    membership_calls = iter(range(calls))
+
+    def add_members():
+        call = next(membership_calls)
+        usernames = joiner_usernames[
+            call * USERS_PER_MEMBERSHIP_REQUEST:(call + 1) * USERS_PER_MEMBERSHIP_REQUEST
+        ]
+        data = {"team_id": open_team_ids[call % len(open_team_ids)], "usernames": usernames}
+        return authenticated(factory.post("/team-membership/", data, format="json"), staff), {
+            "course_id": course_id
+        }
+
+    created_topic_names = []
+    created_topic_ids = []
+
+    def create_topic():
+        name = f"Benchmark topic {uuid4().hex}"
+        created_topic_names.append(name)
+        data = {"name": name, "description": "", "type": "open"}
+        return authenticated(factory.post("/topics/", data, format="json"), staff), {"course_id": course_id}
+
+    def remember_created_topic(response):
+        name = created_topic_names.pop(0)
+        created_topic_ids.extend(topic["id"] for topic in response.data["topics"] if topic["name"] == name)
+
+    def delete_topic():
+        return authenticated(factory.delete("/topics/"), staff), {
+            "course_id": course_id,
+            "topic_id": created_topic_ids.pop(0),
+        }
+
+    return [
+        Scenario("lms topics, staff", TopicsReadOnlyAPIView.as_view(), get_topics(staff), 200),
+        Scenario("lms topics, learner", TopicsReadOnlyAPIView.as_view(), get_topics(learner), 200),
+        Scenario(
+            "lms topics, cold cache",
+            TopicsReadOnlyAPIView.as_view(),
+            get_topics(learner),
+            200,
+            before=lambda: invalidate_course(course_key),
+            iterations=COLD_ITERATIONS,
+        ),
+        Scenario(
+            "lms topics, 10 teams each",
+            TopicsReadOnlyAPIView.as_view(),
+            get_topics(learner, teams_page_size=10),
+            200,
+        ),
+        Scenario(
+            "lms topics, sparse fields",
+            TopicsReadOnlyAPIView.as_view(),
+            get_topics(learner, fields="id,name,teams.id,teams.member_count"),
+            200,
+        ),
+        Scenario(
+            "lms topics, sparse cold",
+            TopicsReadOnlyAPIView.as_view(),
+            get_topics(learner, fields="id,name,teams.id,teams.member_count"),
+            200,
+            before=lambda: invalidate_course(course_key),
+            iterations=COLD_ITERATIONS,
+        ),
+        Scenario("lms topic teams", TopicTeamsAPIView.as_view(), get_topic_teams, 200),
+        Scenario("lms team membership", TeamMembershipAPIView.as_view(), add_members, 201),
+        Scenario(
+            "cms topics, get",
+            TopicsAPIView.as_view(),
+            lambda: (authenticated(factory.get("/topics/"), staff), {"course_id": course_id}),
+            200,
+        ),
+        Scenario("cms topics, create", TopicsAPIView.as_view(), create_topic, 201, after=remember_created_topic),
+        Scenario("cms topics, delete", TopicsAPIView.as_view(), delete_topic, 204),
+    ]
+
+
+def run_scenario(scenario: Scenario, iterations: int) -> Result:
+    """
+    Run a scenario once to warm it up, measure its latency and queries over
+    several calls, and its peak memory on one more call.
+
+    Memory tracing slows down the code it traces, so the peak memory is
+    measured on a separate call from the latency.
+
+    Args:
+        scenario (Scenario): The scenario to run.
+        iterations (int): The number of measured calls.
+
+    Returns:
+        Result: The measurements of the scenario.
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    iterations = min(iterations, scenario.iterations or iterations)
+
+    request, kwargs = scenario.prepare()
+    response = scenario.view(request, **kwargs)
+    scenario.finish(response)
+
+    timings = []
+    query_counts = []
+    for _ in range(iterations):
+        request, kwargs = scenario.prepare()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = scenario.view(request, **kwargs)
+            # The responses of the views are rendered by the middleware, after the view returns
+            response.render()
+            timings.append(time.perf_counter() - start)
+        scenario.finish(response)
+        query_counts.append(len(queries))
+
+    request, kwargs = scenario.prepare()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        response = scenario.view(request, **kwargs)
+        response.render()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    scenario.finish(response)
+
+    timings.sort()
+    return Result(
+        scenario=scenario.name,
+        status_code=response.status_code,
+        median_ms=statistics.median(timings) * 1000,
+        p95_ms=timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        queries=max(query_counts),
+        peak_kb=peak // 1024,
+    )
+
+
+def compare_renderers(course_key, staff, iterations: int) -> None:
+    """
+    Compare the DRF JSON renderer with the fast JSON renderer on a large page
+    of topics, and check both render the same JSON.
+
+    Args:
+        course_key (CourseKey): The key of the course.
+        staff (User): A course staff user, who sees every team.
+        iterations (int): The number of measured renders of each renderer.
+    """
+    # pylint: disable=import-outside-toplevel
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from platform_plugin_teams.api.lms.views import TopicsReadOnlyAPIView
+    from platform_plugin_teams.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print("renderers: orjson is not installed, the fast JSON renderer is not available")
+        return
+
+    request = APIRequestFactory().get("/topics/", {"page_size": RENDERED_TOPICS_PAGE_SIZE})
+    force_authenticate(request, user=staff)
+    data = TopicsReadOnlyAPIView.as_view()(request, course_id=str(course_key)).data
+
+    rendered = {}
+    print(f"{'renderer':<26} {'size':>13} {'median':>11} {'p95':>11}")
+    for renderer in (JSONRenderer(), FastJSONRenderer()):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            content = renderer.render(data)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        rendered[type(renderer).__name__] = content
+        print(
+            f"{type(renderer).__name__:<26} {len(content) // 1024:>10} KB "
+            f"{statistics.median(timings) * 1000:>8.1f} ms "
+            f"{timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000:>8.1f} ms"
+        )
+
+    if json.loads(rendered["JSONRenderer"]) != json.loads(rendered["FastJSONRenderer"]):
+        raise RuntimeError("The fast JSON renderer does not render the same JSON as the DRF renderer.")
+
+    identical = "identical" if rendered["JSONRenderer"] == rendered["FastJSONRenderer"] else "equivalent"
+    print(f"The renderers render {identical} JSON for {RENDERED_TOPICS_PAGE_SIZE} topics.")
+
+
+def benchmark_formation(iterations: int) -> list:
+    """
+    Time the planning of the team formation of a topic for growing numbers of learners.
+
+    Each run sorts the learners by a balanced attribute and lists the places of
+    the teams, as `plan_team_formation` does once the learners and teams are
+    loaded, for a topic whose teams are partially filled.
+
+    Args:
+        iterations (int): The number of measured runs of each number of learners.
+
+    Returns:
+        list: A message if the time per `n log n` grows more than `FORMATION_MAX_GROWTH` times.
+    """
+    # pylint: disable=import-outside-toplevel
+    from platform_plugin_teams.formation import get_formation_slots, sort_learners
+
+    rng = random.Random(0)
+    time_per_n_log_n = {}
+    print(f"{'learners':>9} {'median':>11} {'p95':>11} {'per n log n':>13}")
+    for learner_count in FORMATION_LEARNER_COUNTS:
+        learners = [
+            (user_id, f"learner-{user_id}", rng.choice(("CO", "FR", "US", "", None)))
+            for user_id in rng.sample(range(learner_count * 10), learner_count)
+        ]
+        team_sizes = [
+            rng.randrange(FORMATION_LEARNERS_PER_TEAM)
+            for _ in range(learner_count // (FORMATION_LEARNERS_PER_TEAM * 2))
+        ]
+        timings = []
+        for _ in range(iterations):
+            shuffled = learners[:]
+            rng.shuffle(shuffled)
+            start = time.perf_counter()
+            sort_learners(shuffled, balanced=True)
+            get_formation_slots(team_sizes, learner_count, FORMATION_LEARNERS_PER_TEAM)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        median = statistics.median(timings)
+        time_per_n_log_n[learner_count] = median / (learner_count * math.log2(learner_count))
+        print(
+            f"{learner_count:>9} {median * 1000:>8.1f} ms "
+            f"{timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000:>8.1f} ms "
+            f"{time_per_n_log_n[learner_count] * 1e9:>10.1f} ns"
+        )
+
+    smallest, largest = FORMATION_LEARNER_COUNTS[0], FORMATION_LEARNER_COUNTS[-1]
+    growth = time_per_n_log_n[largest] / time_per_n_log_n[smallest]
+    if growth > FORMATION_MAX_GROWTH:
+        return [
+            f"team formation: the time per n log n of {largest} learners is {growth:.1f} times "
+            f"the one of {smallest} learners."
+        ]
+
+    return []
+
+
+def check_query_counts(results_by_size: dict) -> list:
+    """
+    Find the scenarios whose query count grows with the size of the course.
+
+    Args:
+        results_by_size (dict): The results of each size, from the smallest one.
+
+    Returns:
+        list: A message for each scenario that runs more queries on a larger course.
+    """
+    sizes = list(results_by_size)
+    baseline = {result.scenario: result.queries for result in results_by_size[sizes[0]]}
+    errors = []
+    for size_name in sizes[1:]:
+        for result in results_by_size[size_name]:
+            if result.queries > baseline[result.scenario]:
+                errors.append(
+                    f"{result.scenario}: {result.queries} queries on the {size_name} course, "
+                    f"{baseline[result.scenario]} on the {sizes[0]} course."
+                )
+
+    return errors
+
+
+def check_growth(results_by_size: dict, sizes: dict) -> list:
+    """
+    Find the scenarios whose latency or peak memory grows more than the number of teams of the course.
+
+    Args:
+        results_by_size (dict): The results of each size, from the smallest one.
+        sizes (dict): The `Size` of each course size.
+
+    Returns:
+        list: A message for each scenario that grows faster than the course.
+    """
+    size_names = list(results_by_size)
+    baseline = {result.scenario: result for result in results_by_size[size_names[0]]}
+    errors = []
+    for size_name in size_names[1:]:
+        course_growth = sizes[size_name].teams / sizes[size_names[0]].teams
+        for result in results_by_size[size_name]:
+            base = baseline[result.scenario]
+            for measure, value, base_value, floor, unit in (
+                ("median latency", result.median_ms, base.median_ms, LATENCY_FLOOR_MS, "ms"),
+                ("peak memory", result.peak_kb, base.peak_kb, MEMORY_FLOOR_KB, "KB"),
+            ):
+                if max(value, floor) / max(base_value, floor) > course_growth:
+                    errors.append(
+                        f"{result.scenario}: {measure} of {value:.0f} {unit} on the {size_name} course, "
+                        f"{base_value:.0f} {unit} on the {size_names[0]} course, which has "
+                        f"{course_growth:.0f} times fewer teams."
+                    )
+
+    return errors
+
+
+def save_results(path: str, results_by_size: dict) -> None:
+    """
+    Save the results of each size as JSON, to compare them with a later run.
+
+    Args:
+        path (str): The path of the file.
+        results_by_size (dict): The results of each size.
+    """
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(
+            {
+                size_name: {result.scenario: result._asdict() for result in results}
+                for size_name, results in results_by_size.items()
+            },
+            results_file,
+            indent=2,
+        )
+
+
+def check_baseline(path: str, results_by_size: dict, max_latency_growth: float, max_memory_growth: float) -> list:
+    """
+    Find the scenarios that got slower, bigger or run more queries than in a previous run.
+
+    Args:
+        path (str): The path of the results of the previous run.
+        results_by_size (dict): The results of each size.
+        max_latency_growth (float): The allowed growth of the median latency.
+        max_memory_growth (float): The allowed growth of the peak memory.
+
+    Returns:
+        list: A message for each regression.
+    """
+    with open(path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    errors = []
+    for size_name, results in results_by_size.items():
+        for result in results:
+            base = baseline.get(size_name, {}).get(result.scenario)
+            if base is None:
+                continue
+            if result.queries > base["queries"]:
+                errors.append(
+                    f"{result.scenario} ({size_name}): {result.queries} queries, {base['queries']} in the baseline."
+                )
+            for measure, value, base_value, floor, max_growth, unit in (
+                ("median latency", result.median_ms, base["median_ms"], LATENCY_FLOOR_MS, max_latency_growth, "ms"),
+                ("peak memory", result.peak_kb, base["peak_kb"], MEMORY_FLOOR_KB, max_memory_growth, "KB"),
+            ):
+                if max(value, floor) / max(base_value, floor) > max_growth:
+                    errors.append(
+                        f"{result.scenario} ({size_name}): {measure} of {value:.0f} {unit}, "
+                        f"{base_value:.0f} {unit} in the baseline."
+                    )
+
+    return errors
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser of the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--settings", default="test_settings", help="Django settings module.")
+    parser.add_argument(
+        "--sizes",
+        default="small,medium",
+        help="Comma separated course sizes to benchmark: small, medium or large.",
+    )
+    parser.add_argument("--iterations", type=int, default=20, help="Measured calls of each scenario.")
+    parser.add_argument("--save", help="Save the results as JSON in this file.")
+    parser.add_argument("--baseline", help="Compare the results with the ones saved in this file.")
+    parser.add_argument(
+        "--max-latency-growth",
+        type=float,
+        default=2.0,
+        help="Allowed growth of the median latency of a request over the baseline.",
+    )
+    parser.add_argument(
+        "--max-memory-growth",
+        type=float,
+        default=1.25,
+        help="Allowed growth of the peak memory of a request over the baseline.",
+    )
+    return parser
+
+
+def main():
+    """Run the benchmarks."""
+    parser = build_parser()
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    sys.path.insert(0, os.getcwd())
+
+    # pylint: disable=import-outside-toplevel
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from opaque_keys.edx.keys import CourseKey
+
+    from test_utils.synthetic import SIZES, create_synthetic_course
+
+    size_names = [size_name.strip() for size_name in args.sizes.split(",") if size_name.strip()]
+    unknown_sizes = set(size_names) - set(SIZES)
+    if unknown_sizes or not size_names:
+        parser.error(f"Unknown course sizes: {', '.join(sorted(unknown_sizes)) or '-'}.")
+    size_names.sort(key=list(SIZES).index)
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    results_by_size = {}
+    for size_name in size_names:
+        size = SIZES[size_name]
+        course_key = CourseKey.from_string(f"course-v1:Benchmark+{size_name}+run")
+
+        start = time.perf_counter()
+        course_data = create_synthetic_course(course_key, size, size_name)
+        print(
+            f"\n{size_name}: {size.teamsets} teamsets, {size.teams} teams, {size.memberships} memberships "
+            f"(created in {time.perf_counter() - start:.1f} s)"
+        )
+
+        results = []
+        print(f"{'scenario':<26} {'status':>6} {'median':>11} {'p95':>11} {'queries':>8} {'peak':>12}")
+        for scenario in build_scenarios(course_key, size_name, course_data, args.iterations + 2):
+            result = run_scenario(scenario, args.iterations)
+            results.append(result)
+            print(
+                f"{result.scenario:<26} {result.status_code:>6} {result.median_ms:>8.1f} ms "
+                f"{result.p95_ms:>8.1f} ms {result.queries:>8} {result.peak_kb:>9} KB"
+            )
+        results_by_size[size_name] = results
+
+        print()
+        compare_renderers(course_key, course_data["staff"], args.iterations)
+
+    print("\nteam formation planning")
+    checks = [
+        ("The team formation planning grows faster than O(n log n):", benchmark_formation(args.iterations)),
+        ("The query count grows with the size of the course:", check_query_counts(results_by_size)),
+        (
+            "The latency or the peak memory grows faster than the number of teams of the course:",
+            check_growth(results_by_size, SIZES),
+        ),
+    ]
+    if args.save:
+        save_results(args.save, results_by_size)
+    if args.baseline:
+        checks.append(
+            (
+                f"The requests regressed from the baseline {args.baseline}:",
+                check_baseline(args.baseline, results_by_size, args.max_latency_growth, args.max_memory_growth),
+            )
+        )
+
+    failed = False
+    for title, errors in checks:
+        if errors:
+            failed = True
+            print(f"\n{title}")
+            for error in errors:
+                print(f"  {error}")
+    if failed:
+        sys.exit(1)
+
+    if len(results_by_size) > 1:
+        print(
+            "\nThe query counts are the same for every course size, and the latency and peak memory "
+            f"grow slower than the number of teams ({', '.join(results_by_size)})."
+        )
+    if args.baseline:
+        print(f"No request regressed from the baseline {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Measure the import time and memory the plugin adds to an LMS or CMS worker.
+
+The script sets up Django with the given settings module (the plugin is loaded
+as any other installed app), and then loads the plugin URLs of the given service
+variant, which is what a worker does when it serves its first request. For each
+step it reports the elapsed time, the resident memory and the number of modules
+imported, and which edxapp backends were resolved by the step. The last step
+resolves every backend, which is what the first requests of a worker pay for.
+
+Usage, from an edx-platform checkout where the plugin is installed:
+
+    python scripts/measure_startup.py --settings lms.envs.production --variant lms
+    python scripts/measure_startup.py --settings cms.envs.production --variant cms
+
+Run it with the test settings of this repository to get the baseline of the
+plugin itself:
+
+    python scripts/measure_startup.py --settings test_settings --variant lms
+"""
+import argparse
+import importlib
+import os
+import resource
+import sys
+import time
+
+
+def get_rss_kb() -> int:
+    """Get the resident memory of the current process in KB."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def get_resolved_backends() -> set:
+    """Get the names of the edxapp backends resolved so far."""
+    from platform_plugin_teams.edxapp_wrapper.registry import (  # pylint: disable=import-outside-toplevel
+        BACKEND_SETTINGS,
+        backends,
+        get_backend_name,
+    )
+
+    return {
+        get_backend_name(setting_name)
+        for setting_name in BACKEND_SETTINGS
+        if get_backend_name(setting_name) in vars(backends)
+    }
+
+
+def measure(label: str, func) -> None:
+    """Run a step and print its elapsed time, memory, imported modules and resolved backends."""
+    modules_before = len(sys.modules)
+    rss_before = get_rss_kb()
+    backends_before = get_resolved_backends()
+    start = time.perf_counter()
+
+    func()
+
+    elapsed = time.perf_counter() - start
+    resolved = sorted(get_resolved_backends() - backends_before)
+    print(
+        f"{label:<24} {elapsed * 1000:>10.1f} ms {get_rss_kb() - rss_before:>10} KB "
+        f"{len(sys.modules) - modules_before:>8} modules  {', '.join(resolved) or '-'}"
+    )
+
+
+def main():
+    """Measure the startup cost of the plugin."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--settings", default="test_settings", help="Django settings module.")
+    parser.add_argument("--variant", default="lms", choices=("lms", "cms"), help="Service variant.")
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    os.environ.setdefault("SERVICE_VARIANT", args.variant)
+    sys.path.insert(0, os.getcwd())
+
+    import django  # pylint: disable=import-outside-toplevel
+
+    print(f"{'step':<24} {'time':>13} {'rss':>13} {'imported':>16}  resolved backends")
+    measure("django.setup()", django.setup)
+    measure(
+        f"{args.variant} plugin urls",
+        lambda: importlib.import_module(f"platform_plugin_teams.api.{args.variant}.urls"),
+    )
+
+    from platform_plugin_teams.edxapp_wrapper.registry import backends  # pylint: disable=import-outside-toplevel
+
+    # What the first requests of a worker pay for, if they use every backend
+    measure("every backend", backends.resolve_all)
+    print(f"total rss: {get_rss_kb()} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ In a real-world use case, apps in this project are installed into other
 Django applications, so these settings will not be used.
 """
 
+import os
 from os.path import abspath, dirname, join
 
 
@@ -33,20 +34,29 @@ INSTALLED_APPS = (
     "django.contrib.messages",
     "django.contrib.sessions",
     "platform_plugin_teams",
+    "test_utils",
 )
 
 LOCALE_PATHS = [
     root("platform_plugin_teams", "conf", "locale"),
 ]
 
-ROOT_URLCONF = "platform_plugin_teams.urls"
+ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
+
+ROOT_URLCONF = "test_utils.urls"
 
 SECRET_KEY = "insecure-secret-key"
 
+# As in the platform, JWTs are sent with the `JWT` prefix, and `Bearer` is left to the OAuth2 tokens
+JWT_AUTH = {
+    "JWT_AUTH_HEADER_PREFIX": "JWT",
+}
+
 MIDDLEWARE = (
+    "edx_django_utils.cache.middleware.RequestCacheMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
 )
 
 TEMPLATES = [
@@ -62,7 +72,7 @@ TEMPLATES = [
     }
 ]
 
-SERVICE_VARIANT = "lms"
+SERVICE_VARIANT = os.environ.get("SERVICE_VARIANT", "lms")
 
 
 PLATFORM_PLUGIN_TEAMS_STUDENT_BACKEND = (
@@ -89,3 +99,23 @@ PLATFORM_PLUGIN_TEAMS_TEAMS_CONFIG_BACKEND = (
 PLATFORM_PLUGIN_TEAMS_CONTENTSTORE_BACKEND = (
     "platform_plugin_teams.edxapp_wrapper.backends.contentstore_p_v1_test"
 )
+PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_SIZE = 128
+PLATFORM_PLUGIN_TEAMS_TOPICS_CACHE_TIMEOUT = 300
+PLATFORM_PLUGIN_TEAMS_JOB_WORKERS = 2
+PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_CHUNK_SIZE = 500
+PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS = 50000
+PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_JOB_THRESHOLD = 500
+PLATFORM_PLUGIN_TEAMS_TOPIC_DELETE_CHUNK_SIZE = 500
+PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT = 10000
+PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE = float(
+    os.environ.get("PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE", 0)
+)
+PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED = True
+PLATFORM_PLUGIN_TEAMS_METRICS_BACKEND = "platform_plugin_teams.metrics.InProcessMetricsBackend"
+PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER = os.environ.get("PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER") == "1"
+PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE = 1000
+PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES = 50
+PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_PATH = os.environ.get("PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_PATH")
+PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_LATENCY = float(
+    os.environ.get("PLATFORM_PLUGIN_TEAMS_TEST_MODULESTORE_LATENCY", 0)
+)
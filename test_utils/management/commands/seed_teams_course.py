@@ -0,0 +1,63 @@
+"""
+Create a synthetic course with teams, to load test the plugin with the test
+edxapp backends.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_teams.edxapp_wrapper.backends.authentication_p_v1_test import create_bearer_token
+from test_utils.synthetic import SIZES, create_synthetic_course
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Create a synthetic course with teamsets, teams, enrolled learners and
+    memberships, and print the bearer tokens of its staff user and of some of
+    its learners as JSON.
+
+    Example:
+
+        python manage.py seed_teams_course course-v1:Load+Test+run --size medium --tokens 100
+    """
+
+    help = "Create a synthetic course with teams for load tests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_id", help="The id of the course to create.")
+        parser.add_argument("--size", choices=list(SIZES), default="small", help="The size of the course.")
+        parser.add_argument("--prefix", help="Prefix of the usernames and team ids. Defaults to the size.")
+        parser.add_argument("--tokens", type=int, default=10, help="Number of learner tokens to print.")
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options["course_id"])
+        except InvalidKeyError as error:
+            raise CommandError(f"Invalid course id: {options['course_id']}") from error
+
+        prefix = options["prefix"] or options["size"]
+        course_data = create_synthetic_course(course_key, SIZES[options["size"]], prefix)
+
+        learners = User.objects.filter(username__startswith=f"{prefix}-learner-").order_by("pk")[:options["tokens"]]
+        self.stdout.write(
+            json.dumps(
+                {
+                    "course_id": str(course_key),
+                    "staff": {
+                        "username": course_data["staff"].username,
+                        "token": create_bearer_token(course_data["staff"]),
+                    },
+                    "learners": [
+                        {"username": learner.username, "token": create_bearer_token(learner)}
+                        for learner in learners
+                    ],
+                    "open_team_ids": course_data["open_team_ids"],
+                },
+                indent=2,
+            )
+        )
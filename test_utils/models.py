@@ -0,0 +1,165 @@
+"""
+Minimal stand-ins of the platform teams and student models, used by the tests
+and by the test edxapp backends.
+"""
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.text import slugify
+
+
+class CourseTeam(models.Model):
+    """
+    Stand-in of `lms.djangoapps.teams.models.CourseTeam`.
+
+    .. no_pii:
+    """
+
+    team_id = models.SlugField(max_length=255, unique=True)
+    discussion_topic_id = models.SlugField(max_length=255, unique=True, null=True)
+    name = models.CharField(max_length=255)
+    course_id = models.CharField(max_length=255, db_index=True)
+    topic_id = models.CharField(max_length=255, db_index=True, blank=True)
+    description = models.CharField(max_length=300, blank=True)
+    country = models.CharField(max_length=2, blank=True)
+    language = models.CharField(max_length=16, blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    last_activity_at = models.DateTimeField(default=timezone.now, db_index=True)
+    organization_protected = models.BooleanField(default=False)
+    team_size = models.IntegerField(default=0, db_index=True)
+    users = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, related_name="teams", through="CourseTeamMembership"
+    )
+
+    class Meta:
+        app_label = "test_utils"
+
+    @classmethod
+    def create(
+        cls,
+        name,
+        course_id,
+        description,
+        topic_id="",
+        country="",
+        language="",
+        organization_protected=False,
+    ):
+        """Build an unsaved team, as the platform model does."""
+        unique_id = uuid4().hex
+        return cls(
+            team_id=f"{slugify(name)[0:20]}-{unique_id}",
+            discussion_topic_id=unique_id,
+            name=name,
+            course_id=course_id,
+            topic_id=topic_id,
+            description=description,
+            country=country,
+            language=language,
+            organization_protected=organization_protected,
+        )
+
+
+class CourseTeamMembership(models.Model):
+    """
+    Stand-in of `lms.djangoapps.teams.models.CourseTeamMembership`.
+
+    .. no_pii:
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    team = models.ForeignKey(CourseTeam, related_name="membership", on_delete=models.CASCADE)
+    date_joined = models.DateTimeField(auto_now_add=True)
+    last_activity_at = models.DateTimeField()
+
+    class Meta:
+        app_label = "test_utils"
+        unique_together = (("user", "team"),)
+
+
+class CourseEnrollment(models.Model):
+    """
+    Stand-in of `common.djangoapps.student.models.CourseEnrollment`.
+
+    .. no_pii:
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    course_id = models.CharField(max_length=255, db_index=True)
+    is_active = models.BooleanField(default=True)
+    mode = models.CharField(max_length=100, default="audit")
+
+    class Meta:
+        app_label = "test_utils"
+        unique_together = (("user", "course_id"),)
+
+    @classmethod
+    def get_enrollment(cls, user, course_key):
+        """Get the enrollment of a user in a course, or None."""
+        return cls.objects.filter(user_id=user.id, course_id=course_key).first()
+
+    @classmethod
+    def is_enrolled(cls, user, course_key) -> bool:
+        """Check whether a user has an active enrollment in a course."""
+        return cls.objects.filter(user_id=user.id, course_id=course_key, is_active=True).exists()
+
+
+class UserProfile(models.Model):
+    """
+    Stand-in of `common.djangoapps.student.models.UserProfile`.
+
+    .. pii: Country, gender, level of education and year of birth of the user.
+    .. pii_types: location, gender, other
+    .. pii_retirement: local_api
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, related_name="profile", on_delete=models.CASCADE)
+    country = models.CharField(max_length=2, blank=True, null=True)
+    gender = models.CharField(max_length=6, blank=True, null=True)
+    level_of_education = models.CharField(max_length=6, blank=True, null=True)
+    year_of_birth = models.IntegerField(blank=True, null=True)
+
+    class Meta:
+        app_label = "test_utils"
+
+
+class CourseAccessRole(models.Model):
+    """
+    Stand-in of `common.djangoapps.student.models.CourseAccessRole`.
+
+    .. no_pii:
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    course_id = models.CharField(max_length=255, db_index=True, blank=True)
+    role = models.CharField(max_length=64, db_index=True)
+
+    class Meta:
+        app_label = "test_utils"
+        unique_together = (("user", "course_id", "role"),)
+
+    @classmethod
+    def has_role(cls, user, course_key, roles) -> bool:
+        """Check whether a user has any of the given roles in a course."""
+        return cls.objects.filter(user_id=user.id, course_id=course_key, role__in=roles).exists()
+
+
+class UserRetirementRequest(models.Model):
+    """
+    Stand-in of `openedx.core.djangoapps.user_api.models.UserRetirementRequest`.
+
+    .. no_pii:
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = "test_utils"
+
+    @classmethod
+    def has_user_requested_retirement(cls, user) -> bool:
+        """Check whether a user has requested the retirement of their account."""
+        return cls.objects.filter(user=user).exists()
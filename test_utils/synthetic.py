@@ -0,0 +1,161 @@
+"""
+Synthetic courses with teams, used by the benchmarks and the load tests.
+
+The teamsets of the course are stored in the modulestore of the configured
+edxapp backend, and the teams, learners, enrollments and memberships are
+inserted in bulk.
+"""
+from collections import namedtuple
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils import timezone
+
+from platform_plugin_teams.edxapp_wrapper.modulestore import modulestore
+from platform_plugin_teams.edxapp_wrapper.student import CourseEnrollment
+from platform_plugin_teams.edxapp_wrapper.teams_common import CourseTeam, CourseTeamMembership
+from test_utils.models import CourseAccessRole
+
+User = get_user_model()
+
+Size = namedtuple("Size", ["teamsets", "teams", "memberships"])
+
+SIZES = {
+    "small": Size(teamsets=10, teams=100, memberships=1_000),
+    "medium": Size(teamsets=200, teams=5_000, memberships=50_000),
+    "large": Size(teamsets=2_000, teams=50_000, memberships=500_000),
+}
+TOPICS_PER_LEARNER = 5
+BULK_CREATE_BATCH_SIZE = 5_000
+
+
+def create_synthetic_course(course_key, size: Size, prefix: str) -> dict:
+    """
+    Create a course with teamsets, teams, enrolled learners and memberships.
+
+    One in ten teamsets is private managed and one in ten is public managed,
+    the rest are open. One in seven teams is organization protected. Each learner
+    is on a team of `TOPICS_PER_LEARNER` different teamsets.
+
+    Args:
+        course_key (CourseKey): The key of the course.
+        size (Size): The number of teamsets, teams and memberships.
+        prefix (str): A prefix for the usernames and team ids of the course.
+
+    Returns:
+        dict: A user with the staff role in the course, a learner on a private
+            team, and the team ids of the open teams of the course.
+    """
+    now = timezone.now()
+
+    team_sets = [
+        {
+            "id": f"topic-{index}",
+            "name": f"Topic {index}",
+            "description": f"Description of the topic {index}.",
+            "type": {9: "private_managed", 8: "public_managed"}.get(index % 10, "open"),
+        }
+        for index in range(size.teamsets)
+    ]
+    modulestore().create_course(
+        course_key,
+        display_name=f"Synthetic course {prefix}",
+        teams_configuration={"max_team_size": 50, "team_sets": team_sets},
+    )
+
+    CourseTeam.objects.bulk_create(
+        [
+            CourseTeam(
+                team_id=f"{prefix}-team-{index}",
+                discussion_topic_id=uuid4().hex,
+                name=f"Team {index}",
+                course_id=str(course_key),
+                topic_id=f"topic-{index % size.teamsets}",
+                description=f"Description of the team {index}.",
+                organization_protected=index % 7 == 0,
+                last_activity_at=now,
+            )
+            for index in range(size.teams)
+        ],
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    teams_by_topic = {}
+    for team_pk, topic_id in (
+        CourseTeam.objects.filter(course_id=course_key).order_by("pk").values_list("pk", "topic_id")
+    ):
+        teams_by_topic.setdefault(topic_id, []).append(team_pk)
+    topic_ids = list(teams_by_topic)
+
+    topics_per_learner = min(TOPICS_PER_LEARNER, len(topic_ids))
+    user_ids = create_enrolled_users(course_key, f"{prefix}-learner", size.memberships // topics_per_learner)
+
+    memberships = []
+    for index, user_id in enumerate(user_ids):
+        for offset in range(topics_per_learner):
+            topic_teams = teams_by_topic[topic_ids[(index + offset) % len(topic_ids)]]
+            memberships.append(
+                CourseTeamMembership(
+                    user_id=user_id,
+                    team_id=topic_teams[(index // len(topic_ids)) % len(topic_teams)],
+                    last_activity_at=now,
+                )
+            )
+    CourseTeamMembership.objects.bulk_create(memberships, batch_size=BULK_CREATE_BATCH_SIZE)
+
+    team_sizes = dict(
+        CourseTeamMembership.objects.filter(team__course_id=course_key)
+        .values("team_id")
+        .annotate(team_size=Count("pk"))
+        .values_list("team_id", "team_size")
+        .order_by()
+    )
+    teams = list(CourseTeam.objects.filter(course_id=course_key).only("pk", "team_size"))
+    for team in teams:
+        team.team_size = team_sizes.get(team.pk, 0)
+    CourseTeam.objects.bulk_update(teams, ["team_size"], batch_size=BULK_CREATE_BATCH_SIZE)
+
+    staff = User.objects.create(username=f"{prefix}-staff", email=f"{prefix}-staff@example.com")
+    CourseAccessRole.objects.create(user=staff, course_id=str(course_key), role="staff")
+
+    # The learner is on a private team, so the topics of the learner include a private teamset
+    learner = User.objects.get(pk=user_ids[0])
+    private_team = (
+        CourseTeam.objects.filter(course_id=course_key, topic_id="topic-9", organization_protected=False)
+        .order_by("pk")
+        .first()
+    )
+    if private_team is not None:
+        CourseTeamMembership.objects.get_or_create(
+            user=learner, team=private_team, defaults={"last_activity_at": now}
+        )
+
+    open_topic_ids = [team_set["id"] for team_set in team_sets if team_set["type"] == "open"]
+    open_team_ids = list(
+        CourseTeam.objects.filter(course_id=course_key, topic_id__in=open_topic_ids, organization_protected=False)
+        .order_by("pk")
+        .values_list("team_id", flat=True)
+    )
+
+    return {"staff": staff, "learner": learner, "open_team_ids": open_team_ids}
+
+
+def create_enrolled_users(course_key, prefix: str, count: int) -> list:
+    """
+    Create users with an active audit enrollment in a course.
+
+    Returns:
+        list: The ids of the users.
+    """
+    User.objects.bulk_create(
+        [User(username=f"{prefix}-{index}", email=f"{prefix}-{index}@example.com") for index in range(count)],
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    user_ids = list(
+        User.objects.filter(username__startswith=f"{prefix}-").order_by("pk").values_list("pk", flat=True)
+    )
+    CourseEnrollment.objects.bulk_create(
+        [CourseEnrollment(user_id=user_id, course_id=str(course_key)) for user_id in user_ids],
+        batch_size=BULK_CREATE_BATCH_SIZE,
+    )
+    return user_ids
@@ -0,0 +1,16 @@
+"""
+URL patterns to serve the plugin outside the platform, e.g. for load tests.
+
+The plugin URLs are included under the same course prefix the platform adds to
+them (see `plugin_app` in `platform_plugin_teams.apps`).
+"""
+from django.urls import include, re_path
+
+COURSE_ID_PATTERN = r"(?P<course_id>[^/+]+(/|\+)[^/+]+(/|\+)[^/?]+)"
+
+urlpatterns = [
+    re_path(
+        rf"^platform-plugin-teams/{COURSE_ID_PATTERN}/",
+        include("platform_plugin_teams.urls", namespace="platform-plugin-teams"),
+    ),
+]
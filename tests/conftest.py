@@ -0,0 +1,43 @@
+"""
+Fixtures shared by the `platform-plugin-teams` tests.
+"""
+import pytest
+from django.core.cache import cache
+from edx_django_utils.cache import RequestCache
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_teams.cache import topics_snapshot_cache
+from test_utils.synthetic import Size, create_synthetic_course
+
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+SMALL_COURSE = Size(teamsets=10, teams=40, memberships=100)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty caches, as the in-process caches outlive the
+    database transaction of each test.
+    """
+    RequestCache.clear_all_namespaces()
+    topics_snapshot_cache.clear()
+    cache.clear()
+    yield
+    RequestCache.clear_all_namespaces()
+    topics_snapshot_cache.clear()
+
+
+@pytest.fixture
+def course_key():
+    """
+    Key of the course of the tests.
+    """
+    return CourseKey.from_string(COURSE_ID)
+
+
+@pytest.fixture
+def course(course_key, db):  # pylint: disable=unused-argument, redefined-outer-name
+    """
+    A small synthetic course, with its staff user, a learner and its open teams.
+    """
+    return create_synthetic_course(course_key, SMALL_COURSE, "test")
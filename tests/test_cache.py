@@ -0,0 +1,250 @@
+"""
+Tests for the `platform-plugin-teams` cache module.
+"""
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from platform_plugin_teams.cache import (
+    CourseSnapshotCache,
+    get_course_version,
+    get_request_cache_stats,
+    invalidate_course,
+    request_cached,
+)
+from platform_plugin_teams.edxapp_wrapper.contentstore import update_course_advanced_settings
+from platform_plugin_teams.edxapp_wrapper.modulestore import get_course, modulestore
+from test_utils.models import CourseTeam, CourseTeamMembership
+from tests.test_cms_topics_api import NEW_TOPIC, call_topics
+from tests.test_topics_api import get_topics
+
+User = get_user_model()
+
+
+def test_request_cached():
+    """
+    The calls with the same arguments are memoized until the cache is cleared.
+    """
+    calls = []
+
+    @request_cached
+    def double(value):
+        calls.append(value)
+        return value * 2
+
+    assert double(1) == 2
+    assert double(1) == 2
+    assert double(2) == 4
+    assert calls == [1, 2]
+
+    double.cache_clear()
+
+    assert double(1) == 2
+    assert calls == [1, 2, 1]
+
+
+def test_request_cached_unhashable_arguments():
+    """
+    The calls with unhashable arguments are not memoized.
+    """
+    calls = []
+
+    @request_cached
+    def first(values):
+        calls.append(values)
+        return values[0]
+
+    assert first([1]) == 1
+    assert first([1]) == 1
+    assert len(calls) == 2
+
+
+@pytest.mark.django_db
+def test_get_course_after_update(course_key):
+    """
+    The courses memoized in a request are reloaded after their advanced
+    settings are updated in the same request.
+    """
+    modulestore().create_course(course_key, teams_configuration={"team_sets": []})
+    user = User.objects.create(username="staff")
+    assert get_course(course_key).teams_topics == []
+
+    # The platform updates a course block loaded by the contentstore, not the memoized one
+    update_course_advanced_settings(
+        modulestore().get_course(course_key),
+        {"teams_configuration": {"value": {"team_sets": [{"id": "topic-1", "name": "Topic 1"}]}}},
+        user,
+    )
+
+    assert [topic["id"] for topic in get_course(course_key).teams_topics] == ["topic-1"]
+    assert get_request_cache_stats()["get_course"] == {"hits": 0, "misses": 2}
+
+
+def build_snapshots(snapshot_cache, course_ids, builds, **kwargs):
+    """
+    Get the snapshots of courses, recording the courses that were built.
+    """
+    def builder(missing_course_ids):
+        builds.extend(missing_course_ids)
+        return {course_id: f"snapshot of {course_id}" for course_id in missing_course_ids}
+
+    return snapshot_cache.get_many_or_build(course_ids, builder, **kwargs)
+
+
+@override_settings(TEST_CACHE_SIZE=2, TEST_CACHE_TIMEOUT=300)
+def test_snapshot_cache_evicts_the_least_recently_used():
+    """
+    The snapshots beyond the maximum size are evicted, the least recently used first.
+    """
+    snapshot_cache = CourseSnapshotCache("test", "TEST_CACHE_SIZE", "TEST_CACHE_TIMEOUT")
+    builds = []
+
+    build_snapshots(snapshot_cache, ["course-1", "course-2"], builds)
+    build_snapshots(snapshot_cache, ["course-1"], builds)
+    build_snapshots(snapshot_cache, ["course-3"], builds)
+    snapshots = build_snapshots(snapshot_cache, ["course-1", "course-2", "course-3"], builds)
+
+    assert snapshots == {course_id: f"snapshot of {course_id}" for course_id in ["course-1", "course-2", "course-3"]}
+    assert builds == ["course-1", "course-2", "course-3", "course-2"]
+
+
+@override_settings(TEST_CACHE_SIZE=2, TEST_CACHE_TIMEOUT=60)
+def test_snapshot_cache_expires_the_old_snapshots():
+    """
+    The snapshots older than the timeout are built again.
+    """
+    snapshot_cache = CourseSnapshotCache("test", "TEST_CACHE_SIZE", "TEST_CACHE_TIMEOUT")
+    builds = []
+
+    with mock.patch("platform_plugin_teams.cache.time.monotonic", return_value=1000):
+        build_snapshots(snapshot_cache, ["course-1"], builds)
+    with mock.patch("platform_plugin_teams.cache.time.monotonic", return_value=1059):
+        build_snapshots(snapshot_cache, ["course-1"], builds)
+    with mock.patch("platform_plugin_teams.cache.time.monotonic", return_value=1060):
+        build_snapshots(snapshot_cache, ["course-1"], builds)
+
+    assert builds == ["course-1", "course-1"]
+
+
+@override_settings(TEST_CACHE_SIZE=2, TEST_CACHE_TIMEOUT=300)
+def test_snapshot_cache_invalidation():
+    """
+    The snapshots are built again after their course is invalidated, or from another version of the course data.
+    """
+    snapshot_cache = CourseSnapshotCache("test", "TEST_CACHE_SIZE", "TEST_CACHE_TIMEOUT")
+    builds = []
+
+    build_snapshots(snapshot_cache, ["course-1", "course-2"], builds, source_versions={"course-1": "v1"})
+    invalidate_course("course-2")
+    build_snapshots(snapshot_cache, ["course-1", "course-2"], builds, source_versions={"course-1": "v1"})
+    build_snapshots(snapshot_cache, ["course-1", "course-2"], builds, source_versions={"course-1": "v2"})
+
+    assert builds == ["course-1", "course-2", "course-2", "course-1"]
+
+
+@override_settings(TEST_CACHE_SIZE=0, TEST_CACHE_TIMEOUT=300)
+def test_snapshot_cache_disabled():
+    """
+    Every snapshot is built again when the maximum size is 0.
+    """
+    snapshot_cache = CourseSnapshotCache("test", "TEST_CACHE_SIZE", "TEST_CACHE_TIMEOUT")
+    builds = []
+
+    build_snapshots(snapshot_cache, ["course-1"], builds)
+    build_snapshots(snapshot_cache, ["course-1"], builds)
+
+    assert builds == ["course-1", "course-1"]
+
+
+def get_team_names(response) -> dict:
+    """
+    Get the names of the teams of each topic of a topics response.
+    """
+    return {topic["id"]: [team["name"] for team in topic["teams"]] for topic in response.data["results"]}
+
+
+def count_team_queries(user, course_key, params=None) -> int:
+    """
+    Count the queries that read teams in a topics request.
+
+    The team counts of the topics are added by the edx-platform serializer, for each organization protection status.
+    """
+    team_table = CourseTeam._meta.db_table  # pylint: disable=protected-access
+    with CaptureQueriesContext(connection) as queries:
+        get_topics(user, course_key, params)
+    return sum(
+        f'FROM "{team_table}"' in query["sql"] and 'AS "team_count"' not in query["sql"]
+        for query in queries.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_topics_reuse_the_cached_teams(course, course_key):
+    """
+    The teams of the topics are serialized once, and shared by the users, each one seeing only their teams.
+    """
+    staff_response = get_topics(course["staff"], course_key)
+    learner_response = get_topics(course["learner"], course_key)
+
+    assert count_team_queries(course["staff"], course_key) == 0
+    assert count_team_queries(course["staff"], course_key, {"fields": "id,teams.name"}) == 1
+    assert count_team_queries(course["staff"], course_key, {"fields": "id,teams.name"}) == 0
+    staff_team_ids = {team["id"] for topic in staff_response.data["results"] for team in topic["teams"]}
+    learner_team_ids = {team["id"] for topic in learner_response.data["results"] for team in topic["teams"]}
+    learner_teams = CourseTeam.objects.filter(course_id=str(course_key), organization_protected=False).exclude(
+        topic_id="topic-9"
+    ) | CourseTeam.objects.filter(course_id=str(course_key), membership__user=course["learner"], topic_id="topic-9")
+    assert staff_team_ids == set(CourseTeam.objects.filter(course_id=str(course_key)).values_list("team_id", flat=True))
+    assert learner_team_ids == set(learner_teams.values_list("team_id", flat=True))
+
+
+@pytest.mark.django_db
+def test_topics_after_team_changes(course, course_key):
+    """
+    The cached teams are invalidated by the signals of the changed teams and memberships.
+    """
+    get_topics(course["staff"], course_key)
+    team = CourseTeam.objects.get(course_id=str(course_key), team_id="test-team-1")
+    team.name = "Renamed team"
+    team.save()
+
+    assert "Renamed team" in get_team_names(get_topics(course["staff"], course_key))[team.topic_id]
+
+    CourseTeamMembership.objects.filter(team=team).delete()
+    teams = {
+        team["id"]: team for topic in get_topics(course["staff"], course_key).data["results"] for team in topic["teams"]
+    }
+
+    assert teams["test-team-1"]["membership"] == []
+
+
+@pytest.mark.django_db
+def test_topics_after_studio_write(course, course_key):
+    """
+    The cached topics are invalidated by the Studio topic writes.
+    """
+    get_topics(course["staff"], course_key, {"page_size": 100})
+
+    call_topics("post", course["staff"], course_key, NEW_TOPIC)
+
+    response = get_topics(course["staff"], course_key, {"page_size": 100})
+
+    assert "New topic" in [topic["name"] for topic in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_invalidation_on_commit(course_key, django_capture_on_commit_callbacks):
+    """
+    A course changed in a transaction is invalidated again when it is committed.
+    """
+    with django_capture_on_commit_callbacks() as callbacks:
+        invalidate_course(course_key)
+        version = get_course_version(course_key)
+
+    assert len(callbacks) == 1
+    callbacks[0]()
+    assert get_course_version(course_key) != version
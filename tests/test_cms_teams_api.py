@@ -0,0 +1,137 @@
+"""
+Tests for the `platform-plugin-teams` Studio teams of a topic API.
+"""
+from unittest import mock
+
+import pytest
+from django.db.models.signals import post_save
+from django.test import override_settings
+from edx_django_utils.cache import RequestCache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.cms.views import TopicTeamsAPIView
+from test_utils.models import CourseTeam
+
+TOPIC_ID = "topic-0"
+
+factory = APIRequestFactory()
+
+
+def create_teams(user, course_key, data):
+    """
+    Call the teams of a topic view as a new request of the user.
+    """
+    RequestCache.clear_all_namespaces()
+    request = factory.post(f"/topics/{TOPIC_ID}/teams/", data, format="json")
+    force_authenticate(request, user=user)
+    return TopicTeamsAPIView.as_view()(request, course_id=str(course_key), topic_id=TOPIC_ID)
+
+
+@pytest.mark.django_db
+def test_create_teams(course, course_key):
+    """
+    The given teams are created in order, and each one sends its `post_save` signal.
+    """
+    teams = [
+        {"name": "Team A", "description": "The first team.", "country": "CO", "language": "es"},
+        {"name": "Team B", "organization_protected": True},
+    ]
+    receiver = mock.Mock()
+    post_save.connect(receiver, sender=CourseTeam)
+
+    try:
+        response = create_teams(course["staff"], course_key, {"teams": teams})
+    finally:
+        post_save.disconnect(receiver, sender=CourseTeam)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [team["name"] for team in response.data["teams"]] == ["Team A", "Team B"]
+    assert response.data["teams"][0]["country"] == "CO"
+    assert response.data["teams"][1]["organization_protected"] is True
+    created_team_ids = [call.kwargs["instance"].team_id for call in receiver.call_args_list]
+    assert created_team_ids == [team["team_id"] for team in response.data["teams"]]
+    assert all(call.kwargs["created"] for call in receiver.call_args_list)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "team, field",
+    [
+        ({"name": "Team A", "description": "x" * 301}, "description"),
+        ({"name": "Team A", "country": "XX"}, "country"),
+        ({"name": "Team A", "language": "xx"}, "language"),
+    ],
+)
+def test_create_invalid_teams(course, course_key, team, field):
+    """
+    A team the platform would reject is a 400 about its field, and no team is created.
+    """
+    team_count = CourseTeam.objects.count()
+
+    response = create_teams(course["staff"], course_key, {"teams": [{"name": "Team B"}, team]})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert list(response.data["field_errors"]["teams"]) == ["1"]
+    assert field in response.data["field_errors"]["teams"]["1"]
+    assert CourseTeam.objects.count() == team_count
+
+
+@pytest.mark.django_db
+def test_generate_teams(course, course_key):
+    """
+    Generated teams continue the numbering of the teams with the same prefix.
+    """
+    create_teams(course["staff"], course_key, {"count": 2, "name_prefix": "Group"})
+
+    response = create_teams(course["staff"], course_key, {"count": 2, "name_prefix": "Group"})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [team["name"] for team in response.data["teams"]] == ["Group 3", "Group 4"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"count": 0},
+        {"count": 0, "fill": True},
+        {"teams": []},
+        {"fill": False},
+        {},
+    ],
+)
+def test_create_teams_bad_mode(course, course_key, data):
+    """
+    A zero count, an empty list of teams, or other than exactly one mode is a 400.
+    """
+    team_count = CourseTeam.objects.count()
+
+    response = create_teams(course["staff"], course_key, data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert CourseTeam.objects.count() == team_count
+
+
+@pytest.mark.django_db
+@override_settings(PLATFORM_PLUGIN_TEAMS_TEAM_CREATE_LIMIT=2)
+@pytest.mark.parametrize(
+    "data",
+    [{"teams": [{"name": f"Team {index}"} for index in range(3)]}, {"count": 3}],
+    ids=["teams", "count"],
+)
+def test_create_too_many_teams(course, course_key, data):
+    """
+    More teams than the limit are a 400, before any team is validated or named.
+    """
+    team_count = CourseTeam.objects.count()
+
+    with mock.patch("platform_plugin_teams.api.cms.views.get_teams_data_errors") as get_teams_data_errors:
+        with mock.patch("platform_plugin_teams.api.cms.views.get_generated_team_names") as get_generated_team_names:
+            response = create_teams(course["staff"], course_key, data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "At most 2 teams" in str(response.data)
+    get_teams_data_errors.assert_not_called()
+    get_generated_team_names.assert_not_called()
+    assert CourseTeam.objects.count() == team_count
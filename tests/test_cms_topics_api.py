@@ -0,0 +1,125 @@
+"""
+Tests for the `platform-plugin-teams` Studio topics API.
+"""
+import threading
+from unittest import mock
+
+import pytest
+from django.db import connections
+from edx_django_utils.cache import RequestCache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.cms import views
+from platform_plugin_teams.api.cms.views import TopicsAPIView
+from platform_plugin_teams.edxapp_wrapper.modulestore import modulestore
+
+factory = APIRequestFactory()
+
+NEW_TOPIC = {"name": "New topic", "description": "A new topic.", "type": "open", "max_team_size": 5}
+
+
+def call_topics(method, user, course_key, data=None, **headers):
+    """
+    Call the Studio topics view as a new request of the user.
+    """
+    RequestCache.clear_all_namespaces()
+    request = getattr(factory, method)("/topics/", data, format="json", **headers)
+    force_authenticate(request, user=user)
+    return TopicsAPIView.as_view()(request, course_id=str(course_key))
+
+
+@pytest.mark.django_db
+def test_create_topic_with_current_version(course, course_key):
+    """
+    A change based on the current version of the teams configuration is applied.
+    """
+    version = call_topics("get", course["staff"], course_key)["ETag"]
+
+    response = call_topics("post", course["staff"], course_key, NEW_TOPIC, HTTP_IF_MATCH=version)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response["ETag"] != version
+    team_sets = modulestore().get_course(course_key).teams_configuration.cleaned_data["team_sets"]
+    assert "New topic" in [team_set["name"] for team_set in team_sets]
+
+
+@pytest.mark.django_db
+def test_create_topic_with_stale_version(course, course_key):
+    """
+    A change based on a version the configuration was changed since is rejected with a 412.
+    """
+    version = call_topics("get", course["staff"], course_key)["ETag"]
+    call_topics("post", course["staff"], course_key, NEW_TOPIC, HTTP_IF_MATCH=version)
+
+    response = call_topics(
+        "post", course["staff"], course_key, {**NEW_TOPIC, "name": "Other topic"}, HTTP_IF_MATCH=version
+    )
+
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert response["ETag"] != version
+    team_sets = modulestore().get_course(course_key).teams_configuration.cleaned_data["team_sets"]
+    assert "Other topic" not in [team_set["name"] for team_set in team_sets]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_changes_with_the_same_version(course, course_key):
+    """
+    Of two changes based on the same version, the one that comes while the
+    other is being written waits for it, and is then rejected with a 412
+    instead of overwriting it.
+    """
+    version = call_topics("get", course["staff"], course_key)["ETag"]
+    writing = threading.Event()
+    release = threading.Event()
+    update_course_advanced_settings = views.update_course_advanced_settings
+    responses = {}
+
+    def slow_update(*args, **kwargs):
+        if not writing.is_set():
+            writing.set()
+            release.wait(5)
+        return update_course_advanced_settings(*args, **kwargs)
+
+    def change(name):
+        try:
+            responses[name] = call_topics(
+                "post", course["staff"], course_key, {**NEW_TOPIC, "name": name}, HTTP_IF_MATCH=version
+            )
+        finally:
+            connections.close_all()
+
+    with mock.patch.object(views, "update_course_advanced_settings", slow_update):
+        first = threading.Thread(target=change, args=("First topic",))
+        first.start()
+        assert writing.wait(5)
+        second = threading.Thread(target=change, args=("Second topic",))
+        second.start()
+        second.join(0.5)
+        assert second.is_alive()
+        release.set()
+        first.join()
+        second.join()
+
+    assert responses["First topic"].status_code == status.HTTP_201_CREATED
+    assert responses["Second topic"].status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert responses["Second topic"]["ETag"] == responses["First topic"]["ETag"]
+    team_sets = modulestore().get_course(course_key).teams_configuration.cleaned_data["team_sets"]
+    names = [team_set["name"] for team_set in team_sets]
+    assert "First topic" in names
+    assert "Second topic" not in names
+
+
+@pytest.mark.django_db
+def test_change_while_locked(course, course_key):
+    """
+    A change that can not get the lock of the teams configuration in time is rejected with a 409.
+    """
+    with mock.patch.object(views, "course_lock") as course_lock:
+        course_lock.return_value.__enter__.return_value = False
+        response = call_topics("post", course["staff"], course_key, NEW_TOPIC)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    course_lock.assert_called_once_with(str(course_key), views.TEAMS_CONFIGURATION_LOCK)
+    team_sets = modulestore().get_course(course_key).teams_configuration.cleaned_data["team_sets"]
+    assert "New topic" not in [team_set["name"] for team_set in team_sets]
@@ -0,0 +1,101 @@
+"""
+Tests for the `platform-plugin-teams` edxapp wrappers and their backends.
+"""
+import json
+import os
+import subprocess
+import sys
+from importlib import import_module
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+from platform_plugin_teams.edxapp_wrapper import modulestore as modulestore_wrapper
+from platform_plugin_teams.edxapp_wrapper.registry import backends
+
+OTHER_MODULESTORE_BACKEND = "tests.other_modulestore_backend"
+WRAPPER_MODULES = (
+    "authentication",
+    "contentstore",
+    "courseware",
+    "modulestore",
+    "student",
+    "teams_common",
+    "teams_config",
+    "teams_lms",
+)
+IMPORTED_BACKENDS_SCRIPT = """
+import json, sys
+import django
+django.setup()
+for name in sys.argv[1:]:
+    __import__(f"platform_plugin_teams.edxapp_wrapper.{name}")
+backends = [module for module in sys.modules if module.startswith("platform_plugin_teams.edxapp_wrapper.backends.")]
+print(json.dumps(sorted(backends)))
+"""
+
+
+@pytest.fixture(name="other_modulestore_backend")
+def fixture_other_modulestore_backend(monkeypatch):
+    """
+    Another modulestore backend module, whose store is a sentinel.
+    """
+    store = object()
+    backend = ModuleType(OTHER_MODULESTORE_BACKEND)
+    backend.store = store
+    backend.modulestore = lambda: store
+    monkeypatch.setitem(sys.modules, OTHER_MODULESTORE_BACKEND, backend)
+    return backend
+
+
+def test_backend_follows_its_setting(other_modulestore_backend):
+    """
+    A backend is resolved again when its setting changes, and the wrappers call the new module.
+    """
+    default_backend = backends.modulestore
+
+    with override_settings(PLATFORM_PLUGIN_TEAMS_MODULESTORE_BACKEND=OTHER_MODULESTORE_BACKEND):
+        assert backends.modulestore is other_modulestore_backend
+        assert modulestore_wrapper.modulestore() is other_modulestore_backend.store
+
+    assert backends.modulestore is default_backend
+    assert default_backend.__name__ == settings.PLATFORM_PLUGIN_TEAMS_MODULESTORE_BACKEND
+    assert modulestore_wrapper.modulestore() is not other_modulestore_backend.store
+
+
+def test_unknown_backend():
+    """
+    An attribute that is not named after a backend setting is an `AttributeError`.
+    """
+    with pytest.raises(AttributeError):
+        backends.unknown  # pylint: disable=pointless-statement
+
+
+def test_importing_the_wrappers_does_not_import_the_backends():
+    """
+    Importing the wrappers in a new process only imports the teams common backend, needed by the signal receivers.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORTED_BACKENDS_SCRIPT, *WRAPPER_MODULES],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "test_settings")},
+        text=True,
+    ).stdout
+
+    assert json.loads(output) == [settings.PLATFORM_PLUGIN_TEAMS_TEAMS_COMMON_BACKEND]
+
+
+@pytest.mark.parametrize("wrapper_name", WRAPPER_MODULES)
+def test_unknown_wrapper_attribute(wrapper_name):
+    """
+    An attribute that a wrapper does not define nor resolve lazily is an `AttributeError`.
+    """
+    wrapper = import_module(f"platform_plugin_teams.edxapp_wrapper.{wrapper_name}")
+
+    with pytest.raises(AttributeError, match="unknown_attribute"):
+        getattr(wrapper, "unknown_attribute")
@@ -0,0 +1,116 @@
+"""
+Tests for the `platform-plugin-teams` export module.
+"""
+import csv
+import io
+import json
+
+from django.test import override_settings
+
+from platform_plugin_teams.edxapp_wrapper.modulestore import get_course
+from platform_plugin_teams.export import (
+    CSV_FIELDS,
+    MEMBERSHIP_RECORD,
+    TEAM_RECORD,
+    TEAMSET_RECORD,
+    iter_course_records,
+    iter_csv,
+    iter_ndjson,
+)
+from test_utils.models import CourseTeam, CourseTeamMembership
+
+EXPORT_BATCH_SIZE = 7
+
+
+@override_settings(PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE=EXPORT_BATCH_SIZE)
+def test_records_order(course_key, course):  # pylint: disable=unused-argument
+    """
+    The teamsets come first, then each batch of teams followed by the memberships of its teams.
+    """
+    records = list(iter_course_records(get_course(course_key)))
+
+    teams = CourseTeam.objects.filter(course_id=str(course_key)).order_by("pk")
+    team_ids = list(teams.values_list("team_id", flat=True))
+    kinds = [record["record"] for record in records]
+    assert kinds == sorted(kinds, key=lambda kind: kind != TEAMSET_RECORD)
+    assert [record["teamset_id"] for record in records[:10]] == [f"topic-{index}" for index in range(10)]
+    assert [record["team_id"] for record in records if record["record"] == TEAM_RECORD] == team_ids
+    batch = None
+    for record in records[10:]:
+        team_batch = team_ids.index(record["team_id"]) // EXPORT_BATCH_SIZE
+        if record["record"] == TEAM_RECORD:
+            # A batch of teams starts after the memberships of the previous one
+            assert batch is None or team_batch in (batch, batch + 1)
+            batch = team_batch
+        else:
+            assert team_batch == batch
+    assert batch == (len(team_ids) - 1) // EXPORT_BATCH_SIZE
+    assert kinds.count(MEMBERSHIP_RECORD) == CourseTeamMembership.objects.filter(
+        team__course_id=str(course_key)
+    ).count()
+
+
+@override_settings(PLATFORM_PLUGIN_TEAMS_EXPORT_BATCH_SIZE=EXPORT_BATCH_SIZE)
+def test_memberships_batches(course_key, course):  # pylint: disable=unused-argument
+    """
+    The memberships of a batch of teams are read in batches too, without losing or repeating any.
+    """
+    team = CourseTeam.objects.filter(course_id=str(course_key)).order_by("pk").first()
+    memberships = CourseTeamMembership.objects.filter(team__course_id=str(course_key))
+    usernames = set(memberships.values_list("user__username", flat=True))
+
+    records = list(iter_course_records(get_course(course_key)))
+
+    exported = [
+        (record["team_id"], record["username"]) for record in records if record["record"] == MEMBERSHIP_RECORD
+    ]
+    assert len(exported) == len(set(exported)) == memberships.count()
+    assert {username for _team_id, username in exported} == usernames
+    assert sum(team_id == team.team_id for team_id, _username in exported) == team.membership.count()
+
+
+def test_ndjson(course_key, course):  # pylint: disable=unused-argument
+    """
+    Each record is rendered as a JSON object in its own line.
+    """
+    records = list(iter_course_records(get_course(course_key)))
+
+    content = b"".join(iter_ndjson(records)).decode("utf-8")
+
+    assert content.endswith("\n")
+    assert [json.loads(line) for line in content.splitlines()] == records
+
+
+def test_csv():
+    """
+    The records are rendered as rows of the CSV columns, after the header.
+    """
+    records = [
+        {"record": TEAMSET_RECORD, "teamset_id": "topic-1", "name": "Topic 1", "max_team_size": 5},
+        {"record": TEAM_RECORD, "teamset_id": "topic-1", "team_id": "team-1", "organization_protected": False},
+        {"record": MEMBERSHIP_RECORD, "teamset_id": "topic-1", "team_id": "team-1", "username": "learner"},
+    ]
+
+    rows = list(csv.reader(io.StringIO(b"".join(iter_csv(records)).decode("utf-8"))))
+
+    assert rows[0] == list(CSV_FIELDS)
+    assert [dict(zip(CSV_FIELDS, row)) for row in rows[1:]] == [
+        {field: str(record.get(field, "")) for field in CSV_FIELDS} for record in records
+    ]
+
+
+def test_csv_escapes_formulas():
+    """
+    The text values that a spreadsheet would read as a formula are prefixed with a quote.
+    """
+    names = ["=1+2", "+1", "-1", "@SUM(A1)", "\tTab", "\rReturn", "Team = 1", ""]
+    records = [
+        {"record": TEAM_RECORD, "name": name, "description": name, "team_size": -1} for name in names
+    ]
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(iter_csv(records)).decode("utf-8"), newline="")))
+
+    escaped = ["'=1+2", "'+1", "'-1", "'@SUM(A1)", "'\tTab", "'\rReturn", "Team = 1", ""]
+    assert [row["name"] for row in rows] == escaped
+    assert [row["description"] for row in rows] == escaped
+    assert [row["team_size"] for row in rows] == ["-1"] * len(names)
@@ -0,0 +1,162 @@
+"""
+Tests for the `platform-plugin-teams` team formation module.
+"""
+# pylint: disable=redefined-outer-name
+from collections import Counter
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from platform_plugin_teams.formation import TeamFormationError, form_teams_job, get_formation_slots, plan_team_formation
+from platform_plugin_teams.jobs import Job
+from platform_plugin_teams.memberships import add_memberships
+from test_utils.models import CourseEnrollment, CourseTeam, CourseTeamMembership, UserProfile
+
+User = get_user_model()
+
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+TOPIC_ID = "topic-1"
+COUNTRIES = ("CO", "FR", "US")
+
+
+def get_final_sizes(team_sizes: list, learner_count: int, max_team_size: int = None) -> list:
+    """
+    Get the size of each team after placing the learners on the formation slots.
+    """
+    new_team_count, slots = get_formation_slots(team_sizes, learner_count, max_team_size)
+    final_sizes = list(team_sizes) + [0] * new_team_count
+    for team_index in slots:
+        final_sizes[team_index] += 1
+    return final_sizes
+
+
+@pytest.mark.parametrize(
+    "team_sizes, learner_count, max_team_size, expected_sizes",
+    [
+        ([], 10, 4, [4, 3, 3]),
+        ([0, 0], 5, 4, [3, 2]),
+        ([3, 0, 1], 4, 4, [3, 2, 3]),
+        ([3, 0, 1], 8, 4, [4, 4, 4]),
+        ([3, 0, 1], 9, 4, [4, 3, 3, 3]),
+        ([4, 4], 2, 4, [4, 4, 2]),
+        ([2, 5], 3, None, [5, 5]),
+        ([1, 1], 0, 4, [1, 1]),
+    ],
+)
+def test_get_formation_slots(team_sizes, learner_count, max_team_size, expected_sizes):
+    """
+    The learners fill the smallest teams first, and new teams are only created for the learners that do not fit.
+    """
+    assert sorted(get_final_sizes(team_sizes, learner_count, max_team_size), reverse=True) == sorted(
+        expected_sizes, reverse=True
+    )
+
+
+@pytest.mark.parametrize("learner_count", [1, 7, 100, 1001])
+def test_get_formation_slots_spreads_consecutive_places(learner_count):
+    """
+    Consecutive places of a level are on different teams, and no team exceeds the maximum team size.
+    """
+    team_sizes = [0, 3, 1, 2, 0, 5]
+    new_team_count, slots = get_formation_slots(team_sizes, learner_count, 6)
+
+    final_sizes = get_final_sizes(team_sizes, learner_count, 6)
+    assert len(slots) == learner_count
+    assert max(final_sizes) <= 6
+    assert new_team_count == max(0, -(-(learner_count - sum(6 - size for size in team_sizes)) // 6))
+    for start in range(0, learner_count, len(final_sizes)):
+        window = list(slots[start:start + len(final_sizes)])
+        assert all(first != second for first, second in zip(window, window[1:]))
+
+
+def test_get_formation_slots_without_teams_nor_max_team_size():
+    """
+    Learners can not be placed on a topic without teams nor maximum team size.
+    """
+    with pytest.raises(TeamFormationError):
+        get_formation_slots([], 3)
+
+
+@pytest.fixture
+def learners(db):  # pylint: disable=unused-argument
+    """
+    Twelve enrolled learners, four of each country, with one already on a team of the topic.
+    """
+    users = []
+    for index in range(12):
+        user = User.objects.create(username=f"learner-{index}", email=f"learner-{index}@example.com")
+        UserProfile.objects.create(user=user, country=COUNTRIES[index % len(COUNTRIES)])
+        CourseEnrollment.objects.create(user=user, course_id=COURSE_ID)
+        users.append(user)
+
+    team = CourseTeam.objects.create(team_id="team-1", name="Team 1", course_id=COURSE_ID, topic_id=TOPIC_ID)
+    CourseTeamMembership.objects.create(user=users[0], team=team, last_activity_at=timezone.now())
+    team.team_size = 1
+    team.save()
+    return users
+
+
+def test_plan_team_formation(learners):
+    """
+    The learners not on a team of the topic are planned on the teams, spread evenly by the balanced attribute.
+    """
+    plan = plan_team_formation(COURSE_ID, TOPIC_ID, max_team_size=4, balance_by="country")
+
+    assert sorted(plan.usernames) == sorted(learner.username for learner in learners[1:])
+    assert plan.new_team_names == ["Team 2", "Team 3"]
+    team_sizes = Counter(plan.team_indexes)
+    assert team_sizes[0] == 3
+    assert sorted(team_sizes.values()) == [3, 4, 4]
+
+    countries_by_learner = {learner.id: learner.profile.country for learner in learners}
+    for country in COUNTRIES:
+        country_teams = Counter(
+            team_index
+            for user_id, team_index in zip(plan.user_ids, plan.team_indexes)
+            if countries_by_learner[user_id] == country
+        )
+        assert max(country_teams.values()) - min(country_teams.values()) <= 1
+
+
+def test_form_teams_job(learners):
+    """
+    The plan is applied, and the learners that joined a team of the topic since are reported.
+    """
+    job = Job("formation", "team_formation", learners[0].id, COURSE_ID, 0)
+    other_topic_team = CourseTeam.objects.create(
+        team_id="team-other", name="Other", course_id=COURSE_ID, topic_id="topic-2"
+    )
+    CourseTeamMembership.objects.create(user=learners[1], team=other_topic_team, last_activity_at=timezone.now())
+
+    form_teams_job(job, COURSE_ID, TOPIC_ID, 4, "country", "Team")
+
+    teams = CourseTeam.objects.filter(course_id=COURSE_ID, topic_id=TOPIC_ID)
+    assert job.total == job.processed == 11
+    assert job.failed == 0
+    assert teams.count() == 3
+    assert all(team.team_size == team.membership.count() <= 4 for team in teams)
+    assert CourseTeamMembership.objects.filter(team__topic_id=TOPIC_ID).count() == 12
+
+
+def test_add_memberships_skips_full_teams(learners):
+    """
+    The users of a team filled since the plan are skipped instead of overfilling it.
+    """
+    team = CourseTeam.objects.get(team_id="team-1")
+
+    skipped_user_ids = add_memberships(
+        COURSE_ID,
+        TOPIC_ID,
+        [(team.pk, learner.id) for learner in learners[:4]],
+        max_team_size=2,
+    )
+
+    team.refresh_from_db()
+    assert skipped_user_ids == {
+        learners[0].id: "The user is already on a team of the topic.",
+        learners[2].id: "The team is full.",
+        learners[3].id: "The team is full.",
+    }
+    assert team.team_size == 2
+    assert set(team.membership.values_list("user_id", flat=True)) == {learners[0].id, learners[1].id}
@@ -0,0 +1,98 @@
+"""
+Tests for the `platform-plugin-teams` request instrumentation.
+"""
+import json
+import logging
+import re
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from platform_plugin_teams.instrumentation import RequestTimings, instrument, should_sample, timed, timed_phase
+from tests.test_topics_api import get_topics
+
+SERVER_TIMING_ENTRY = re.compile(r'^[a-z]+;dur=\d+\.\d(;desc="\d+ calls")?$')
+
+
+def test_timings_to_header():
+    """
+    The timings are a `Server-Timing` value with the total first and the calls of each phase.
+    """
+    timings = RequestTimings()
+    timings.add("db", 0.002)
+    timings.add("db", 0.0011)
+    timings.add("access", 0.0005)
+    timings.duration = 0.0125
+
+    assert timings.to_header() == 'total;dur=12.5, db;dur=3.1;desc="2 calls", access;dur=0.5;desc="1 calls"'
+    assert timings.to_dict() == {
+        "total_ms": 12.5,
+        "phases": {"db": {"ms": 3.1, "calls": 2}, "access": {"ms": 0.5, "calls": 1}},
+    }
+
+
+def test_phases_are_only_recorded_while_instrumenting():
+    """
+    The timed blocks and functions only record their calls in an instrumented block.
+    """
+    timed_function = timed("course")(lambda: "result")
+
+    with timed_phase("serialize"):
+        assert timed_function() == "result"
+    with instrument() as timings:
+        with timed_phase("serialize"):
+            timed_function()
+        timed_function()
+
+    assert {phase: count for phase, (_, count) in timings.phases.items()} == {"serialize": 1, "course": 2}
+    assert timings.duration is not None
+
+
+@pytest.mark.parametrize(
+    "sample_rate, random_value, sampled",
+    [(0, 0.0, False), (0.5, 0.49, True), (0.5, 0.5, False), (1, 0.99, True)],
+)
+def test_should_sample(sample_rate, random_value, sampled):
+    """
+    A request is sampled when the random draw is below the sample rate, and never with a rate of 0.
+    """
+    with override_settings(PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE=sample_rate), mock.patch(
+        "platform_plugin_teams.instrumentation.random.random", return_value=random_value
+    ):
+        assert should_sample() is sampled
+
+
+@pytest.mark.django_db
+def test_sampled_request(course, course_key, caplog):
+    """
+    A sampled request returns its timings in the `Server-Timing` header, and logs them as a JSON line.
+    """
+    with override_settings(PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE=1), caplog.at_level(
+        logging.INFO, logger="platform_plugin_teams.instrumentation"
+    ):
+        response = get_topics(course["staff"], course_key)
+
+    entries = response["Server-Timing"].split(", ")
+    assert entries[0].startswith("total;dur=")
+    assert all(SERVER_TIMING_ENTRY.match(entry) for entry in entries)
+    assert {entry.split(";")[0] for entry in entries} >= {"total", "db", "course", "access", "serialize"}
+
+    log_line = next(record.getMessage() for record in caplog.records if "Request timings" in record.getMessage())
+    logged = json.loads(log_line.split("Request timings: ", 1)[1])
+    assert logged["view"] == "TopicsReadOnlyAPIView"
+    assert logged["method"] == "GET"
+    assert logged["course_id"] == str(course_key)
+    assert logged["status_code"] == 200
+    assert logged["phases"]["db"]["calls"] > 0
+
+
+@pytest.mark.django_db
+def test_request_not_sampled(course, course_key):
+    """
+    A request that is not sampled has no `Server-Timing` header.
+    """
+    with override_settings(PLATFORM_PLUGIN_TEAMS_INSTRUMENTATION_SAMPLE_RATE=0):
+        response = get_topics(course["staff"], course_key)
+
+    assert not response.has_header("Server-Timing")
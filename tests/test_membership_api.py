@@ -0,0 +1,103 @@
+"""
+Tests for the `platform-plugin-teams` LMS team membership API.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from edx_django_utils.cache import RequestCache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.lms.views import TeamMembershipAPIView
+from test_utils.models import CourseTeam, CourseTeamMembership
+
+User = get_user_model()
+
+factory = APIRequestFactory()
+
+
+def add_memberships(user, course_key, data):
+    """
+    Call the team membership view as a new request of the user.
+    """
+    RequestCache.clear_all_namespaces()
+    request = factory.post("/team-membership/", data, format="json")
+    force_authenticate(request, user=user)
+    return TeamMembershipAPIView.as_view()(request, course_id=str(course_key))
+
+
+@pytest.mark.django_db
+def test_add_memberships(course, course_key):
+    """
+    The users are added to the team, and each membership is returned with its user and team.
+    """
+    team_id = course["open_team_ids"][0]
+    learners = list(User.objects.filter(username__startswith="test-learner-").order_by("pk")[:2])
+
+    response = add_memberships(
+        course["staff"], course_key, {"team_id": team_id, "usernames": [learners[0].username, learners[1].email]}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    memberships = response.data["memberships"]
+    assert [membership["user"]["username"] for membership in memberships] == [
+        learner.username for learner in learners
+    ]
+    for membership in memberships:
+        assert membership["team"]["team_id"] == team_id
+        assert membership["date_joined"]
+        assert membership["last_activity_at"]
+    assert CourseTeamMembership.objects.filter(team__team_id=team_id, user__in=learners).count() == 2
+    team = CourseTeam.objects.get(team_id=team_id)
+    assert team.team_size == CourseTeamMembership.objects.filter(team=team).count()
+
+
+@pytest.mark.django_db
+def test_add_missing_user(course, course_key):
+    """
+    A username that does not exist is a 404 about that username, and no user is added.
+    """
+    team_id = course["open_team_ids"][0]
+    team_size = CourseTeam.objects.get(team_id=team_id).team_size
+
+    response = add_memberships(
+        course["staff"], course_key, {"team_id": team_id, "usernames": [course["learner"].username, "missing"]}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "missing" in str(response.data["field_errors"]["usernames"])
+    assert CourseTeam.objects.get(team_id=team_id).team_size == team_size
+
+
+@pytest.mark.django_db
+def test_add_not_enrolled_user(course, course_key):
+    """
+    A user that is not enrolled in the course is a 400 about that user.
+    """
+    User.objects.create(username="not-enrolled", email="not-enrolled@example.com")
+
+    response = add_memberships(
+        course["staff"], course_key, {"team_id": course["open_team_ids"][0], "usernames": ["not-enrolled"]}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "not-enrolled" in str(response.data["field_errors"]["usernames"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "usernames",
+    ["test-learner-0", [1, 2], [{"username": "test-learner-0"}], ["test-learner-0", None]],
+    ids=["string", "integers", "objects", "null"],
+)
+def test_add_invalid_usernames(course, course_key, usernames):
+    """
+    Usernames that are not a list of strings are a 400 about the usernames.
+    """
+    team_id = course["open_team_ids"][0]
+    team_size = CourseTeam.objects.get(team_id=team_id).team_size
+
+    response = add_memberships(course["staff"], course_key, {"team_id": team_id, "usernames": usernames})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "list of usernames" in str(response.data["field_errors"]["usernames"])
+    assert CourseTeam.objects.get(team_id=team_id).team_size == team_size
@@ -0,0 +1,255 @@
+"""
+Tests for the `platform-plugin-teams` memberships module.
+"""
+import threading
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from platform_plugin_teams.memberships import (
+    TeamCapacityExceeded,
+    add_users_to_team,
+    get_users_by_username_or_email,
+    lock_teams,
+)
+from test_utils.models import CourseTeam, CourseTeamMembership, UserRetirementRequest
+
+User = get_user_model()
+
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+MAX_TEAM_SIZE = 5
+CONCURRENT_JOINS = 30
+
+
+@pytest.mark.skipif(
+    not connection.features.has_select_for_update,
+    reason="The database does not support row locks, as the MySQL database of the platform does.",
+)
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_joins_do_not_exceed_max_team_size():
+    """
+    Many users joining the same team at the same time never overfill it.
+    """
+    team = CourseTeam.objects.create(
+        team_id="team-1", name="Team 1", course_id=COURSE_ID, topic_id="topic-1"
+    )
+    users = [
+        User.objects.create(username=f"user-{index}", email=f"user-{index}@example.com")
+        for index in range(CONCURRENT_JOINS)
+    ]
+    barrier = threading.Barrier(CONCURRENT_JOINS)
+    results = []
+
+    def join(user):
+        barrier.wait()
+        try:
+            add_users_to_team(team, [user], max_team_size=MAX_TEAM_SIZE)
+            results.append("joined")
+        except TeamCapacityExceeded:
+            results.append("full")
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=join, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    team.refresh_from_db()
+    members = CourseTeamMembership.objects.filter(team=team).count()
+    assert len(results) == CONCURRENT_JOINS
+    assert members <= MAX_TEAM_SIZE
+    assert members == results.count("joined") == MAX_TEAM_SIZE
+    assert results.count("full") == CONCURRENT_JOINS - MAX_TEAM_SIZE
+    assert team.team_size == members
+
+
+@pytest.mark.django_db(transaction=True)
+def test_serialized_joins_count_the_members_under_the_lock():
+    """
+    Joins one after the other fill the team up to its maximum size, and each
+    join counts the members after locking the team, in the transaction that
+    adds the users, so a concurrent join can not change the count before the
+    insert. Runs on every database, unlike the concurrent joins test.
+    """
+    team = CourseTeam.objects.create(
+        team_id="team-1", name="Team 1", course_id=COURSE_ID, topic_id="topic-1"
+    )
+    users = [
+        User.objects.create(username=f"user-{index}", email=f"user-{index}@example.com")
+        for index in range(MAX_TEAM_SIZE + 2)
+    ]
+    membership_table = CourseTeamMembership._meta.db_table  # pylint: disable=protected-access
+    executed = []
+
+    def record_query(execute, sql, params, many, context):
+        executed.append((sql, connection.in_atomic_block))
+        return execute(sql, params, many, context)
+
+    def record_lock(team_pks):
+        executed.append(("LOCK", connection.in_atomic_block))
+        lock_teams(team_pks)
+
+    results = []
+    with connection.execute_wrapper(record_query), mock.patch(
+        "platform_plugin_teams.memberships.lock_teams", side_effect=record_lock
+    ):
+        for user in users:
+            executed.clear()
+            try:
+                add_users_to_team(team, [user], max_team_size=MAX_TEAM_SIZE)
+                results.append("joined")
+            except TeamCapacityExceeded:
+                results.append("full")
+
+            lock_index = executed.index(("LOCK", True))
+            count_indexes = [
+                index
+                for index, (sql, _in_atomic_block) in enumerate(executed)
+                if sql.startswith(f'SELECT "{membership_table}"."user_id"')
+            ]
+            assert len(count_indexes) == 1
+            count_index = count_indexes[0]
+            assert count_index > lock_index
+            last_index = count_index if results[-1] == "full" else next(
+                index for index, (sql, _in_atomic_block) in enumerate(executed)
+                if sql.startswith(f'INSERT INTO "{membership_table}"')
+            )
+            assert all(in_atomic_block for _sql, in_atomic_block in executed[lock_index:last_index + 1])
+
+    team.refresh_from_db()
+    assert results == ["joined"] * MAX_TEAM_SIZE + ["full"] * 2
+    assert CourseTeamMembership.objects.filter(team=team).count() == team.team_size == MAX_TEAM_SIZE
+
+
+@pytest.mark.django_db
+def test_join_full_team():
+    """
+    Adding more users than the space left in the team adds none of them.
+    """
+    team = CourseTeam.objects.create(
+        team_id="team-1", name="Team 1", course_id=COURSE_ID, topic_id="topic-1"
+    )
+    users = [
+        User.objects.create(username=f"user-{index}", email=f"user-{index}@example.com")
+        for index in range(3)
+    ]
+    add_users_to_team(team, users[:2], max_team_size=2)
+
+    with pytest.raises(TeamCapacityExceeded):
+        add_users_to_team(team, users[2:], max_team_size=2)
+
+    assert CourseTeamMembership.objects.filter(team=team).count() == 2
+
+
+@pytest.mark.django_db
+def test_get_users_by_username_or_email():
+    """
+    The identifiers are stripped, and the users that requested their retirement are not found.
+    """
+    user = User.objects.create(username="user-1", email="user-1@example.com")
+    retired_user = User.objects.create(username="user-2", email="user-2@example.com")
+    UserRetirementRequest.objects.create(user=retired_user)
+
+    users = get_users_by_username_or_email([" user-1 ", "user-1@example.com", "user-2", "missing"])
+
+    assert users == {" user-1 ": user, "user-1@example.com": user}
+
+
+@pytest.mark.django_db
+def test_get_users_by_username_or_email_ignores_case():
+    """
+    The identifiers match the users in any case, as they do with the collation of the platform database.
+    """
+    user = User.objects.create(username="user-1", email="user-1@example.com")
+    other_user = User.objects.create(username="user-2", email="user-2@example.com")
+
+    users = get_users_by_username_or_email(["User-1", " USER-1@EXAMPLE.COM ", "USER-3"])
+
+    assert users == {"User-1": user, " USER-1@EXAMPLE.COM ": user}
+    assert other_user not in users.values()
+
+
+@pytest.mark.django_db
+def test_add_users_to_team_sends_post_save():
+    """
+    The created memberships and the changed teams send their `post_save` signals,
+    and the team the users joined has a new `last_activity_at`.
+    """
+    team = CourseTeam.objects.create(
+        team_id="team-1", name="Team 1", course_id=COURSE_ID, topic_id="topic-1"
+    )
+    old_team = CourseTeam.objects.create(
+        team_id="team-2", name="Team 2", course_id=COURSE_ID, topic_id="topic-1"
+    )
+    users = [
+        User.objects.create(username=f"user-{index}", email=f"user-{index}@example.com")
+        for index in range(3)
+    ]
+    CourseTeamMembership.objects.create(user=users[0], team=old_team, last_activity_at=timezone.now())
+    receiver = mock.Mock()
+    post_save.connect(receiver)
+
+    try:
+        memberships = add_users_to_team(team, users)
+    finally:
+        post_save.disconnect(receiver)
+
+    saved = [(call.kwargs["sender"], call.kwargs["instance"]) for call in receiver.call_args_list]
+    assert [membership.user for membership in memberships] == users
+    assert all(membership.pk for membership in memberships)
+    assert {(sender, instance.pk) for sender, instance in saved} == {
+        *((CourseTeamMembership, membership.pk) for membership in memberships),
+        (CourseTeam, team.pk),
+        (CourseTeam, old_team.pk),
+    }
+    assert all(
+        call.kwargs["created"] == (call.kwargs["sender"] is CourseTeamMembership)
+        for call in receiver.call_args_list
+    )
+    team.refresh_from_db()
+    old_team.refresh_from_db()
+    assert team.team_size == 3
+    assert team.last_activity_at == memberships[0].last_activity_at
+    assert old_team.team_size == 0
+
+
+@pytest.mark.django_db
+def test_add_users_to_team_locks_teams_in_order():
+    """
+    The team and the teams the users leave are locked in primary key order before they are changed.
+    """
+    old_teams = [
+        CourseTeam.objects.create(
+            team_id=f"team-{index}", name=f"Team {index}", course_id=COURSE_ID, topic_id="topic-1"
+        )
+        for index in range(2)
+    ]
+    team = CourseTeam.objects.create(
+        team_id="team-2", name="Team 2", course_id=COURSE_ID, topic_id="topic-1"
+    )
+    users = [
+        User.objects.create(username=f"user-{index}", email=f"user-{index}@example.com")
+        for index in range(2)
+    ]
+    for user, old_team in zip(users, reversed(old_teams)):
+        CourseTeamMembership.objects.create(user=user, team=old_team, last_activity_at=timezone.now())
+
+    with CaptureQueriesContext(connection) as queries, mock.patch.object(
+        CourseTeam.objects, "select_for_update", wraps=CourseTeam.objects.select_for_update
+    ) as select_for_update:
+        add_users_to_team(team, users, max_team_size=2)
+
+    locking_query = next(
+        query["sql"] for query in queries.captured_queries if '"id" IN' in query["sql"]
+    )
+    assert select_for_update.call_count == 1
+    locked_pks = locking_query.split(" IN (")[1].split(")")[0].split(", ")
+    assert sorted(map(int, locked_pks)) == sorted([old_teams[0].pk, old_teams[1].pk, team.pk])
+    assert locking_query.endswith('ORDER BY "test_utils_courseteam"."id" ASC')
@@ -0,0 +1,90 @@
+"""
+Tests for the `platform-plugin-teams` metrics backends.
+"""
+import socket
+
+import pytest
+from django.test import override_settings
+
+from platform_plugin_teams.metrics import InProcessMetricsBackend, StatsdMetricsBackend, get_course_size
+
+
+def test_render_counters():
+    """
+    The counters are rendered as Prometheus counters, declared once, with their escaped labels.
+    """
+    backend = InProcessMetricsBackend()
+    backend.increment("memberships.added", 3)
+    backend.increment("memberships.added", 2)
+    backend.increment("memberships.rejected", tags={"reason": 'say "no"\n'})
+    backend.increment("memberships.rejected", tags={"reason": "capacity"})
+
+    assert backend.render() == (
+        "# TYPE platform_plugin_teams_memberships_added_total counter\n"
+        "platform_plugin_teams_memberships_added_total 5\n"
+        "# TYPE platform_plugin_teams_memberships_rejected_total counter\n"
+        'platform_plugin_teams_memberships_rejected_total{reason="capacity"} 1\n'
+        'platform_plugin_teams_memberships_rejected_total{reason="say \\"no\\"\\n"} 1\n'
+    )
+
+
+def test_render_histograms():
+    """
+    The durations are rendered as Prometheus histograms, with cumulative buckets, sum and count.
+    """
+    backend = InProcessMetricsBackend()
+    backend.timing("request.duration", 0.003, {"view": "Topics"})
+    backend.timing("request.duration", 0.2, {"view": "Topics"})
+    backend.timing("request.duration", 20, {"view": "Topics"})
+
+    lines = backend.render().splitlines()
+
+    assert lines[0] == "# TYPE platform_plugin_teams_request_duration_seconds histogram"
+    assert 'platform_plugin_teams_request_duration_seconds_bucket{view="Topics",le="0.005"} 1' in lines
+    assert 'platform_plugin_teams_request_duration_seconds_bucket{view="Topics",le="0.1"} 1' in lines
+    assert 'platform_plugin_teams_request_duration_seconds_bucket{view="Topics",le="0.25"} 2' in lines
+    assert 'platform_plugin_teams_request_duration_seconds_bucket{view="Topics",le="10"} 2' in lines
+    assert 'platform_plugin_teams_request_duration_seconds_bucket{view="Topics",le="+Inf"} 3' in lines
+    assert 'platform_plugin_teams_request_duration_seconds_sum{view="Topics"} 20.203' in lines
+    assert 'platform_plugin_teams_request_duration_seconds_count{view="Topics"} 3' in lines
+
+
+@pytest.fixture
+def statsd_server():
+    """
+    A UDP socket standing for the statsd server.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(1)
+    yield server
+    server.close()
+
+
+def test_statsd_lines(statsd_server):  # pylint: disable=redefined-outer-name
+    """
+    The metrics are sent as statsd lines, with the durations in milliseconds and the tags in the DogStatsD format.
+    """
+    with override_settings(
+        PLATFORM_PLUGIN_TEAMS_STATSD_HOST="127.0.0.1",
+        PLATFORM_PLUGIN_TEAMS_STATSD_PORT=statsd_server.getsockname()[1],
+    ):
+        backend = StatsdMetricsBackend()
+
+    backend.increment("memberships.added", 3)
+    backend.increment("memberships.rejected", tags={"reason": "capacity", "endpoint": "membership"})
+    backend.timing("request.duration", 0.0125, {"view": "Topics"})
+
+    assert [statsd_server.recv(1024).decode("utf-8") for _ in range(3)] == [
+        "platform_plugin_teams.memberships.added:3|c",
+        "platform_plugin_teams.memberships.rejected:1|c|#endpoint:membership,reason:capacity",
+        "platform_plugin_teams.request.duration:12.500|ms|#view:Topics",
+    ]
+
+
+@pytest.mark.parametrize("team_count, size", [(0, "small"), (999, "small"), (1000, "medium"), (10000, "large")])
+def test_get_course_size(team_count, size):
+    """
+    The courses are sized by their number of teams.
+    """
+    assert get_course_size(team_count) == size
@@ -0,0 +1,95 @@
+"""
+Tests for the `platform-plugin-teams` request profiling.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.views import ProfileAPIView
+from platform_plugin_teams.profiling import PROFILE_HEADER, RequestProfile
+from tests.test_topics_api import get_topics
+
+User = get_user_model()
+factory = APIRequestFactory()
+
+
+@pytest.fixture(name="global_staff")
+def fixture_global_staff():
+    """
+    A user of the global staff.
+    """
+    return User.objects.create(username="test-global-staff", email="test-global-staff@example.com", is_staff=True)
+
+
+def get_profile(user, course_key, profile_id):
+    """
+    Call the profiles view as a new request of the user.
+    """
+    request = factory.get(f"/profiles/{profile_id}/")
+    force_authenticate(request, user=user)
+    return ProfileAPIView.as_view()(request, course_id=str(course_key), profile_id=profile_id)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, headers",
+    [({"profile": "1"}, {}), ({}, {"HTTP_X_PLATFORM_PLUGIN_TEAMS_PROFILE": "1"})],
+    ids=["query_parameter", "header"],
+)
+def test_profiled_request(course, course_key, global_staff, params, headers):  # pylint: disable=unused-argument
+    """
+    A request of the global staff asking for a profile is profiled, and its profile is stored.
+    """
+    response = get_topics(global_staff, course_key, params, **headers)
+    profile = RequestProfile.get(response[PROFILE_HEADER])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert profile.user_id == global_staff.id
+    assert profile.course_id == str(course_key)
+    assert profile.view == "TopicsReadOnlyAPIView"
+    assert profile.status_code == status.HTTP_200_OK
+    assert profile.functions
+    assert profile.query_count == len(profile.queries) > 0
+    assert all("sql" in query and "params" not in query for query in profile.queries)
+
+
+@pytest.mark.django_db
+def test_get_profile(course, course_key, global_staff):
+    """
+    The profiles can only be read by the global staff, from the course of the profiled request.
+    """
+    profile_id = get_topics(global_staff, course_key, {"profile": "1"})[PROFILE_HEADER]
+
+    response = get_profile(global_staff, course_key, profile_id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == RequestProfile.get(profile_id).to_dict()
+    assert get_profile(course["staff"], course_key, profile_id).status_code == status.HTTP_403_FORBIDDEN
+    assert get_profile(course["learner"], course_key, profile_id).status_code == status.HTTP_403_FORBIDDEN
+    assert get_profile(global_staff, "course-v1:edX+Other+Course", profile_id).status_code == status.HTTP_404_NOT_FOUND
+    assert get_profile(global_staff, course_key, "unknown").status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_profile_ignored_for_non_staff(course, course_key):
+    """
+    The profiles asked by users outside the global staff are ignored.
+    """
+    response = get_topics(course["staff"], course_key, {"profile": "1"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header(PROFILE_HEADER)
+
+
+@pytest.mark.django_db
+@override_settings(PLATFORM_PLUGIN_TEAMS_PROFILING_ENABLED=False)
+def test_profiling_disabled(course, course_key, global_staff):  # pylint: disable=unused-argument
+    """
+    No request is profiled when the profiling is disabled.
+    """
+    response = get_topics(global_staff, course_key, {"profile": "1"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header(PROFILE_HEADER)
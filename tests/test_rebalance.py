@@ -0,0 +1,126 @@
+"""
+Tests for the `platform-plugin-teams` team rebalancing module.
+"""
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from platform_plugin_teams.rebalance import RebalanceError, get_rebalance_transfers, plan_rebalance, rebalance_teams
+from test_utils.models import CourseTeam, CourseTeamMembership
+
+User = get_user_model()
+
+COURSE_ID = "course-v1:edX+DemoX+Demo_Course"
+TOPIC_ID = "topic-1"
+
+
+def apply_transfers(team_sizes: list, transfers: list) -> list:
+    """
+    Get the size of each team after the transfers.
+    """
+    team_sizes = list(team_sizes)
+    for from_index, to_index, count in transfers:
+        assert from_index != to_index
+        assert count > 0
+        team_sizes[from_index] -= count
+        team_sizes[to_index] += count
+    return team_sizes
+
+
+@pytest.mark.parametrize(
+    "team_sizes, min_size, max_size",
+    [
+        ([8, 2, 2], 4, 4),
+        ([7, 0, 1, 4], 2, 4),
+        ([6, 6, 0], 3, 5),
+        ([1, 1, 9], 2, 5),
+        ([3, 3, 3], 3, 3),
+        ([10, 0, 0, 0, 0], 1, 3),
+        ([0, 0, 0, 5], 0, 2),
+    ],
+)
+def test_get_rebalance_transfers(team_sizes, min_size, max_size):
+    """
+    The teams end within the range with the minimum number of moves.
+    """
+    transfers = get_rebalance_transfers(team_sizes, min_size, max_size)
+
+    final_sizes = apply_transfers(team_sizes, transfers)
+    surplus = sum(max(0, size - max_size) for size in team_sizes)
+    deficit = sum(max(0, min_size - size) for size in team_sizes)
+    assert all(min_size <= size <= max_size for size in final_sizes)
+    assert sum(count for _, _, count in transfers) == max(surplus, deficit)
+
+
+@pytest.mark.parametrize(
+    "team_sizes, min_size, max_size",
+    [
+        ([5, 5], 6, 8),
+        ([9, 9], 2, 4),
+        ([3, 3], 4, 2),
+    ],
+)
+def test_get_rebalance_transfers_infeasible(team_sizes, min_size, max_size):
+    """
+    A range the members can not fit in is rejected.
+    """
+    with pytest.raises(RebalanceError):
+        get_rebalance_transfers(team_sizes, min_size, max_size)
+
+
+@pytest.fixture
+def teams(db):  # pylint: disable=unused-argument
+    """
+    Three teams of the topic, with 7, 1 and 1 members.
+    """
+    now = timezone.now()
+    topic_teams = [
+        CourseTeam.objects.create(
+            team_id=f"team-{index}", name=f"Team {index}", course_id=COURSE_ID, topic_id=TOPIC_ID
+        )
+        for index in range(3)
+    ]
+    user_index = 0
+    for team, size in zip(topic_teams, (7, 1, 1)):
+        for offset in range(size):
+            user = User.objects.create(username=f"user-{user_index}", email=f"user-{user_index}@example.com")
+            membership = CourseTeamMembership.objects.create(user=user, team=team, last_activity_at=now)
+            CourseTeamMembership.objects.filter(pk=membership.pk).update(
+                date_joined=now - timedelta(minutes=size - offset)
+            )
+            user_index += 1
+        team.team_size = size
+        team.save()
+    return topic_teams
+
+
+def test_rebalance_teams(teams):  # pylint: disable=redefined-outer-name
+    """
+    The preview matches the applied moves, the last joined members are moved, and the changes send `post_save`.
+    """
+    preview = plan_rebalance(COURSE_ID, TOPIC_ID)
+    receiver = mock.Mock()
+    post_save.connect(receiver)
+
+    try:
+        moves = rebalance_teams(COURSE_ID, TOPIC_ID)
+    finally:
+        post_save.disconnect(receiver)
+
+    assert moves == preview
+    assert [move.username for move in moves] == ["user-6", "user-5", "user-4", "user-3"]
+    assert {move.from_team_id for move in moves} == {"team-0"}
+    for team in teams:
+        team.refresh_from_db()
+        assert team.team_size == team.membership.count() == 3
+    assert teams[1].last_activity_at > teams[0].last_activity_at
+
+    saved = {(call.kwargs["sender"], call.kwargs["instance"].pk) for call in receiver.call_args_list}
+    assert saved == {
+        *((CourseTeamMembership, move.membership_pk) for move in moves),
+        *((CourseTeam, team.pk) for team in teams),
+    }
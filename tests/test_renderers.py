@@ -0,0 +1,122 @@
+"""
+Tests for the `platform-plugin-teams` fast JSON renderer.
+"""
+import datetime
+import decimal
+import uuid
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+
+from platform_plugin_teams.api.lms.views import TopicsReadOnlyAPIView
+from platform_plugin_teams.renderers import FastJSONRenderer
+from tests.test_topics_api import get_topics
+
+pytest.importorskip("orjson")
+
+PARITY_DATA = [
+    {},
+    [],
+    {"count": 2, "next": None, "previous": None, "results": [{"id": "topic-1", "teams": []}]},
+    {"name": "Équipe é \U0001f600", "quote": '"\\/', "control": "\x00\x1f", "terminators": "  "},
+    {"true": True, "false": False, "int": -(2 ** 63), "float": 0.1, "negative": -12.5},
+    {
+        "datetime": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+        "naive": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "date": datetime.date(2024, 1, 2),
+        "time": datetime.time(3, 4, 5),
+        "timedelta": datetime.timedelta(days=1, seconds=2),
+        "decimal": decimal.Decimal("1.10"),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "lazy": gettext_lazy("Team"),
+        "tuple": (1, "2"),
+    },
+    # The cases rendered by the DRF renderer, as orjson does not support them
+    {1: "integer key"},
+    {"big": 2 ** 64},
+]
+
+
+@pytest.mark.parametrize("data", PARITY_DATA)
+def test_parity(data):
+    """
+    The fast renderer renders the same JSON as the DRF renderer.
+    """
+    assert FastJSONRenderer().render(data, "application/json") == JSONRenderer().render(data, "application/json")
+
+
+@pytest.mark.parametrize("accepted_media_type", ["application/json; indent=2", "application/json; indent=0"])
+def test_parity_indented(accepted_media_type):
+    """
+    The indented responses are the same as the ones of the DRF renderer.
+    """
+    data = PARITY_DATA[2]
+
+    assert FastJSONRenderer().render(data, accepted_media_type) == JSONRenderer().render(data, accepted_media_type)
+
+
+@pytest.mark.parametrize("data", [
+    {"small": 1.5e-7, "large": 1e16, "max": 1.7976931348623157e308},
+    {"nested": [{"teams": [{"score": 1e16}]}]},
+])
+def test_float_values(data):
+    """
+    The data with floats is rendered by the DRF renderer, as orjson formats some floats differently.
+    """
+    assert FastJSONRenderer().render(data, "application/json") == JSONRenderer().render(data, "application/json")
+
+
+def test_data_without_floats_is_rendered_by_orjson():
+    """
+    The data without floats is not rendered by the DRF renderer.
+    """
+    with mock.patch.object(JSONRenderer, "render", side_effect=AssertionError("Rendered by the DRF renderer")):
+        assert FastJSONRenderer().render(PARITY_DATA[5], "application/json")
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf")])
+def test_out_of_range_float_values(value):
+    """
+    The out of range floats fail as with the DRF renderer, instead of being rendered as `null`.
+    """
+    with pytest.raises(ValueError):
+        FastJSONRenderer().render({"value": value}, "application/json")
+
+
+def test_no_content():
+    """
+    No data is rendered as an empty body.
+    """
+    assert FastJSONRenderer().render(None) == JSONRenderer().render(None) == b""
+
+
+@pytest.mark.parametrize("enabled, renderer_classes", [
+    (False, [JSONRenderer, BrowsableAPIRenderer]),
+    (True, [FastJSONRenderer, BrowsableAPIRenderer]),
+])
+def test_view_renderers(enabled, renderer_classes):
+    """
+    The plugin views replace only their JSON renderer, when the fast renderer is enabled.
+    """
+    with override_settings(PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER=enabled):
+        renderers = TopicsReadOnlyAPIView().get_renderers()
+
+    assert [type(renderer) for renderer in renderers] == renderer_classes
+
+
+@pytest.mark.django_db
+def test_view_response(course, course_key):
+    """
+    The topics response of the fast renderer is the same as the one of the DRF renderer.
+    """
+    with override_settings(PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER=False):
+        response = get_topics(course["staff"], course_key, HTTP_ACCEPT="application/json")
+    with override_settings(PLATFORM_PLUGIN_TEAMS_FAST_JSON_RENDERER=True):
+        fast_response = get_topics(course["staff"], course_key, HTTP_ACCEPT="application/json")
+
+    assert isinstance(fast_response.accepted_renderer, FastJSONRenderer)
+    assert not isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert fast_response.render().content == response.render().content
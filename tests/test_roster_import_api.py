@@ -0,0 +1,118 @@
+"""
+Tests for the `platform-plugin-teams` LMS roster import API.
+"""
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from edx_django_utils.cache import RequestCache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.lms.views import TeamMembershipImportAPIView
+from platform_plugin_teams.jobs import Job, run_job
+from test_utils.models import CourseTeamMembership
+
+User = get_user_model()
+
+factory = APIRequestFactory()
+
+
+def start_job_in_place(kind, user, course_key, total, func, *args):
+    """
+    Run a job in the current thread, so it sees the data of the test transaction.
+    """
+    job = Job("test-job", kind, user.id, str(course_key), total)
+    run_job(job, func, *args)
+    return job
+
+
+def import_roster(user, course_id, rows):
+    """
+    Call the roster import view as a new request of the user, running the import in place.
+    """
+    RequestCache.clear_all_namespaces()
+    request = factory.post("/team-membership/import/", {"rows": rows}, format="json")
+    force_authenticate(request, user=user)
+    with mock.patch("platform_plugin_teams.api.lms.views.start_job", side_effect=start_job_in_place):
+        return TeamMembershipImportAPIView.as_view()(request, course_id=str(course_id))
+
+
+def get_import(user, course_id, job_id):
+    """
+    Call the roster import status view as a new request of the user.
+    """
+    request = factory.get(f"/team-membership/import/{job_id}/")
+    force_authenticate(request, user=user)
+    return TeamMembershipImportAPIView.as_view()(request, course_id=str(course_id), job_id=job_id)
+
+
+@pytest.mark.django_db
+def test_import_roster(course, course_key):
+    """
+    The valid rows are imported, and the progress reports each row that could not be.
+    """
+    team_ids = course["open_team_ids"][:2]
+    learners = list(User.objects.filter(username__startswith="test-learner-").order_by("pk")[:3])
+    User.objects.create(username="not-enrolled", email="not-enrolled@example.com")
+    rows = [
+        {"username": learners[0].username, "team_id": team_ids[0]},
+        {"username": "missing", "team_id": team_ids[0]},
+        {"username": learners[1].username, "team_id": team_ids[1]},
+        {"username": learners[2].username, "team_id": "missing-team"},
+        {"username": "not-enrolled", "team_id": team_ids[1]},
+    ]
+
+    response = import_roster(course["staff"], course_key, rows)
+    progress = get_import(course["staff"], course_key, response.data["job_id"])
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert progress.status_code == status.HTTP_200_OK
+    assert progress.data["status"] == Job.COMPLETED
+    assert progress.data["total"] == progress.data["processed"] == 5
+    assert progress.data["failed"] == 3
+    assert sorted((error["row"], error["username"]) for error in progress.data["errors"]) == [
+        (2, "missing"),
+        (4, learners[2].username),
+        (5, "not-enrolled"),
+    ]
+    assert CourseTeamMembership.objects.filter(team__team_id=team_ids[0], user=learners[0]).exists()
+    assert CourseTeamMembership.objects.filter(team__team_id=team_ids[1], user=learners[1]).exists()
+
+
+@pytest.mark.django_db
+def test_import_roster_of_missing_course(course):
+    """
+    A course that does not exist is a 404, and no job is started.
+    """
+    response = import_roster(course["staff"], "course-v1:edX+Missing+Course", [{"username": "a", "team_id": "b"}])
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "course_id" in response.data["field_errors"]
+
+
+@pytest.mark.django_db
+def test_import_roster_without_access(course, course_key):
+    """
+    A user without access to the Team API of the course gets a 403, and no job is started.
+    """
+    user = User.objects.create(username="not-enrolled", email="not-enrolled@example.com")
+
+    response = import_roster(user, course_key, [{"username": user.username, "team_id": course["open_team_ids"][0]}])
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+@override_settings(PLATFORM_PLUGIN_TEAMS_ROSTER_IMPORT_MAX_ROWS=2)
+def test_import_roster_too_many_rows(course, course_key):
+    """
+    A roster with more rows than allowed is a 400, and no job is started.
+    """
+    rows = [{"username": f"user-{index}", "team_id": course["open_team_ids"][0]} for index in range(3)]
+
+    response = import_roster(course["staff"], course_key, rows)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "at most 2 rows" in response.data["field_errors"]["rows"]
@@ -0,0 +1,66 @@
+"""
+Tests for the `platform-plugin-teams` LMS serializers.
+"""
+import pytest
+
+from platform_plugin_teams.api.lms.serializers import TopicsProjection, get_topics_projection, project_team
+
+TOPIC_FIELDS = ("description", "name", "id", "type", "max_team_size", "team_count", "teams", "teams_cursor")
+TEAM_FIELDS = (
+    "id",
+    "discussion_topic_id",
+    "name",
+    "course_id",
+    "topic_id",
+    "date_created",
+    "description",
+    "country",
+    "language",
+    "last_activity_at",
+    "organization_protected",
+    "member_count",
+)
+
+
+@pytest.mark.parametrize("fields, expand, projection", [
+    (None, None, None),
+    ("", None, TopicsProjection(TOPIC_FIELDS, TEAM_FIELDS)),
+    ("id,name", None, TopicsProjection(("id", "name"), TEAM_FIELDS)),
+    (" id , name,id,", "", TopicsProjection(("id", "name"), TEAM_FIELDS)),
+    ("id,teams.name,teams.member_count", None, TopicsProjection(("id", "teams"), ("name", "member_count"))),
+    ("teams.id", None, TopicsProjection(TOPIC_FIELDS, ("id",))),
+    (None, "membership", TopicsProjection(TOPIC_FIELDS, TEAM_FIELDS + ("membership",))),
+    ("id,teams,teams.id", "membership,membership", TopicsProjection(("id", "teams"), ("id", "membership"))),
+])
+def test_get_topics_projection(fields, expand, projection):
+    """
+    The requested topic and team fields are returned once each, in order, with the expanded relations.
+    """
+    assert get_topics_projection(fields, expand) == projection
+
+
+@pytest.mark.parametrize("fields, expand, error", [
+    ("id,unknown", None, ("fields", f"The topic field 'unknown' must be one of {list(TOPIC_FIELDS)}.")),
+    ("teams.membership", None, ("fields", f"The team field 'membership' must be one of {list(TEAM_FIELDS)}.")),
+    ("membership", None, ("fields", f"The topic field 'membership' must be one of {list(TOPIC_FIELDS)}.")),
+    (None, "membership,users", ("expand", "The relation 'users' must be one of ['membership'].")),
+])
+def test_get_topics_projection_errors(fields, expand, error):
+    """
+    The unsupported fields and relations are rejected with the name of their query parameter.
+    """
+    with pytest.raises(ValueError) as exc_info:
+        get_topics_projection(fields, expand)
+
+    assert exc_info.value.args == error
+
+
+def test_project_team():
+    """
+    Only the requested fields are kept, and the member count of a team with its memberships is counted.
+    """
+    team_data = {"id": "team-1", "name": "Team 1", "membership": [{"user": "a"}, {"user": "b"}]}
+
+    assert project_team(team_data, ("name", "member_count")) == {"name": "Team 1", "member_count": 2}
+    assert project_team(team_data, ("id", "membership")) == {"id": "team-1", "membership": team_data["membership"]}
+    assert project_team({"id": "team-1", "member_count": 3}, ("member_count",)) == {"member_count": 3}
@@ -0,0 +1,99 @@
+"""
+Tests for the `platform-plugin-teams` LMS topic teams API.
+"""
+from urllib import parse
+
+import pytest
+from django.utils import timezone
+from edx_django_utils.cache import RequestCache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.lms.views import TopicTeamsAPIView
+from test_utils.models import CourseTeam, CourseTeamMembership
+from tests.test_topics_api import get_topics
+
+factory = APIRequestFactory()
+
+
+def get_topic_teams(user, course_key, topic_id, params=None):
+    """
+    Call the topic teams view as a new request of the user.
+    """
+    RequestCache.clear_all_namespaces()
+    request = factory.get(f"/topics/{topic_id}/teams/", params or {})
+    force_authenticate(request, user=user)
+    return TopicTeamsAPIView.as_view()(request, course_id=str(course_key), topic_id=topic_id)
+
+
+def get_remaining_team_ids(user, course_key, topic_id, cursor) -> list:
+    """
+    Follow the pages of the topic teams view from a cursor, one team per page.
+    """
+    team_ids = []
+    params = {"cursor": cursor, "page_size": 1}
+    while params:
+        response = get_topic_teams(user, course_key, topic_id, params)
+        assert response.status_code == status.HTTP_200_OK
+        team_ids += [team["id"] for team in response.data["results"]]
+        next_link = response.data["next"]
+        params = dict(parse.parse_qsl(parse.urlparse(next_link).query)) if next_link else None
+    return team_ids
+
+
+def get_visible_team_ids(course_key, topic_id, **filters) -> list:
+    """
+    Get the ids of the teams of a topic, in the order of their primary keys.
+    """
+    return list(
+        CourseTeam.objects.filter(course_id=str(course_key), topic_id=topic_id, **filters)
+        .order_by("pk")
+        .values_list("team_id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("teams_page_size", [1, 2, 3])
+@pytest.mark.parametrize("role, filters", [("staff", {}), ("learner", {"organization_protected": False})])
+def test_cursor_resumes_after_the_last_visible_team(course, course_key, teams_page_size, role, filters):
+    """
+    The teams cursor of a topic continues right after its last embedded team,
+    skipping the organization protected teams hidden from the learner.
+    """
+    user = course[role]
+
+    response = get_topics(user, course_key, {"teams_page_size": teams_page_size})
+
+    assert response.status_code == status.HTTP_200_OK
+    for topic in response.data["results"]:
+        if topic["id"] == "topic-9":
+            continue
+        visible_team_ids = get_visible_team_ids(course_key, topic["id"], **filters)
+        embedded_team_ids = [team["id"] for team in topic["teams"]]
+        assert embedded_team_ids == visible_team_ids[:teams_page_size]
+        if len(visible_team_ids) > teams_page_size:
+            remaining_team_ids = get_remaining_team_ids(user, course_key, topic["id"], topic["teams_cursor"])
+            assert remaining_team_ids == visible_team_ids[teams_page_size:]
+        else:
+            assert topic["teams_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_private_managed_cursor_resumes_after_the_last_team_of_the_learner(course, course_key):
+    """
+    The teams cursor of a private managed topic continues after the last team
+    of the learner, and the next pages only have the other teams of the learner.
+    """
+    learner = course["learner"]
+    topic_team_ids = get_visible_team_ids(course_key, "topic-9")
+    learner_team_ids = [topic_team_ids[0], topic_team_ids[2], topic_team_ids[3]]
+    for team in CourseTeam.objects.filter(course_id=str(course_key), team_id__in=learner_team_ids):
+        CourseTeamMembership.objects.get_or_create(
+            user=learner, team=team, defaults={"last_activity_at": timezone.now()}
+        )
+
+    response = get_topics(learner, course_key, {"teams_page_size": 1})
+
+    topic = next(topic for topic in response.data["results"] if topic["id"] == "topic-9")
+    assert [team["id"] for team in topic["teams"]] == learner_team_ids[:1]
+    assert get_remaining_team_ids(learner, course_key, "topic-9", topic["teams_cursor"]) == learner_team_ids[1:]
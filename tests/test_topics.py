@@ -0,0 +1,117 @@
+"""
+Tests for the `platform-plugin-teams` topics module.
+"""
+import pytest
+from django.db.models.signals import post_delete
+
+from platform_plugin_teams.topics import apply_topic_operations, delete_topic_teams
+from test_utils.models import CourseTeam, CourseTeamMembership
+
+
+@pytest.mark.django_db
+def test_delete_topic_teams(course, course_key):  # pylint: disable=unused-argument
+    """
+    Only the teams of the topic in the course are deleted, and every deleted row sends its delete signal.
+    """
+    other_course_team = CourseTeam.objects.create(
+        team_id="other-team", name="Other team", course_id="course-v1:edX+Other+Course", topic_id="topic-0"
+    )
+    team_pks = set(CourseTeam.objects.filter(course_id=course_key, topic_id="topic-0").values_list("pk", flat=True))
+    membership_pks = set(
+        CourseTeamMembership.objects.filter(team_id__in=team_pks).values_list("pk", flat=True)
+    )
+    deleted = set()
+
+    def receiver(sender, instance, **kwargs):  # pylint: disable=unused-argument
+        deleted.add((sender, instance.pk))
+
+    post_delete.connect(receiver)
+    try:
+        delete_topic_teams(course_key, "topic-0")
+    finally:
+        post_delete.disconnect(receiver)
+
+    assert membership_pks
+    assert deleted == {
+        *((CourseTeam, team_pk) for team_pk in team_pks),
+        *((CourseTeamMembership, membership_pk) for membership_pk in membership_pks),
+    }
+    assert not CourseTeam.objects.filter(course_id=course_key, topic_id="topic-0").exists()
+    assert CourseTeam.objects.filter(pk=other_course_team.pk).exists()
+    assert CourseTeam.objects.filter(course_id=course_key, topic_id="topic-1").exists()
+
+
+TEAM_SETS = [
+    {"id": "topic-1", "name": "Topic 1", "description": "", "type": "open", "max_team_size": 5},
+    {"id": "topic-2", "name": "Topic 2", "description": "", "type": "open"},
+]
+
+
+def test_apply_topic_operations():
+    """
+    The operations are applied in order, each one to the topics left by the previous ones.
+    """
+    team_sets, deleted_topic_ids, errors = apply_topic_operations(
+        TEAM_SETS,
+        [
+            {"op": "update", "id": "topic-1", "name": "Renamed topic", "max_team_size": None},
+            {"op": "create", "name": " Topic 1 ", "description": "New", "type": "public_managed", "max_team_size": 3},
+            {"op": "delete", "id": "topic-2"},
+        ],
+    )
+
+    assert errors is None
+    assert deleted_topic_ids == ["topic-2"]
+    assert team_sets[0] == {**TEAM_SETS[0], "name": "Renamed topic", "max_team_size": None}
+    assert {key: value for key, value in team_sets[1].items() if key != "id"} == {
+        "name": "Topic 1", "description": "New", "type": "public_managed", "max_team_size": 3
+    }
+    assert len(team_sets) == 2
+    assert TEAM_SETS[0]["name"] == "Topic 1"
+
+
+def test_apply_topic_operations_errors():
+    """
+    The errors of each invalid operation are returned by its index, and no operation is applied.
+    """
+    team_sets, deleted_topic_ids, errors = apply_topic_operations(
+        TEAM_SETS,
+        [
+            {"op": "delete", "id": "topic-2"},
+            "create",
+            {"op": "move", "id": "topic-1"},
+            {"op": "update", "id": "topic-3"},
+            {"op": "create", "name": "Topic 1", "type": "open"},
+            {"op": "create", "name": " ", "type": "closed"},
+        ],
+    )
+
+    assert deleted_topic_ids == ["topic-2"]
+    assert len(team_sets) == 1
+    assert errors == {
+        "1": {"op": "Each operation must be an object."},
+        "2": {"op": "The [op] field must be one of ['create', 'update', 'delete']."},
+        "3": {"id": "The supplied topic_id='topic-3' is not found."},
+        "4": {"name": "The topic with name='Topic 1' already exists."},
+        "5": {
+            "type": "The [type] field must be one of ['open', 'open_managed', 'public_managed', 'private_managed'].",
+            "name": "The [name] field is required.",
+        },
+    }
+
+
+@pytest.mark.parametrize("max_team_size", [0, -1, 2.5, "5", True, [5]])
+def test_apply_topic_operations_invalid_max_team_size(max_team_size):
+    """
+    The maximum team size of a created or updated topic must be a positive integer or null.
+    """
+    _team_sets, _deleted_topic_ids, errors = apply_topic_operations(
+        TEAM_SETS,
+        [
+            {"op": "create", "name": "Topic 3", "type": "open", "max_team_size": max_team_size},
+            {"op": "update", "id": "topic-2", "max_team_size": max_team_size},
+        ],
+    )
+
+    max_team_size_error = {"max_team_size": "The [max_team_size] field must be a positive integer or null."}
+    assert errors == {"0": max_team_size_error, "1": max_team_size_error}
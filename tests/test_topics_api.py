@@ -0,0 +1,155 @@
+"""
+Tests for the `platform-plugin-teams` LMS topics API.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import RequestCache
+from opaque_keys.edx.keys import CourseKey
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.lms.views import TopicsReadOnlyAPIView
+from platform_plugin_teams.edxapp_wrapper.modulestore import modulestore
+from test_utils.models import CourseTeamMembership
+from test_utils.synthetic import Size, create_synthetic_course
+
+factory = APIRequestFactory()
+
+
+def get_topics(user, course_key, params=None, **headers):
+    """
+    Call the topics view as a new request of the user.
+    """
+    RequestCache.clear_all_namespaces()
+    request = factory.get("/topics/", params or {}, **headers)
+    force_authenticate(request, user=user)
+    return TopicsReadOnlyAPIView.as_view()(request, course_id=str(course_key))
+
+
+@pytest.mark.django_db
+def test_not_modified(course, course_key):
+    """
+    A request with the ETag of the previous response is answered with a 304.
+    """
+    response = get_topics(course["staff"], course_key)
+    not_modified = get_topics(course["staff"], course_key, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified["ETag"] == response["ETag"]
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_accept(course, course_key):
+    """
+    The responses negotiated for another media type have another ETag, and
+    vary on the `Accept` header.
+    """
+    json_response = get_topics(course["staff"], course_key, HTTP_ACCEPT="application/json")
+    html_response = get_topics(course["staff"], course_key, HTTP_ACCEPT="text/html")
+
+    assert json_response["ETag"] != html_response["ETag"]
+    assert "Accept" in json_response["Vary"]
+    assert get_topics(
+        course["staff"], course_key, HTTP_ACCEPT="text/html", HTTP_IF_NONE_MATCH=json_response["ETag"]
+    ).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_etag_follows_the_loaded_course(course, course_key):
+    """
+    A teams configuration changed without invalidating the plugin caches
+    (e.g. from the Studio advanced settings) changes the ETag and the topics.
+    """
+    response = get_topics(course["staff"], course_key)
+    modulestore().create_course(
+        course_key,
+        teams_configuration={"team_sets": [{"id": "new-topic", "name": "New topic", "description": ""}]},
+    )
+
+    changed = get_topics(course["staff"], course_key, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed["ETag"] != response["ETag"]
+    assert [topic["id"] for topic in changed.data["results"]] == ["new-topic"]
+
+
+@pytest.mark.django_db
+def test_sparse_fields(course, course_key):
+    """
+    Only the requested fields of the topics and teams are returned, and the
+    memberships are only counted, not fetched, without `expand=membership`.
+    """
+    membership_table = CourseTeamMembership._meta.db_table  # pylint: disable=protected-access
+
+    with CaptureQueriesContext(connection) as queries:
+        response = get_topics(course["staff"], course_key, {"fields": "id,teams.id,teams.member_count"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not [query for query in queries.captured_queries if f'FROM "{membership_table}"' in query["sql"]]
+    teams = [team for topic in response.data["results"] for team in topic["teams"]]
+    assert teams
+    assert {tuple(topic) for topic in response.data["results"]} == {("id", "teams")}
+    assert {tuple(team) for team in teams} == {("id", "member_count")}
+    for team in teams:
+        assert team["member_count"] == CourseTeamMembership.objects.filter(team__team_id=team["id"]).count()
+
+
+@pytest.mark.django_db
+def test_expand_membership(course, course_key):
+    """
+    The memberships of the teams are returned with `expand=membership`.
+    """
+    response = get_topics(
+        course["staff"], course_key, {"fields": "id,teams.id,teams.member_count", "expand": "membership"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    teams = [team for topic in response.data["results"] for team in topic["teams"]]
+    assert {tuple(team) for team in teams} == {("id", "member_count", "membership")}
+    for team in teams:
+        usernames = CourseTeamMembership.objects.filter(team__team_id=team["id"]).values_list(
+            "user__username", flat=True
+        )
+        assert sorted(membership["user"]["username"] for membership in team["membership"]) == sorted(usernames)
+        assert team["member_count"] == len(team["membership"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params, field", [
+    ({"fields": "id,unknown"}, "fields"),
+    ({"fields": "teams.unknown"}, "fields"),
+    ({"expand": "users"}, "expand"),
+])
+def test_invalid_fields(course, course_key, params, field):
+    """
+    The unsupported fields and relations are rejected.
+    """
+    response = get_topics(course["staff"], course_key, params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert list(response.data["field_errors"]) == [field]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("role", ["staff", "learner"])
+@pytest.mark.parametrize("params", [{}, {"expand": "membership"}, {"fields": "id,teams.id,teams.member_count"}])
+def test_query_count_does_not_grow_with_the_teams(role, params):
+    """
+    The queries of a topics request are the same for a course with three times more teams and memberships.
+    """
+    query_counts = []
+    for index, teams in enumerate([20, 60]):
+        course_key = CourseKey.from_string(f"course-v1:edX+Queries+Course{index}")
+        synthetic_course = create_synthetic_course(
+            course_key, Size(teamsets=10, teams=teams, memberships=teams * 5), f"queries-{index}"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = get_topics(synthetic_course[role], course_key, params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sum(len(topic["teams"]) for topic in response.data["results"]) > teams // 2
+        query_counts.append(len(queries.captured_queries))
+
+    assert query_counts[0] == query_counts[1]
@@ -0,0 +1,132 @@
+"""
+Tests for the `platform-plugin-teams` LMS topics bulk API.
+"""
+# pylint: disable=redefined-outer-name, unused-argument
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import RequestCache
+from opaque_keys.edx.keys import CourseKey
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from platform_plugin_teams.api.lms.views import TopicsBulkReadOnlyAPIView
+from test_utils.models import CourseAccessRole, CourseTeam
+from test_utils.synthetic import Size, create_synthetic_course
+from tests.test_topics_api import get_topics
+
+factory = APIRequestFactory()
+
+OTHER_COURSE_ID = "course-v1:edX+Other+Course"
+
+
+@pytest.fixture
+def other_course_key():
+    """
+    Key of another course of the tests.
+    """
+    return CourseKey.from_string(OTHER_COURSE_ID)
+
+
+@pytest.fixture
+def other_course(other_course_key, course):
+    """
+    Another synthetic course, where the staff of the course of the tests is staff too.
+    """
+    other_course = create_synthetic_course(other_course_key, Size(teamsets=3, teams=9, memberships=12), "other")
+    CourseAccessRole.objects.create(user=course["staff"], course_id=OTHER_COURSE_ID, role="staff")
+    return other_course
+
+
+def get_bulk_topics(user, course_key, params=None):
+    """
+    Call the topics bulk view as a new request of the user.
+    """
+    RequestCache.clear_all_namespaces()
+    request = factory.get("/topics/bulk/", params or {})
+    force_authenticate(request, user=user)
+    return TopicsBulkReadOnlyAPIView.as_view()(request, course_id=str(course_key))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"teams_page_size": 1}, {"fields": "id,name,teams", "expand": "membership"}])
+def test_topics_of_each_course(course, course_key, other_course, other_course_key, params):
+    """
+    Each course has the same topics as in the topics endpoint, in the order the courses were requested.
+    """
+    staff = course["staff"]
+
+    response = get_bulk_topics(staff, course_key, {"course_ids": f"{OTHER_COURSE_ID},{course_key}", **params})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["errors"] == {}
+    assert [result["course_id"] for result in response.data["results"]] == [str(course_key), OTHER_COURSE_ID]
+    for result, result_course_key in zip(response.data["results"], [course_key, other_course_key]):
+        topics_response = get_topics(staff, result_course_key, {"page_size": 100, **params})
+        assert result["topics"] == topics_response.data["results"]
+
+
+@pytest.mark.django_db
+def test_errors(course, course_key, other_course):
+    """
+    The courses that do not exist, are not found or are not accessible are
+    returned as errors, with the topics of the other courses.
+    """
+    learner = course["learner"]
+
+    response = get_bulk_topics(
+        learner, course_key, {"course_ids": f"not-a-course,course-v1:edX+Missing+Course,{OTHER_COURSE_ID}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["course_id"] for result in response.data["results"]] == [str(course_key)]
+    assert response.data["errors"] == {
+        "not-a-course": "The supplied course_id='not-a-course' does not exists.",
+        "course-v1:edX+Missing+Course": "The supplied course_id='course-v1:edX+Missing+Course' is not found.",
+        OTHER_COURSE_ID: (
+            f"The request.user=<User: {learner.username}> do not have access to the Team API for the course."
+        ),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params, field", [
+    ({"course_ids": OTHER_COURSE_ID}, "course_ids"),
+    ({"teams_page_size": "0"}, "teams_page_size"),
+    ({"fields": "unknown"}, "fields"),
+    ({"expand": "unknown"}, "expand"),
+])
+@override_settings(PLATFORM_PLUGIN_TEAMS_TOPICS_BULK_MAX_COURSES=1)
+def test_invalid_options(course, course_key, params, field):
+    """
+    A request with too many courses or invalid options is rejected.
+    """
+    response = get_bulk_topics(course["staff"], course_key, params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert list(response.data["field_errors"]) == [field]
+
+
+@pytest.mark.django_db
+def test_teams_of_every_course_in_a_single_query(course, course_key, other_course):
+    """
+    The teams of every requested course are loaded with a single query.
+    """
+    team_table = connection.ops.quote_name(CourseTeam._meta.db_table)  # pylint: disable=protected-access
+
+    with CaptureQueriesContext(connection) as queries:
+        response = get_bulk_topics(course["staff"], course_key, {"course_ids": OTHER_COURSE_ID})
+
+    assert response.status_code == status.HTTP_200_OK
+    team_queries = [
+        query["sql"] for query in queries.captured_queries if query["sql"].startswith(f'SELECT {team_table}."id"')
+    ]
+    team_course_ids = {
+        team["course_id"]
+        for result in response.data["results"]
+        for topic in result["topics"]
+        for team in topic["teams"]
+    }
+    assert len(team_queries) == 1
+    assert team_course_ids == {str(course_key), OTHER_COURSE_ID}